@@ -4,6 +4,10 @@ import random
 import time
 import os
 
+from matching import dataset_version
+from mentor_search import MaterializedSearch, MentorFacets, MentorSearchIndex, style_options, topic_options
+from similar_mentors import graph_path, load_graph, similar
+
 # --- 1. 데이터 로드 및 상수 정의 ---
 
 # 멘토 데이터 파일 경로 (사용자 업로드 파일)
@@ -98,9 +102,15 @@ def load_mentor_data():
         st.error(f"Error: 멘토 데이터 파일 '{MENTOR_CSV_PATH}'을(를) 찾을 수 없습니다.")
         return pd.DataFrame()
 
+@st.cache_data(show_spinner=False)
+def load_mentor_version():
+    """멘토 데이터 세트 버전 (로드한 데이터를 한 번만 해시 — 검색 구조/그래프 캐시 키)."""
+    return dataset_version(load_mentor_data())
+
 def initialize_session_state():
     mentors_df = load_mentor_data()
     st.session_state.mentors_df = mentors_df
+    st.session_state.mentors_version = load_mentor_version()
     
     if 'logged_in' not in st.session_state:
         st.session_state.logged_in = False
@@ -117,7 +127,7 @@ def initialize_session_state():
         st.session_state.daily_answers = initial_answers
         
     if 'recommendations' not in st.session_state:
-        st.session_state.recommendations = pd.DataFrame()
+        st.session_state.recommendations = []  # 추천 멘토의 행 위치
     
 initialize_session_state()
 
@@ -126,28 +136,38 @@ if st.session_state.mentors_df.empty and not st.session_state.logged_in:
     
 # --- 3. 멘토 추천 로직 함수 (직종 필터링 로직은 기존과 동일하게 작동) ---
 
-def recommend_mentors(search_field, search_topic, search_style):
-    mentors = st.session_state.mentors_df.copy()
-    mentors['score'] = 0
-    
-    if search_field:
-        # CSV의 'occupation_major' 컬럼 값이 search_field와 일치하는지 확인
-        mentors['score'] += mentors['occupation_major'].apply(lambda x: 3 if x == search_field else 0)
-    
-    if search_topic:
-        mentors['score'] += mentors['topic_prefs'].astype(str).apply(
-            lambda x: 2 if search_topic in x else 0
-        )
-    
-    if search_style:
-        mentors['score'] += mentors['style'].apply(lambda x: 1 if search_style in x else 0)
-    
-    if search_field or search_topic or search_style:
-        recommended_mentors = mentors[mentors['score'] > 0].sort_values(by='score', ascending=False)
-    else:
-        recommended_mentors = mentors.sort_values(by='name', ascending=True)
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_similar_graph(version, graph_mtime_ns):
+    """`python similar_mentors.py 멘토더미.csv`로 미리 만든 비슷한 멘토 그래프 (데이터 버전이 맞을 때만)."""
+    saved = load_graph(graph_path(MENTOR_CSV_PATH), version)
+    return None if saved is None else saved["graph"]
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def build_search_index(version, _mentors_df):
+    """직종/주제/스타일 검색 코드 (데이터 세트 버전당 1회, 스타일은 선택값이 셀에 포함)."""
+    return MentorSearchIndex(_mentors_df, style_match="substring")
 
-    return recommended_mentors.reset_index(drop=True)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def build_search_facets(version, _mentors_df):
+    """검색 폼 선택지(직종/주제/스타일)와 선택 조합별 결과 수 (데이터 세트 버전당 1회)."""
+    styles = sorted(COMM_STYLES.keys())
+    return MentorFacets(build_search_index(version, _mentors_df), sorted(OCCUPATION_GROUPS),
+                        topic_options(_mentors_df), styles)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def build_search_table(version, _mentors_df):
+    """모든 검색 조합의 추천 순서 표 (데이터 세트 버전당 1회, 조합이 너무 많으면 조합별 LRU)."""
+    return MaterializedSearch(build_search_index(version, _mentors_df),
+                              build_search_facets(version, _mentors_df), with_scores=True)
+
+
+def recommend_mentors(search_field, search_topic, search_style):
+    """조건에 맞는 멘토의 데이터 내 행 위치(추천 순)와 같은 순서의 점수(직종 3 · 주제 2 · 스타일 1)."""
+    table = build_search_table(st.session_state.mentors_version, st.session_state.mentors_df)
+    return table.lookup(search_field, search_topic, search_style)
 
 
 # --- 4. 인증/회원가입/UI 함수 정의 ---
@@ -242,6 +262,9 @@ def show_mentor_search_and_connect():
     st.header("🔍 멘토 찾기 및 연결")
     
     mentors = st.session_state.mentors_df
+    graph_file = graph_path(MENTOR_CSV_PATH)
+    similar_graph = load_similar_graph(st.session_state.mentors_version,
+                                       graph_file.stat().st_mtime_ns if graph_file.exists() else 0)
     
     # --- 검색 조건 입력 ---
     st.subheader("나에게 맞는 멘토 검색하기")
@@ -249,19 +272,19 @@ def show_mentor_search_and_connect():
     with st.form("mentor_search_form"): 
         col_f, col_t, col_s = st.columns(3)
         
-        available_topics = sorted([t for t in set(t.strip() for items in mentors['topic_prefs'].astype(str).str.split('[,;]') for t in items if t.strip())])
-        available_styles = sorted(list(COMM_STYLES.keys()))
-        # 🌟 리스트로 변경된 OCCUPATION_GROUPS를 사용
-        available_fields_clean = sorted(OCCUPATION_GROUPS)
-        
+        facets = build_search_facets(st.session_state.mentors_version, mentors)
+
         with col_f:
-            search_field = st.selectbox("💼 전문 분야 (직종 분류)", options=['(전체)'] + available_fields_clean)
+            search_field = st.selectbox("💼 전문 분야 (직종 분류)", options=['(전체)'] + facets.options['field'],
+                                        format_func=lambda v: facets.label('field', v))
         
         with col_t:
-            search_topic = st.selectbox("💬 주요 대화 주제", options=['(전체)'] + available_topics)
+            search_topic = st.selectbox("💬 주요 대화 주제", options=['(전체)'] + facets.options['topic'],
+                                        format_func=lambda v: facets.label('topic', v))
             
         with col_s:
-            search_style = st.selectbox("🗣️ 선호 대화 스타일", options=['(전체)'] + available_styles)
+            search_style = st.selectbox("🗣️ 선호 대화 스타일", options=['(전체)'] + facets.options['style'],
+                                        format_func=lambda v: facets.label('style', v))
 
         submitted = st.form_submit_button("🔎 검색 시작") 
         
@@ -270,29 +293,35 @@ def show_mentor_search_and_connect():
         topic = search_topic if search_topic != '(전체)' else ''
         style = search_style if search_style != '(전체)' else ''
         
-        with st.spinner("최적의 멘토를 찾는 중..."):
-            recommendation_results = recommend_mentors(field, topic, style)
-            st.session_state.recommendations = recommendation_results
+        if facets.count(field, topic, style) == 0:
+            # 결과 0명인 조합: 표를 훑지 않고 바로 안내
+            recommendation_results, scores = [], []
+        else:
+            with st.spinner("최적의 멘토를 찾는 중..."):
+                recommendation_results, scores = recommend_mentors(field, topic, style)
+        st.session_state.recommendations = recommendation_results
+        st.session_state.recommendation_scores = scores
         
-        if recommendation_results.empty and (field or topic or style):
+        if not len(recommendation_results) and (field or topic or style):
              st.info("⚠️ 선택하신 조건에 맞는 멘토를 찾지 못했습니다. 조건을 변경해 보세요.")
-        elif recommendation_results.empty:
+        elif not len(recommendation_results):
             st.info("멘토 데이터가 비어있습니다. 데이터를 확인해 주세요.")
 
     # --- 검색 결과 표시 ---
-    if not st.session_state.recommendations.empty:
+    if len(st.session_state.recommendations):
         st.subheader(f"총 {len(st.session_state.recommendations)}명의 멘토가 검색되었습니다.")
-        if 'score' in st.session_state.recommendations.columns:
-             st.caption("(추천 점수 또는 이름순)")
+        st.caption("(추천 점수 또는 이름순)")
         
-        for index, row in st.session_state.recommendations.iterrows():
+        for index, pos in enumerate(st.session_state.recommendations):
+            row = mentors.iloc[pos]
             with st.container(border=True):
                 col_name, col_score = st.columns([3, 1])
                 with col_name:
                     st.markdown(f"#### 👤 {row['name']} ({row['age_band']})")
                 with col_score:
-                    if 'score' in row and row['score'] > 0:
-                        st.markdown(f"**🌟 추천 점수: {int(row['score'])}점**")
+                    score = int(st.session_state.recommendation_scores[index])
+                    if score > 0:
+                        st.markdown(f"**🌟 추천 점수: {score}점**")
                 
                 col_m1, col_m2, col_m3 = st.columns(3)
                 with col_m1:
@@ -303,6 +332,10 @@ def show_mentor_search_and_connect():
                     st.markdown(f"**소통 스타일:** {row['style']}") 
                     
                 st.markdown(f"**멘토 한마디:** _{row['intro']}_")
+                if similar_graph is not None:
+                    similar_pos, _ = similar(similar_graph, int(pos))
+                    if len(similar_pos):
+                        st.caption("비슷한 멘토: " + " · ".join(mentors['name'].iloc[similar_pos].astype(str)))
                 
                 connect_button_key = f"connect_btn_{row['name']}_{index}"
                 if st.button("🔗 연결", key=connect_button_key):
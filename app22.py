@@ -6,6 +6,12 @@ import os
 import json 
 import html # 텍스트 이스케이프용
 
+from dataset_manager import DatasetManager
+from mentor_search import MaterializedSearch, MentorFacets, MentorSearchIndex, style_options, topic_options
+from mentor_snapshot import snapshot_path
+from mentor_store import MentorStore
+from similar_mentors import graph_path, load_graph, similar
+
 # --- 1. 데이터 로드 및 상수 정의 ---
 
 MENTOR_CSV_PATH = "멘토더미.csv"
@@ -68,42 +74,45 @@ COMM_STYLES = {
 
 # --- 2. 데이터 초기화 및 로드 ---
 
+@st.cache_resource(show_spinner=False)
+def mentor_store():
+    """프로세스 공용 멘토 데이터 저장소 (파일이 바뀔 때만 다시 읽고, 모든 세션이 같은 DataFrame 공유).
+
+    `python mentor_snapshot.py 멘토더미.csv`로 컴파일한 스냅샷이 최신이면 CSV 대신 그것을 읽는다.
+    """
+    # 'style'을 필수 컬럼으로 가정
+    return MentorStore(MENTOR_CSV_PATH,
+                       required_cols=['name', 'age_band', 'occupation_major', 'topic_prefs', 'style', 'intro'],
+                       snapshot_dir=snapshot_path(MENTOR_CSV_PATH))
+
+
+def build_search_structures(snapshot):
+    """데이터 세트 버전 1개의 검색 구조(검색 코드 · 폼 선택지/조합별 결과 수 · 조합별 추천 순서 표).
+
+    데이터가 바뀌면 관리자의 백그라운드 스레드에서 호출된다(그동안 요청은 이전 버전으로 처리).
+    """
+    df = snapshot.df
+    index = MentorSearchIndex(df, style_match="exact")  # 스타일은 선택값이 셀과 같음
+    styles = style_options(df) if 'style' in df.columns else sorted(COMM_STYLES.keys())
+    facets = MentorFacets(index, sorted(OCCUPATION_GROUPS), topic_options(df), styles)
+    return {"index": index, "facets": facets, "table": MaterializedSearch(index, facets)}
+
+
+@st.cache_resource(show_spinner=False)
+def dataset_manager():
+    """프로세스 공용 데이터 세트 관리자 — 새 CSV는 백그라운드에서 검색 구조까지 만든 뒤 한 번에 교체."""
+    return DatasetManager(mentor_store(), build_search_structures)
+
+
 def load_mentor_data():
-    if os.path.exists(MENTOR_CSV_PATH):
-        try:
-            df = pd.read_csv(MENTOR_CSV_PATH, encoding='utf-8')
-            df.columns = df.columns.str.strip()
-            # 'style'을 필수 컬럼으로 가정
-            required_cols = ['name', 'age_band', 'occupation_major', 'topic_prefs', 'style', 'intro']
-
-            # 파일 컬럼 이름이 'communication_style'이면 'style'로 변경하여 호환성 확보
-            if 'communication_style' in df.columns and 'style' not in df.columns:
-                df = df.rename(columns={'communication_style': 'style'})
-
-            missing_cols = [col for col in required_cols if col not in df.columns]
-
-            if missing_cols:
-                st.error(f"멘토 CSV 파일에 다음 컬럼이 누락되었습니다: {', '.join(missing_cols)}")
-                st.info(f"현재 파일의 컬럼 목록: {', '.join(df.columns)}")
-                return pd.DataFrame()
-            return df
-        except UnicodeDecodeError:
-            try:
-                df = pd.read_csv(MENTOR_CSV_PATH, encoding='cp949')
-                df.columns = df.columns.str.strip()
-                # 파일 컬럼 이름이 'communication_style'이면 'style'로 변경하여 호환성 확보
-                if 'communication_style' in df.columns and 'style' not in df.columns:
-                    df = df.rename(columns={'communication_style': 'style'})
-                return df
-            except Exception as e:
-                st.error(f"CSV 파일 로드 중 심각한 오류 발생: {e}")
-                return pd.DataFrame()
-        except Exception as e:
-            st.error(f"CSV 파일 로드 중 예상치 못한 오류 발생: {e}")
-            return pd.DataFrame()
-    else:
-        st.error(f"Error: 멘토 데이터 파일 '{MENTOR_CSV_PATH}'을(를) 찾을 수 없습니다.")
-        return pd.DataFrame()
+    """이번 실행이 쓸 데이터 세트 버전을 빌린다(.df 읽기 전용 공유 프레임, .version, ds["table"] 등).
+
+    실행이 끝나면 반드시 dataset_manager().release(...) — 도중에 데이터가 교체돼도 이 실행은 같은 버전을 쓴다.
+    """
+    dataset = dataset_manager().acquire()
+    if dataset.snapshot.error:
+        st.error(dataset.snapshot.error)
+    return dataset
 
 
 # --- 2-1. 영구 저장(Persistence) 헬퍼 함수 ---
@@ -130,8 +139,10 @@ def save_json_data(data, file_path):
 
 
 def initialize_session_state():
-    mentors_df = load_mentor_data()
-    st.session_state.mentors_df = mentors_df
+    """세션 상태 초기화 — 이번 실행이 빌린 데이터 세트 버전을 돌려준다."""
+    mentors = load_mentor_data()
+    st.session_state.mentors_df = mentors.df
+    st.session_state.mentors_version = mentors.version
 
     # 영구 저장된 사용자 데이터를 로드
     st.session_state.all_users = load_json_data(USERS_FILE_PATH, {})
@@ -163,36 +174,34 @@ def initialize_session_state():
 
 
     if 'recommendations' not in st.session_state:
-        st.session_state.recommendations = pd.DataFrame()
+        st.session_state.recommendations = []  # 추천 멘토의 행 위치
+        st.session_state.recommendations_version = None  # 추천 결과를 만든 데이터 세트 버전
+    if st.session_state.get('recommendations_version') not in (None, mentors.version):
+        # 데이터 세트가 교체됨 → 이전 버전의 행 위치는 새 프레임과 맞지 않으므로 버림
+        st.session_state.recommendations = []
+        st.session_state.recommendations_version = None
+        st.session_state.dataset_swapped = True
+
+    return mentors
 
-initialize_session_state()
+dataset = initialize_session_state()
 
 if st.session_state.mentors_df.empty and not st.session_state.logged_in:
+    dataset_manager().release(dataset)
     st.stop()
 
 # --- 3. 멘토 추천 로직 함수 ---
 
-def recommend_mentors(search_field, search_topic, search_style):
-    mentors = st.session_state.mentors_df.copy()
-    mentors['score'] = 0
-
-    if search_field:
-        mentors['score'] += mentors['occupation_major'].apply(lambda x: 3 if x == search_field else 0)
-
-    if search_topic:
-        mentors['score'] += mentors['topic_prefs'].astype(str).apply(
-            lambda x: 2 if search_topic in x else 0
-        )
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_similar_graph(version, graph_mtime_ns):
+    """`python similar_mentors.py 멘토더미.csv`로 미리 만든 비슷한 멘토 그래프 (데이터 버전이 맞을 때만)."""
+    saved = load_graph(graph_path(MENTOR_CSV_PATH), version)
+    return None if saved is None else saved["graph"]
 
-    if search_style:
-        mentors['score'] += mentors['style'].apply(lambda x: 1 if x == search_style else 0)
 
-    if search_field or search_topic or search_style:
-        recommended_mentors = mentors[mentors['score'] > 0].sort_values(by='score', ascending=False)
-    else:
-        recommended_mentors = mentors.sort_values(by='name', ascending=True)
-
-    return recommended_mentors.reset_index(drop=True)
+def recommend_mentors(search_field, search_topic, search_style):
+    """조건에 맞는 멘토의 데이터 내 행 위치(추천 순: 직종 3 · 주제 2 · 스타일 1점, 조건 없으면 이름순)."""
+    return dataset["table"].lookup(search_field, search_topic, search_style)[0]
 
 
 # --- 4. 인증/회원가입/UI 함수 정의 ---
@@ -229,7 +238,10 @@ def show_mentor_search_and_connect():
         </style>
     """, unsafe_allow_html=True) 
 
-    mentors = st.session_state.mentors_df
+    mentors = dataset.df
+    graph_file = graph_path(MENTOR_CSV_PATH)
+    similar_graph = load_similar_graph(st.session_state.mentors_version,
+                                       graph_file.stat().st_mtime_ns if graph_file.exists() else 0)
 
     # --- 검색 조건 입력 ---
     st.header("🔍 멘토 찾기")
@@ -238,24 +250,19 @@ def show_mentor_search_and_connect():
     with st.form("mentor_search_form"):
         col_f, col_t, col_s = st.columns(3)
 
-        available_topics = sorted([t for t in set(t.strip() for items in mentors['topic_prefs'].astype(str).str.split('[,;]') for t in items if t.strip())])
-
-        # 'style' 컬럼을 사용하도록 가정하고, 해당 컬럼의 고유값을 스타일 옵션으로 사용
-        if 'style' in mentors.columns:
-            available_styles = sorted(list(mentors['style'].dropna().unique()))
-        else:
-            available_styles = sorted(list(COMM_STYLES.keys())) # fallback
-
-        available_fields_clean = sorted(OCCUPATION_GROUPS)
+        facets = dataset["facets"]
 
         with col_f:
-            search_field = st.selectbox("💼 전문 분야 (직종 분류)", options=['(전체)'] + available_fields_clean)
+            search_field = st.selectbox("💼 전문 분야 (직종 분류)", options=['(전체)'] + facets.options['field'],
+                                        format_func=lambda v: facets.label('field', v))
 
         with col_t:
-            search_topic = st.selectbox("💬 주요 대화 주제", options=['(전체)'] + available_topics)
+            search_topic = st.selectbox("💬 주요 대화 주제", options=['(전체)'] + facets.options['topic'],
+                                        format_func=lambda v: facets.label('topic', v))
 
         with col_s:
-            search_style = st.selectbox("🗣️ 선호 대화 스타일", options=['(전체)'] + available_styles)
+            search_style = st.selectbox("🗣️ 선호 대화 스타일", options=['(전체)'] + facets.options['style'],
+                                        format_func=lambda v: facets.label('style', v))
 
         submitted = st.form_submit_button("🔎 검색 시작", type="primary")
 
@@ -264,22 +271,30 @@ def show_mentor_search_and_connect():
         topic = search_topic if search_topic != '(전체)' else ''
         style = search_style if search_style != '(전체)' else ''
 
-        with st.spinner("최적의 멘토를 찾는 중..."):
-            recommendation_results = recommend_mentors(field, topic, style)
-            st.session_state.recommendations = recommendation_results
+        if facets.count(field, topic, style) == 0:
+            # 결과 0명인 조합: 표를 훑지 않고 바로 안내
+            recommendation_results = []
+        else:
+            with st.spinner("최적의 멘토를 찾는 중..."):
+                recommendation_results = recommend_mentors(field, topic, style)
+        st.session_state.recommendations = recommendation_results
+        st.session_state.recommendations_version = dataset.version
 
-        if recommendation_results.empty and (field or topic or style):
+        if not len(recommendation_results) and (field or topic or style):
             st.info("⚠️ 선택하신 조건에 맞는 멘토를 찾지 못했습니다. 조건을 변경해 보세요.")
-        elif recommendation_results.empty:
+        elif not len(recommendation_results):
             st.info("멘토 데이터가 비어있습니다. 데이터를 확인해 주세요.")
 
+    if st.session_state.pop('dataset_swapped', False):
+        st.info("🔄 멘토 데이터가 새 버전으로 바뀌어 이전 검색 결과를 지웠습니다. 다시 검색해 주세요.")
+
     # --- 검색 결과 표시 ---
-    if not st.session_state.recommendations.empty:
+    if len(st.session_state.recommendations):
         st.subheader(f"총 {len(st.session_state.recommendations)}명의 멘토가 검색되었습니다.")
-        if 'score' in st.session_state.recommendations.columns:
-            st.caption("(추천 점수 또는 이름순)")
+        st.caption(f"(추천 점수 또는 이름순 · 데이터 버전 {st.session_state.recommendations_version})")
 
-        for index, row in st.session_state.recommendations.iterrows():
+        for index, pos in enumerate(st.session_state.recommendations):
+            row = mentors.iloc[pos]
             with st.container(border=True):
                 col_name, col_score = st.columns([3, 1])
                 with col_name:
@@ -294,6 +309,10 @@ def show_mentor_search_and_connect():
                     st.markdown(f"**소통 스타일:** {row['style']}")
 
                 st.markdown(f"**멘토 한마디:** _{row['intro']}_")
+                if similar_graph is not None:
+                    similar_pos, _ = similar(similar_graph, int(pos))
+                    if len(similar_pos):
+                        st.caption("비슷한 멘토: " + " · ".join(mentors['name'].iloc[similar_pos].astype(str)))
 
                 connect_button_key = f"connect_btn_{row['name']}_{index}"
                 # 버튼 색상을 primary(파란색) 계열로 유지
@@ -677,4 +696,8 @@ def main():
             show_daily_question()
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        # 이번 실행이 빌린 데이터 세트 버전 반납(st.stop/st.rerun 포함) — 교체된 버전은 마지막 반납 때 해제
+        dataset_manager().release(dataset)
@@ -0,0 +1,214 @@
+# assignment.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 전체 배정 — 멘토 정원(capacity)을 지키며 총점 합이 최대인 멘티→멘토 배정
+
+핵심
+- 멘티별 독립 랭킹은 모두에게 같은 인기 멘토를 보여 줌 → 배치 모드에서는 전체를 한 번에 배정
+- 후보 그래프: 멘티마다 상위 N명 멘토만 간선으로 남긴 희소 그래프(CSR, 값 = compute_score 총점)
+  (멘토 청크 × 멘티 블록 행렬 연산, 청크 간 top-N 병합도 배열 연산)
+- 배정: 멘토 j를 정원 c_j개 슬롯으로 펼친 희소 이분 그래프에서 최대 가중 매칭
+  (scipy.sparse.csgraph.min_weight_full_bipartite_matching = 희소 LAPJV 최단 증가 경로,
+  단위 용량 최소 비용 흐름과 동일) — 조밀한 M × n 헝가리안 행렬을 만들지 않음
+- 멘티마다 전용 "미배정" 열을 두어 항상 해가 있음, 동점이면 더 많은 멘티를 배정
+- CLI: 멘티 설문 CSV + 멘토 CSV(선택 capacity 컬럼) → 배정 CSV와 요약
+
+사용 예
+    python assignment.py mentees.csv 멘토더미.csv -o assignments.csv --capacity 5 -N 20 --workers 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix, vstack
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+from matching import APP_AVAILABILITY, AVAILABILITY_MODES, MentorMatrix
+from ranking import BLOCK_CHUNK_SIZE
+
+DEFAULT_CANDIDATES = 20
+DEFAULT_CAPACITY = 5
+CAPACITY_COLUMN = "capacity"
+_POS_MASK = (1 << 32) - 1
+
+
+def candidate_graph(engine: MentorMatrix, mentees: List[Dict], n_candidates: int = DEFAULT_CANDIDATES,
+                    chunk_size: int = BLOCK_CHUNK_SIZE) -> csr_matrix:
+    """멘티별 상위 n_candidates명 후보 그래프 (멘티 × 멘토 CSR, 값 = 총점).
+
+    동점은 멘토 위치가 빠른 쪽 우선(rank_mentors와 같은 규칙). 총점 0인 간선도 명시적으로 보관.
+    """
+    m = len(mentees)
+    N = max(0, min(n_candidates, engine.n))
+    if N == 0:
+        # 멘토 풀이 비었거나 후보 0명 → 간선 없는 그래프(전원 미배정)
+        return csr_matrix((m, engine.n), dtype=np.int16)
+    # (총점 << 32) | (뒤집은 위치) 정수 키 하나로 점수 내림차순 + 위치 오름차순 비교
+    best = np.zeros((0, m), dtype=np.int64)
+    for start in range(0, engine.n, chunk_size):
+        stop = min(start + chunk_size, engine.n)
+        totals = engine.score_block(mentees, rows=slice(start, stop))["total"].astype(np.int64)
+        keys = (totals << 32) | (_POS_MASK - np.arange(start, stop, dtype=np.int64))[:, None]
+        cand = np.vstack([best, keys])
+        if len(cand) > N:
+            cand = np.take_along_axis(cand, np.argpartition(-cand, N - 1, axis=0)[:N], axis=0)
+        best = cand
+    best = -np.sort(-best, axis=0)
+    indptr = np.arange(0, m * N + 1, N, dtype=np.int64)
+    indices = (_POS_MASK - (best & _POS_MASK)).T.ravel()
+    data = (best >> 32).T.ravel().astype(np.int16)
+    return csr_matrix((data, indices, indptr), shape=(m, engine.n))
+
+
+def mentor_capacities(mentors_df: pd.DataFrame, default: int = DEFAULT_CAPACITY,
+                      column: str = CAPACITY_COLUMN) -> np.ndarray:
+    """멘토별 정원. column 값이 비었거나 숫자가 아니면 default."""
+    if column not in mentors_df.columns:
+        return np.full(len(mentors_df), default, dtype=np.int64)
+    cap = pd.to_numeric(mentors_df[column], errors="coerce").fillna(default)
+    return cap.clip(lower=0).astype(np.int64).to_numpy()
+
+
+def assign(graph: csr_matrix, capacity: np.ndarray) -> np.ndarray:
+    """정원 안에서 총점 합이 최대인 배정. 멘티별 멘토 위치(-1 = 미배정)를 반환."""
+    M, n = graph.shape
+    out = np.full(M, -1, dtype=np.int64)
+    if M == 0 or graph.nnz == 0:
+        return out  # 멘티 없음 또는 간선 없음(빈 멘토 풀·후보 0명) → 전원 미배정
+    capacity = np.clip(np.asarray(capacity, dtype=np.int64), 0, None)
+    cols = graph.indices.astype(np.int64)
+    rows = np.repeat(np.arange(M), np.diff(graph.indptr))
+    # 간선 (멘티, 멘토 j)를 멘토 j의 슬롯 c_j개로 복제
+    c = capacity[cols]
+    slot_start = np.concatenate([[0], np.cumsum(capacity)[:-1]])
+    n_slots = int(capacity.sum())
+    offset = np.arange(int(c.sum())) - np.repeat(np.cumsum(c) - c, c)
+    slot_rows = np.repeat(rows, c)
+    slot_cols = np.repeat(slot_start[cols], c) + offset
+    # 희소 행렬에서 0은 "간선 없음"이므로 가중치 = 총점 + 1
+    slot_w = np.repeat(graph.data.astype(np.float64) + 1, c)
+    # 멘티 전용 미배정 열: 가중치가 1보다 아주 조금 작음 → 총점 합이 같으면 배정 인원이 많은 해
+    dummy_w = 1.0 - 1.0 / (2 * (M + 1))
+    B = csr_matrix((np.concatenate([slot_w, np.full(M, dummy_w)]),
+                    (np.concatenate([slot_rows, np.arange(M)]),
+                     np.concatenate([slot_cols, n_slots + np.arange(M)]))),
+                   shape=(M, n_slots + M))
+    row_ind, col_ind = min_weight_full_bipartite_matching(B, maximize=True)
+    slot_owner = np.repeat(np.arange(n), capacity)
+    real = col_ind < n_slots
+    out[row_ind[real]] = slot_owner[col_ind[real]]
+    return out
+
+
+def assigned_choice(graph: csr_matrix, assigned: np.ndarray) -> tuple:
+    """멘티별 (배정 멘토의 후보 순위 1~N, 총점). 미배정은 (0, 0)."""
+    M = graph.shape[0]
+    rows = np.repeat(np.arange(M), np.diff(graph.indptr))
+    hit = np.flatnonzero(graph.indices == assigned[rows])
+    choice = np.zeros(M, dtype=np.int64)
+    score = np.zeros(M, dtype=np.int64)
+    choice[rows[hit]] = hit - graph.indptr[rows[hit]] + 1
+    score[rows[hit]] = graph.data[hit]
+    return choice, score
+
+
+def assignment_report(graph: csr_matrix, assigned: np.ndarray, capacity: np.ndarray) -> Dict[str, float]:
+    """배정 요약: 배정 인원, 총점 합, 독립 1순위 합(정원 무시 상한), 1순위 배정 비율, 멘토 부하."""
+    choice, score = assigned_choice(graph, assigned)
+    deg = np.diff(graph.indptr)
+    load = np.bincount(assigned[assigned >= 0], minlength=len(capacity))
+    n_assigned = int((assigned >= 0).sum())
+    return {
+        "mentees": graph.shape[0], "assigned": n_assigned, "total": int(score.sum()),
+        "mean": float(score[assigned >= 0].mean()) if n_assigned else 0.0,
+        "independent_top1_total": int(graph.data[graph.indptr[:-1][deg > 0]].astype(np.int64).sum()),
+        "first_choice": float((choice == 1).sum() / max(1, n_assigned)),
+        "mentors_used": int((load > 0).sum()), "max_load": int(load.max()) if len(load) else 0,
+        "over_capacity": int((load > capacity).sum()),
+    }
+
+
+# ---------- 배치 CLI (후보 그래프는 batch_match 워커 재사용) ----------
+def _graph_block(args) -> csr_matrix:
+    import batch_match
+    from batch_match import mentee_from_row
+
+    _, rows, n_candidates = args
+    return candidate_graph(batch_match._ENGINE, [mentee_from_row(r) for r in rows], n_candidates)
+
+
+def build_graph(mentee_csv: str, mentor_csv: str, n_candidates: int = DEFAULT_CANDIDATES,
+                workers: Optional[int] = None, block_size: int = 256,
+                text_analyzer: str = "char", availability: str = APP_AVAILABILITY) -> csr_matrix:
+    """멘티 설문 CSV 전체의 후보 그래프 — 멘티 블록을 프로세스 풀로 병렬 처리."""
+    from batch_match import _blocks, _init_worker, read_csv_any
+
+    mentees_df = read_csv_any(mentee_csv, dtype=str)
+    workers = workers or os.cpu_count() or 1
+    blocks = _blocks(mentees_df, n_candidates, block_size)
+    if workers <= 1:
+        _init_worker(mentor_csv, text_analyzer, availability)
+        parts = list(map(_graph_block, blocks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(mentor_csv, text_analyzer, availability)) as pool:
+            parts = list(pool.map(_graph_block, blocks))
+    return vstack(parts, format="csr") if parts else csr_matrix((0, 0))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from batch_match import read_csv_any
+
+    ap = argparse.ArgumentParser(description="결 전체 배정: 멘토 정원 안에서 총점 합 최대")
+    ap.add_argument("mentees", help="멘티 설문 CSV(배치 매칭과 같은 형식)")
+    ap.add_argument("mentors", help=f"멘토 CSV (선택: '{CAPACITY_COLUMN}' 컬럼에 멘토별 정원)")
+    ap.add_argument("-o", "--output", default="gyeol_assignments.csv")
+    ap.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="정원 컬럼이 없을 때 멘토별 정원")
+    ap.add_argument("-N", "--candidates", type=int, default=DEFAULT_CANDIDATES, help="멘티별 후보 멘토 수")
+    ap.add_argument("--workers", type=int, default=None, help="후보 그래프 프로세스 수(기본: 전체 코어)")
+    ap.add_argument("--block-size", type=int, default=256)
+    ap.add_argument("--text-analyzer", choices=["word", "char"], default="char")
+    ap.add_argument("--availability", choices=AVAILABILITY_MODES, default=APP_AVAILABILITY,
+                    help=f"소통 시간 겹침 방식(기본: 결 앱과 같은 {APP_AVAILABILITY})")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    graph = build_graph(args.mentees, args.mentors, args.candidates, args.workers,
+                        args.block_size, args.text_analyzer, args.availability)
+    t1 = time.perf_counter()
+    mentors_df = read_csv_any(args.mentors)
+    capacity = mentor_capacities(mentors_df, args.capacity)
+    assigned = assign(graph, capacity)
+    t2 = time.perf_counter()
+
+    mentees_df = read_csv_any(args.mentees, dtype=str)
+    choice, score = assigned_choice(graph, assigned)
+    ok = assigned >= 0
+    mentor_names = (mentors_df["name"].astype(str).to_numpy() if "name" in mentors_df.columns
+                    else np.full(len(mentors_df), "", dtype=object))
+    out = pd.DataFrame({
+        "mentee_row": np.arange(len(assigned)),
+        "mentee_name": mentees_df["name"].fillna("").to_numpy() if "name" in mentees_df.columns else "",
+        "mentor_row": pd.array(np.where(ok, assigned, 0), dtype="Int64"),
+        "mentor_name": np.where(ok, mentor_names[np.maximum(assigned, 0)], ""),
+        "total": pd.array(score, dtype="Int64"),
+        "choice": pd.array(choice, dtype="Int64"),
+    })
+    out.loc[~ok, ["mentor_row", "total", "choice"]] = pd.NA
+    out.to_csv(args.output, index=False, encoding="utf-8-sig")
+
+    r = assignment_report(graph, assigned, capacity)
+    print(f"후보 그래프 {graph.shape[0]}×{graph.shape[1]} (간선 {graph.nnz}) {t1 - t0:.1f}s · 배정 {t2 - t1:.1f}s")
+    print(f"배정 {r['assigned']}/{r['mentees']}명 · 총점 합 {r['total']} (정원 무시 1순위 합 "
+          f"{r['independent_top1_total']}) · 평균 {r['mean']:.1f} · 1순위 배정 {r['first_choice']:.1%} · "
+          f"멘토 {r['mentors_used']}명 사용, 최대 {r['max_load']}명")
+    print(f"저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# batch_match.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 배치 매칭 CLI — 박람회 후 멘티 설문 CSV 전체를 멘토 풀과 한 번에 매칭
+
+사용 예
+    python batch_match.py mentees.csv 멘토더미.csv -o recommendations.csv
+    python batch_match.py mentees.csv mentors.csv -o rec.parquet -k 10 --workers 8
+
+핵심
+- 멘티 설문 컬럼은 결 설문 폼과 동일: name, gender, age_band, comm_modes, time_slots,
+  days, style, interests, purpose, topics, wanted_majors, wanted_mentor_ages, note
+  (복수 선택 항목은 "," 또는 ";"로 구분)
+- 멘티 블록 단위로 (멘토 × 멘티) 행렬 연산(MentorMatrix.score_block) → 멘티별 top-k
+- 프로세스 풀(기본: 전체 코어)로 블록 병렬 처리, 결과는 블록 순서대로 CSV/Parquet에 스트리밍
+- 멘토 CSV 컬럼 정리(clean_columns)와 소통 시간 방식(--availability, 기본 APP_AVAILABILITY)은 결 앱과 같음
+  → 같은 멘티 설문이면 앱 화면과 같은 추천
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from matching import APP_AVAILABILITY, AVAILABILITY_MODES, COMPONENTS, MentorMatrix, list_to_set
+from mentor_snapshot import clean_columns
+from ranking import DEFAULT_TOP_K, rank_many
+
+MENTEE_SET_COLS = [
+    "comm_modes", "time_slots", "days", "interests", "purpose", "topics",
+    "wanted_majors", "wanted_mentor_ages",
+]
+MENTEE_STR_COLS = ["name", "gender", "age_band", "style", "note"]
+BLOCK_SIZE = 256
+
+# 워커 프로세스마다 1회 구성되는 멘토 엔진
+_ENGINE: Optional[MentorMatrix] = None
+
+
+def read_csv_any(path: str, **kwargs) -> pd.DataFrame:
+    """UTF-8로 읽고, 실패하면 cp949로 재시도(멘토더미.csv 등 엑셀 저장본 대응). 컬럼 정리는 앱과 같음."""
+    try:
+        df = pd.read_csv(path, encoding="utf-8", **kwargs)
+    except UnicodeDecodeError:
+        df = pd.read_csv(path, encoding="cp949", **kwargs)
+    return clean_columns(df)
+
+
+def mentee_from_row(row: Dict) -> Dict:
+    """설문 CSV 한 행 → 결 앱의 mentee dict와 같은 형태."""
+    mentee = {c: ("" if pd.isna(row.get(c)) else str(row.get(c)).strip()) for c in MENTEE_STR_COLS}
+    mentee.update({c: list_to_set(row.get(c, "")) for c in MENTEE_SET_COLS})
+    return mentee
+
+
+def _init_worker(mentor_csv: str, text_analyzer: str, availability: str = APP_AVAILABILITY) -> None:
+    global _ENGINE
+    _ENGINE = MentorMatrix(read_csv_any(mentor_csv), text_analyzer=text_analyzer, availability=availability)
+
+
+def _rank_block(args) -> List[Dict]:
+    offset, rows, k = args
+    mentees = [mentee_from_row(r) for r in rows]
+    out = []
+    for j, (mentee, ranked) in enumerate(zip(mentees, rank_many(_ENGINE, mentees, k=k))):
+        for rank, item in enumerate(ranked, start=1):
+            out.append({
+                "mentee_row": offset + j, "mentee_name": mentee["name"], "rank": rank,
+                "mentor_row": item["pos"], "mentor_name": _ENGINE.names[item["pos"]],
+                "total": item["total"], **item["breakdown"],
+            })
+    return out
+
+
+def _blocks(mentees_df: pd.DataFrame, k: int, block_size: int) -> Iterator:
+    records = mentees_df.to_dict("records")
+    for start in range(0, len(records), block_size):
+        yield start, records[start:start + block_size], k
+
+
+class _ResultWriter:
+    """CSV 또는 Parquet(확장자 .parquet, pyarrow 필요)로 블록 단위 스트리밍 저장."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet = path.lower().endswith(".parquet")
+        self._pq_writer = None
+        self._wrote_header = False
+        if self.parquet:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                sys.exit("Parquet 출력에는 pyarrow가 필요합니다: pip install pyarrow")
+
+    def write(self, rows: List[Dict]) -> None:
+        if not rows:
+            return
+        df = pd.DataFrame(rows, columns=["mentee_row", "mentee_name", "rank", "mentor_row",
+                                         "mentor_name", "total", *COMPONENTS])
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._pq_writer is None:
+                self._pq_writer = pq.ParquetWriter(self.path, table.schema)
+            self._pq_writer.write_table(table)
+        else:
+            # 첫 블록만 BOM 포함(엑셀 호환), 이후 블록은 이어 쓰기
+            if self._wrote_header:
+                df.to_csv(self.path, mode="a", header=False, index=False, encoding="utf-8")
+            else:
+                df.to_csv(self.path, index=False, encoding="utf-8-sig")
+                self._wrote_header = True
+
+    def close(self) -> None:
+        if self._pq_writer is not None:
+            self._pq_writer.close()
+
+
+def run_batch(mentee_csv: str, mentor_csv: str, output: str, k: int = DEFAULT_TOP_K,
+              workers: Optional[int] = None, block_size: int = BLOCK_SIZE,
+              text_analyzer: str = "char", availability: str = APP_AVAILABILITY) -> int:
+    """배치 매칭 실행. 기록한 추천 행 수를 반환."""
+    mentees_df = read_csv_any(mentee_csv, dtype=str)
+    writer = _ResultWriter(output)
+    written = 0
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers <= 1:
+            _init_worker(mentor_csv, text_analyzer, availability)
+            for rows in map(_rank_block, _blocks(mentees_df, k, block_size)):
+                writer.write(rows)
+                written += len(rows)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(mentor_csv, text_analyzer, availability)) as pool:
+                for rows in pool.map(_rank_block, _blocks(mentees_df, k, block_size)):
+                    writer.write(rows)
+                    written += len(rows)
+    finally:
+        writer.close()
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="결 배치 매칭: 멘티 설문 CSV → 멘티별 추천 멘토 top-k")
+    ap.add_argument("mentees", help="멘티 설문 CSV")
+    ap.add_argument("mentors", help="멘토 CSV")
+    ap.add_argument("-o", "--output", default="gyeol_batch_recommendations.csv",
+                    help="결과 파일(.csv 또는 .parquet)")
+    ap.add_argument("-k", "--top-k", type=int, default=DEFAULT_TOP_K, help="멘티별 추천 인원")
+    ap.add_argument("--workers", type=int, default=None, help="프로세스 수(기본: 전체 코어)")
+    ap.add_argument("--block-size", type=int, default=BLOCK_SIZE, help="워커당 멘티 블록 크기")
+    ap.add_argument("--text-analyzer", choices=["word", "char"], default="char")
+    ap.add_argument("--availability", choices=AVAILABILITY_MODES, default=APP_AVAILABILITY,
+                    help=f"소통 시간 겹침 방식(기본: 결 앱과 같은 {APP_AVAILABILITY})")
+    args = ap.parse_args(argv)
+
+    n = run_batch(args.mentees, args.mentors, args.output, k=args.top_k, workers=args.workers,
+                  block_size=args.block_size, text_analyzer=args.text_analyzer, availability=args.availability)
+    print(f"추천 {n}행 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
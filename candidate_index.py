@@ -0,0 +1,121 @@
+# candidate_index.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 후보 검색 — 역색인(posting list) + 점수 상한(upper bound) 가지치기
+
+핵심
+- posting list: (컬럼, 값/토큰) → 해당 멘토 위치 배열
+  occupation_major / style / age_band 값, purpose·topic_prefs·interests·소통 항목 토큰,
+  소개글 TF-IDF 어휘(CSC 열)까지
+- 멘티 토큰의 posting만 따라가 멘토별 상한을 누적: 항목 점수는 교집합 개수로 정확히,
+  텍스트는 "공통 어휘가 있으면 최대 10점"으로 상한만 (소통 선호는 비트마스크로 정확히)
+- 상한은 기본 가중치(DEFAULT_WEIGHTS) 기준 — 다른 가중치 프로필은 weight_profiles로 전수 계산
+- WAND/분기한정 방식: 상한이 높은 묶음부터 정밀 점수(MentorMatrix.score_all)를 매기고,
+  다음 묶음 상한이 현재 k등 점수보다 낮으면 중단 → 전수 조사와 결과 동일
+- 범위: 상한 계산 자체는 멘토 n명 길이 배열 연산(posting 누적·소통 비트마스크·범주형 posting)으로 O(n)이고,
+  텍스트를 뺀 컴포넌트는 사실상 정확값 → 느슨한 것은 텍스트(최대 TEXT_MAX)뿐. 줄어드는 것은 정밀 점수를
+  매기는 행 수(rank()의 두 번째 반환값)이며, 이득은 텍스트 점수로 순위가 바뀔 수 없는 멘토를 건너뛰는 만큼
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from matching import DEFAULT_WEIGHTS, FACETS, MentorMatrix
+from ranking import DEFAULT_TOP_K, _winners, top_k
+
+TEXT_MAX = DEFAULT_WEIGHTS["text"]
+
+
+def _code_postings(codes: np.ndarray, n_codes: int) -> List[np.ndarray]:
+    """정수 코드 → 해당 멘토 위치 배열(코드 순서 리스트)."""
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_codes + 1))
+    return [order[bounds[c]:bounds[c + 1]] for c in range(n_codes)]
+
+
+class CandidateIndex:
+    """MentorMatrix 위에 올리는 역색인. 멘토 테이블이 바뀌면 새로 만든다."""
+
+    def __init__(self, engine: MentorMatrix):
+        self.engine = engine
+        self.n = engine.n
+        # 항목 토큰 posting
+        self.token_postings: Dict[str, Dict[str, np.ndarray]] = {}
+        for _, col, _ in FACETS:
+            fm = engine.facets[col]
+            by_token = fm.matrix.T
+            self.token_postings[col] = {tok: np.flatnonzero(by_token[j]) for tok, j in fm.vocab.items()}
+        # 범주형 값 posting
+        self.major_postings = _code_postings(engine.major_codes, engine.major_lut.empty_code + 1)
+        self.age_postings = _code_postings(engine.age_codes, engine.age_lut.empty_code + 1)
+        self.style_postings = _code_postings(engine.style_codes, engine.style_lut.empty_code + 1)
+        # 텍스트 어휘 posting (CSC 열)
+        tm = engine.text.matrix
+        self.text_csc = tm.tocsc() if tm is not None else None
+
+    # ---------- 상한 ----------
+    def _facet_ratio(self, col: str, mentee_set) -> np.ndarray:
+        fm = self.engine.facets[col]
+        out = np.zeros(self.n, dtype=np.float64)
+        if not mentee_set:
+            return out
+        inter = np.zeros(self.n, dtype=np.int32)
+        for tok in mentee_set:
+            p = self.token_postings[col].get(tok)
+            if p is not None:
+                inter[p] += 1
+        hit = inter > 0
+        out[hit] = inter[hit] / (len(mentee_set) + fm.sizes[hit] - inter[hit])
+        return out
+
+    def upper_bounds(self, mentee: Dict) -> np.ndarray:
+        """멘토별 총점 상한(정수). 실제 총점 <= 상한이 항상 성립.
+
+        멘토 전체 길이 배열로 계산(O(n)) — 텍스트 외 컴포넌트는 정확값, 텍스트만 공통 어휘 유무로 상한.
+        """
+        ratio = {key: self._facet_ratio(col, mentee[key])
+                 for key, col, _ in FACETS if key in ("purpose", "topics", "interests")}
+        w = DEFAULT_WEIGHTS
+        ub = (np.rint(ratio["purpose"] * w["purpose"] + ratio["topics"] * w["topics"])
+              + np.rint(ratio["interests"] * w["interests"])).astype(np.int64)
+        # 소통 선호는 비트마스크 popcount라 전수 계산해도 싸다 → 정확한 값 사용
+        ub += self.engine.comm_score(mentee)
+
+        eng = self.engine
+        for postings, table in ((self.major_postings, eng.major_lut.scores(mentee["wanted_majors"])),
+                                (self.age_postings, eng.age_lut.scores(mentee["wanted_mentor_ages"])),
+                                (self.style_postings, eng.style_lut.scores(mentee.get("style", "")))):
+            for code in np.flatnonzero(table):
+                ub[postings[code]] += table[code]
+
+        note = (mentee.get("note", "") or "").strip()
+        if note and self.text_csc is not None:
+            terms = self.engine.text.vectorizer.transform([note]).indices
+            if len(terms):
+                col = self.text_csc[:, terms]
+                ub[np.unique(col.indices)] += TEXT_MAX
+        return np.clip(ub, 0, 100)
+
+    # ---------- 검색 ----------
+    def rank(self, mentee: Dict, k: int = DEFAULT_TOP_K) -> Tuple[List[Dict], int]:
+        """상위 k명(rank_mentors와 동일 결과)과 정밀 점수를 매긴 멘토 수를 반환."""
+        ub = self.upper_bounds(mentee)
+        best_tot = np.zeros(0, dtype=np.int64)
+        best_pos = np.zeros(0, dtype=np.int64)
+        scored = 0
+        order = np.argsort(-ub, kind="stable")
+        levels, starts = np.unique(-ub[order], return_index=True)
+        starts = list(starts) + [self.n]
+        for lvl, a, b in zip(-levels, starts[:-1], starts[1:]):
+            # 동점은 위치가 빠른 멘토가 이기므로, 상한 == k등 점수인 묶음까지는 확인
+            if len(best_pos) >= k and lvl < best_tot[-1]:
+                break
+            rows = np.sort(order[a:b])
+            totals = self.engine.score_all(mentee, rows=rows)["total"]
+            scored += len(rows)
+            cand_tot = np.concatenate([best_tot, totals])
+            cand_pos = np.concatenate([best_pos, rows])
+            keep = top_k(cand_tot, k, cand_pos)
+            best_tot, best_pos = cand_tot[keep], cand_pos[keep]
+        return _winners(self.engine, mentee, best_pos), scored
@@ -0,0 +1,182 @@
+# dataset_manager.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 데이터 세트 관리자 — 새 멘토 데이터와 파생 구조를 백그라운드에서 만들고 포인터 한 번으로 교체
+
+핵심
+- DatasetVersion: 데이터 세트 버전 1개 = 스냅샷(MentorStore) + 파생 구조 dict(build 콜백 결과) + 참조 수
+- 요청(스크립트 실행 1회)은 acquire()로 현재 버전을 빌리고 끝나면 release() — 도중에 교체돼도 같은 버전을 씀
+- acquire()마다 저장소 파일 서명만 확인(os.stat) → 바뀌었으면 백그라운드 스레드가 새 스냅샷과 파생 구조를 만든 뒤
+  self._current = new 대입 한 번으로 공개(원자적), 그 전까지 들어온 요청은 이전 버전으로 계속 처리
+- 교체된 이전 버전은 retired 표시 → 참조 수가 0이 되는 순간 프레임/파생 구조 참조를 놓아 메모리 회수
+- 내용이 같은 파일(버전 해시 동일)은 교체하지 않음, 오류 스냅샷(파일 없음·컬럼 누락)은 첫 로드가 아니면
+  공개하지 않고 last_error에만 기록(기존 버전 계속 제공)
+- publish(snapshot): 저장소 밖 데이터(업로드 등)도 같은 경로로 교체 — 재구축 중이면 예약해 두고
+  같은 스레드가 이어서 처리(예약은 가장 최근 스냅샷 1개, 중간 것은 어차피 바로 교체되므로 건너뜀)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from mentor_store import MentorSnapshot, MentorStore
+
+
+class DatasetVersion:
+    """공개된 데이터 세트 버전 1개. 파생 구조는 ds["이름"]으로 조회."""
+
+    __slots__ = ("version", "snapshot", "derived", "refs", "retired", "published_at")
+
+    def __init__(self, snapshot: MentorSnapshot, derived: Dict[str, Any]):
+        self.version = snapshot.version
+        self.snapshot: Optional[MentorSnapshot] = snapshot
+        self.derived = derived
+        self.refs = 0
+        self.retired = False
+        self.published_at = time.time()
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self.snapshot.df
+
+    def __getitem__(self, key: str) -> Any:
+        return self.derived[key]
+
+
+class DatasetManager:
+    """현재 데이터 세트 버전 포인터 + 백그라운드 재구축 + 참조 수 기반 해제."""
+
+    def __init__(self, store: MentorStore, build: Callable[[MentorSnapshot], Dict[str, Any]],
+                 background: bool = True):
+        self.store = store
+        self.build = build
+        self.background = background
+        self.swaps = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Optional[MentorSnapshot] = None  # 예약된 외부 스냅샷(publish)
+        self._recheck = False  # 예약된 저장소 재확인(check)
+        self._retired: List[DatasetVersion] = []  # 교체됐지만 아직 빌려 간 요청이 있는 버전
+        self._current = DatasetVersion(store.get(), {})  # 첫 버전은 바로(첫 요청만 기다림)
+        self._current.derived = build(self._current.snapshot)
+
+    @property
+    def current(self) -> DatasetVersion:
+        return self._current
+
+    # ---------- 요청 ----------
+    def acquire(self) -> DatasetVersion:
+        """현재 버전을 빌린다(참조 수 +1). 반드시 release()로 반납."""
+        self.check()
+        with self._lock:
+            ds = self._current
+            ds.refs += 1
+        return ds
+
+    def release(self, ds: DatasetVersion) -> None:
+        with self._lock:
+            ds.refs -= 1
+            if ds.retired and ds.refs <= 0:
+                self._free(ds)
+
+    @contextmanager
+    def lease(self) -> Iterator[DatasetVersion]:
+        ds = self.acquire()
+        try:
+            yield ds
+        finally:
+            self.release(ds)
+
+    # ---------- 교체 ----------
+    def check(self) -> bool:
+        """저장소 파일이 바뀌었으면 재구축을 시작(이미 진행 중이면 그대로). 시작했으면 True."""
+        if not self.store.is_stale():
+            return False
+        return self._start(None)
+
+    def publish(self, snapshot: MentorSnapshot, wait: bool = False) -> bool:
+        """외부 스냅샷을 새 버전으로 — 파생 구조는 백그라운드에서 만들고 끝나면 교체.
+
+        재구축이 진행 중이어도 버리지 않고 예약. wait=True면 끝날 때까지 기다려 현재 버전이 됐는지 반환
+        (오류 스냅샷·빌드 실패면 False, 사유는 last_error), wait=False면 예약만 하고 True.
+        """
+        self._start(snapshot)
+        if not wait:
+            return True
+        self.join()
+        return self._current.version == snapshot.version
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """예약된 작업까지 모두 끝날 때까지 기다린다."""
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _start(self, snapshot: Optional[MentorSnapshot]) -> bool:
+        """작업 예약 → 스레드가 없으면 시작해 True, 이미 돌고 있으면 그 스레드가 이어서 처리하고 False."""
+        with self._lock:
+            if snapshot is not None:
+                self._pending = snapshot
+            else:
+                self._recheck = True
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(target=self._rebuild, name="dataset-rebuild", daemon=True)
+            thread = self._thread
+        if self.background:
+            thread.start()
+        else:
+            thread.run()
+        return True
+
+    def _rebuild(self) -> None:
+        """예약이 없을 때까지 처리(외부 스냅샷 먼저, 그다음 저장소 재확인)."""
+        while True:
+            with self._lock:
+                snapshot, self._pending = self._pending, None
+                if snapshot is None:
+                    if not self._recheck:
+                        self._thread = None
+                        return
+                    self._recheck = False
+            try:
+                self._apply(snapshot if snapshot is not None else self.store.get())
+            except Exception as e:
+                self.last_error = f"데이터 세트 재구축 실패: {e}"
+
+    def _apply(self, snap: MentorSnapshot) -> None:
+        if snap.error:
+            self.last_error = snap.error  # 깨진 새 파일 → 기존 버전 유지
+            return
+        self.last_error = None
+        if snap.version == self._current.version:
+            return
+        fresh = DatasetVersion(snap, self.build(snap))  # 잠금 밖에서 — 그동안 요청은 이전 버전
+        self._swap(fresh)
+
+    def _swap(self, fresh: DatasetVersion) -> None:
+        with self._lock:
+            old, self._current = self._current, fresh
+            self.swaps += 1
+            old.retired = True
+            if old.refs <= 0:
+                self._free(old)
+            else:
+                self._retired.append(old)
+
+    def _free(self, ds: DatasetVersion) -> None:
+        """(잠금 안에서) 이전 버전의 프레임/파생 구조 참조를 놓는다."""
+        ds.derived = {}
+        ds.snapshot = None
+        if ds in self._retired:
+            self._retired.remove(ds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"version": self._current.version, "refs": self._current.refs, "swaps": self.swaps,
+                    "building": self._thread is not None, "last_error": self.last_error,
+                    "retired": [(ds.version, ds.refs) for ds in self._retired]}
@@ -0,0 +1,260 @@
+# dataset_registry.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 멘토 데이터 세트 버전 레지스트리 — 내용 해시 키, 업로드 중복 제거, 고정/활성화, 메모리 상한 LRU 축출
+
+핵심
+- 버전 키 = dataset_version(프레임)(검증을 마친 데이터 내용 해시) → 결과 캐시/엔진 캐시 키와 같음
+- 업로드 파일 바이트 sha1(upload_digest) → 버전 키 별칭: 같은 파일을 다시 올리면 수집(MentorIngest) 없이 재사용,
+  다른 파일이라도 검증 결과가 같으면 같은 버전 하나로 합침
+- 업로드 수집 작업도 레지스트리가 보관(프로세스 공용) — 끝나면 프레임/인덱스를 버전으로 옮기고 작업에는 보고만 남김
+- active: 모든 세션이 쓰는 버전(관리자가 activate), pinned: 축출 제외(기본 데이터는 고정)
+- 상주 크기(resident_bytes: 프레임 deep + 인덱스 numpy 배열) 합이 max_bytes를 넘으면
+  고정·활성이 아닌 버전을 오래 안 쓴 순서(LRU)로 축출, 축출된 키는 pop_evicted()로 받아 결과 캐시에서 지움
+- 파생 구조(엔진·역색인·비슷한 멘토 작업 등)도 derive()로 버전에 딸려 보관 → 상주 크기에 포함되고,
+  축출되면 버전과 함께 버려짐(close()가 있는 객체는 닫음: 백그라운드 작업 중단)
+- report(): 버전별 행 수/상주 크기/고정·활성 여부(관리자 화면 표)
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from matching import dataset_version
+from mentor_ingest import MentorIngest
+
+REGISTRY_MAX_BYTES = 256 * 2**20
+_WALK_DEPTH = 6
+
+
+def upload_digest(source) -> str:
+    """업로드 파일 바이트의 sha1 앞 16자(같은 파일 재업로드 식별, getbuffer면 복사 없음)."""
+    if hasattr(source, "getbuffer"):
+        return hashlib.sha1(source.getbuffer()).hexdigest()[:16]
+    source.seek(0)
+    digest = hashlib.sha1(source.read()).hexdigest()[:16]
+    source.seek(0)
+    return digest
+
+
+def _array_bytes(obj: Any, seen: Set[int], depth: int = 0) -> int:
+    """obj의 속성/원소를 따라가며 numpy 배열(희소 행렬의 data/indices/indptr 포함)과 pandas 객체 바이트 합."""
+    if obj is None or depth > _WALK_DEPTH or id(obj) in seen or isinstance(obj, (str, bytes, int, float, type)):
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, dict):
+        children = list(obj.values())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        children = list(obj)
+    else:
+        children = list(getattr(obj, "__dict__", {}).values())
+        children += [getattr(obj, s, None) for s in getattr(type(obj), "__slots__", ())]
+    return sum(_array_bytes(c, seen, depth + 1) for c in children)
+
+
+def resident_bytes(frame: pd.DataFrame, index: Any = None) -> int:
+    """버전 1개의 상주 크기 추정(프레임 deep + 인덱스 배열, 공유 객체는 한 번만)."""
+    seen: Set[int] = set()
+    return _array_bytes(frame, seen) + _array_bytes(index, seen)
+
+
+def _close(obj: Any) -> None:
+    close = getattr(obj, "close", None)
+    if callable(close):
+        close()
+
+
+class DatasetEntry:
+    """등록된 데이터 세트 버전 1개(frame은 공유 읽기 전용)."""
+
+    __slots__ = ("key", "label", "frame", "index", "source", "base_bytes", "derived", "derived_bytes",
+                 "pinned", "added_at", "last_used", "_lock")
+
+    def __init__(self, key: str, label: str, frame: pd.DataFrame, index: Any = None, pinned: bool = False,
+                 source: Optional[str] = None):
+        self.key = key
+        self.label = label
+        self.frame = frame
+        self.index = index  # 업로드 수집 중 만든 ChunkedMentorIndex(기본 데이터는 None)
+        self.source = source  # 디스크의 원본 CSV 경로(업로드·메모리 데이터는 None)
+        self.base_bytes = resident_bytes(frame, index)
+        self.derived: Dict[Hashable, Tuple[Hashable, Any]] = {}  # 이름 → (tag, 파생 구조)
+        self.derived_bytes = 0
+        self.pinned = pinned
+        self.added_at = self.last_used = time.time()
+        self._lock = threading.RLock()  # 파생 구조 빌드(같은 버전의 중복 빌드 방지, 중첩 derive 허용)
+
+    @property
+    def nbytes(self) -> int:
+        return self.base_bytes + self.derived_bytes
+
+    def measure(self) -> int:
+        """파생 구조 상주 크기 재측정(프레임/수집 인덱스와 공유하는 객체는 빼고)."""
+        seen: Set[int] = {id(self.frame), id(self.index)}
+        self.derived_bytes = sum(_array_bytes(obj, seen) for _, obj in list(self.derived.values()))
+        return self.derived_bytes
+
+    def peek(self, name: Hashable, tag: Hashable = None) -> Any:
+        """이미 만든 파생 구조(없거나 tag가 다르면 None) — 만들지는 않음."""
+        held = self.derived.get(name)
+        return held[1] if held is not None and held[0] == tag else None
+
+    def drop_derived(self) -> None:
+        """파생 구조를 모두 닫고 놓는다(축출 시, 레지스트리 잠금 안 — 닫기는 중단 신호만 보내고 기다리지 않음)."""
+        derived, self.derived = self.derived, {}
+        self.derived_bytes = 0
+        for _, obj in derived.values():
+            _close(obj)
+
+
+class DatasetRegistry:
+    """프로세스 공용 버전 레지스트리. 조회(get/active)는 LRU 순서를 갱신한다."""
+
+    def __init__(self, max_bytes: int = REGISTRY_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.active_key: Optional[str] = None
+        self.evictions = 0
+        self._entries: "OrderedDict[str, DatasetEntry]" = OrderedDict()  # 오래 안 쓴 것이 앞
+        self._uploads: Dict[str, str] = {}  # 업로드 바이트 digest → 버전 키
+        self._jobs: Dict[str, MentorIngest] = {}  # digest → 수집 작업(끝난 뒤에는 보고만)
+        self._evicted: List[str] = []
+        self._lock = threading.RLock()
+
+    # ---------- 등록 ----------
+    def add(self, frame: pd.DataFrame, label: str, index: Any = None, digest: Optional[str] = None,
+            pinned: bool = False, source: Optional[str] = None) -> DatasetEntry:
+        """버전 등록(내용이 같은 버전이 있으면 그것을 반환). 첫 버전은 활성화."""
+        key = dataset_version(frame)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = DatasetEntry(key, label, frame, index, pinned, source)
+            else:
+                entry.pinned = entry.pinned or pinned
+            if digest is not None:
+                self._uploads[digest] = key
+            if self.active_key is None:
+                self.active_key = key
+            self._touch(entry)
+            self._evict(keep=key)
+            return entry
+
+    def upload(self, digest: str, source, label: str,
+               availability: str = "separate") -> Tuple[Optional[DatasetEntry], MentorIngest]:
+        """업로드 파일 1개 → (등록된 버전 또는 수집 중이면 None, 수집 작업).
+
+        같은 digest가 이미 등록돼 있으면 수집하지 않음, 축출된 뒤 다시 올리면 새로 수집.
+        """
+        with self._lock:
+            entry = self._entries.get(self._uploads.get(digest, ""))
+            job = self._jobs.get(digest)
+            if entry is None and (job is None or (job.status == "done" and job.frame is None)):
+                job = self._jobs[digest] = MentorIngest(source, availability=availability)
+            if entry is None and job.status == "done":
+                entry = self.add(job.frame, label, job.index, digest)
+                job.frame = job.index = None  # 데이터는 버전이 소유, 작업에는 진행/오류 보고만
+                job.source = None
+            if entry is not None:
+                self._touch(entry)
+            return entry, job
+
+    # ---------- 조회/관리 ----------
+    def get(self, key: str) -> Optional[DatasetEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._touch(entry)
+            return entry
+
+    def active(self) -> Optional[DatasetEntry]:
+        return self.get(self.active_key) if self.active_key else None
+
+    def activate(self, key: str) -> bool:
+        """모든 세션이 쓸 버전 지정(등록된 키만)."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self.active_key = key
+            self._evict(keep=key)
+            return True
+
+    def pin(self, key: str, pinned: bool = True) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry.pinned = pinned
+            self._evict(keep=key)
+            return True
+
+    def derive(self, entry: DatasetEntry, name: Hashable, build: Callable[[], Any], tag: Hashable = None) -> Any:
+        """버전 entry에 딸린 파생 구조 name(없거나 tag가 바뀌었으면 build()로 만들고 이전 것은 닫음).
+
+        만든 뒤 상주 크기를 다시 재고 상한을 넘으면 다른 버전을 축출. 이미 축출된 entry면 보관만 하고 세지 않음.
+        """
+        with entry._lock:
+            held = entry.derived.get(name)
+            if held is not None and held[0] == tag:
+                return held[1]
+            obj = build()
+            entry.derived[name] = (tag, obj)
+            if held is not None:
+                _close(held[1])
+            entry.measure()
+        with self._lock:
+            if self._entries.get(entry.key) is entry:
+                self._evict(keep=entry.key)
+        return obj
+
+    def pop_evicted(self) -> List[str]:
+        """지난 호출 이후 축출된 버전 키(결과 캐시 정리용)."""
+        with self._lock:
+            evicted, self._evicted = self._evicted, []
+            return evicted
+
+    @property
+    def resident(self) -> int:
+        with self._lock:
+            return sum(e.nbytes for e in self._entries.values())
+
+    def report(self) -> List[Dict]:
+        """버전별 상태(최근 사용 순)."""
+        with self._lock:
+            for e in self._entries.values():
+                e.measure()  # 백그라운드 작업(그래프 등)이 끝나며 커진 파생 구조 반영
+            return [{"key": e.key, "label": e.label, "rows": len(e.frame), "bytes": e.nbytes,
+                     "pinned": e.pinned, "active": e.key == self.active_key,
+                     "last_used": e.last_used} for e in reversed(self._entries.values())]
+
+    # ---------- 내부 ----------
+    def _touch(self, entry: DatasetEntry) -> None:
+        entry.last_used = time.time()
+        self._entries.move_to_end(entry.key)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """상한을 넘으면 고정/활성/keep이 아닌 버전을 LRU 순서로 축출(그래도 넘으면 그대로 둠)."""
+        total = sum(e.nbytes for e in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if entry.pinned or key in (self.active_key, keep):
+                continue
+            del self._entries[key]
+            total -= entry.nbytes
+            self.evictions += 1
+            self._evicted.append(key)
+            entry.drop_derived()
+            for digest in [d for d, k in self._uploads.items() if k == key]:
+                del self._uploads[digest]
@@ -0,0 +1,301 @@
+# live_index.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 증분 인덱스 — 멘토/멘티가 가입·수정·탈퇴해도 전체 재구축 없이 바로 검색에 반영
+
+핵심
+- 본체(main) + 추가분(delta) 2단 구조: 본체는 마지막 압축 시점의 MentorMatrix/ReciprocalScorer,
+  추가분은 그 뒤 추가·수정된 행만 담은 작은 인덱스(쓰기마다 추가분만 다시 인코딩 → 수 ms)
+- 수정 = 본체 행 삭제 표시(tombstone) + 추가분에 새 값, 삭제 = 삭제 표시만
+- 항목 multi-hot / 소통 비트마스크 / 조회표 코드는 추가분이 자기 어휘로 따로 인코딩,
+  텍스트는 본체 vectorizer를 그대로 transform — 기본 analyzer "hash"(HashingVectorizer)는
+  적합할 어휘가 없어 추가분·본체·질의 벡터가 항상 같은 공간
+- 추가분이 DELTA_MAX행을 넘거나 삭제 표시가 TOMBSTONE_RATIO를 넘으면 백그라운드 스레드가
+  살아 있는 행 전체로 새 본체를 만들고(압축), 그동안 들어온 변경은 기록해 두었다가 교체 직후 재적용
+- 읽기는 잠금 없이 불변 상태 객체 하나를 참조 → 압축 중에도 검색이 멈추지 않음
+- LiveMenteeIndex.sync_file(): app.py 회원 파일(users.json)이 바뀌면 달라진 프로필만 반영
+"""
+
+import abc
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from matching import MentorMatrix, list_to_set
+from ranking import CHUNK_SIZE, DEFAULT_TOP_K, _merge, _winners, top_k
+from reciprocal import MENTOR_PREF_COLUMN, ReciprocalScorer, mentee_from_profile
+
+DELTA_MAX = 128
+TOMBSTONE_RATIO = 0.2
+LIVE_TEXT_ANALYZER = "hash"
+
+
+class _State:
+    """읽기용 불변 스냅샷: 본체 + 본체 행 생존 여부 + 추가분."""
+
+    __slots__ = ("main", "keys", "pos", "alive", "delta_rows", "delta")
+
+    def __init__(self, main, keys: List[Hashable], alive: np.ndarray,
+                 delta_rows: Dict[Hashable, Dict], delta, pos: Optional[Dict[Hashable, int]] = None):
+        self.main = main
+        self.keys = keys
+        self.pos = pos if pos is not None else {k: i for i, k in enumerate(keys)}
+        self.alive = alive
+        self.delta_rows = delta_rows
+        self.delta = delta
+
+    @property
+    def n_main(self) -> int:
+        return len(self.keys)
+
+
+class _LiveIndex(abc.ABC):
+    """본체/추가분/삭제 표시/백그라운드 압축 공통 부분. 하위 클래스는 _build만 정의."""
+
+    def __init__(self, rows: Dict[Hashable, Dict], delta_max: int = DELTA_MAX,
+                 tombstone_ratio: float = TOMBSTONE_RATIO, background: bool = True):
+        self.delta_max = delta_max
+        self.tombstone_ratio = tombstone_ratio
+        self.background = background
+        self.compactions = 0
+        self.generation = 0  # 반영한 쓰기 수(결과 캐시 키용)
+        self._lock = threading.Lock()
+        self._rows: Dict[Hashable, Dict] = dict(rows)  # 살아 있는 전체 행(압축 스냅샷 원본)
+        self._journal: Optional[List[tuple]] = None  # 압축 중 들어온 변경 (key, row 또는 None)
+        self._thread: Optional[threading.Thread] = None
+        self._state = self._fresh(self._rows)
+
+    @abc.abstractmethod
+    def _build(self, keys: List[Hashable], rows: List[Dict], base):
+        """행 목록 → 세그먼트 인덱스. base는 추가분이 텍스트 vectorizer를 빌려 올 본체(압축 시 None)."""
+
+    def _fresh(self, rows: Dict[Hashable, Dict]) -> _State:
+        keys = list(rows)
+        return _State(self._build(keys, list(rows.values()), None), keys,
+                      np.ones(len(keys), dtype=bool), {}, None)
+
+    def _applied(self, st: _State, changes: Dict[Hashable, Optional[Dict]]) -> _State:
+        """변경(key → 새 행, None이면 삭제)을 반영한 새 상태 — 추가분만 다시 인코딩."""
+        alive = st.alive
+        delta_rows = dict(st.delta_rows)
+        for key, row in changes.items():
+            i = st.pos.get(key)
+            if i is not None and alive[i]:
+                if alive is st.alive:
+                    alive = alive.copy()
+                alive[i] = False
+            delta_rows.pop(key, None)
+            if row is not None:
+                delta_rows[key] = row
+        delta = (self._build(list(delta_rows), list(delta_rows.values()), st.main)
+                 if delta_rows else None)
+        return _State(st.main, st.keys, alive, delta_rows, delta, st.pos)
+
+    # ---------- 쓰기 ----------
+    def apply(self, changes: Dict[Hashable, Optional[Dict]]) -> None:
+        """여러 변경을 한 번에 반영(추가분 재인코딩 1회). 없는 키의 삭제는 무시."""
+        with self._lock:
+            changes = {k: r for k, r in changes.items() if r is not None or k in self._rows}
+            if not changes:
+                return
+            for key, row in changes.items():
+                if row is None:
+                    self._rows.pop(key, None)
+                else:
+                    self._rows[key] = row
+            self.generation += 1
+            if self._journal is not None:
+                self._journal.extend(changes.items())
+            self._state = self._applied(self._state, changes)
+            due = self._needs_compaction(self._state)
+        if due:
+            self.compact(wait=not self.background)
+
+    def upsert(self, key: Hashable, row: Dict) -> None:
+        """추가 또는 수정."""
+        self.apply({key: row})
+
+    def delete(self, key: Hashable) -> None:
+        self.apply({key: None})
+
+    def sync(self, rows: Dict[Hashable, Dict]) -> int:
+        """rows를 새 전체 목록으로 보고 달라진 행만 반영. 반영한 변경 수를 반환."""
+        with self._lock:
+            current = dict(self._rows)
+        changes: Dict[Hashable, Optional[Dict]] = {k: r for k, r in rows.items() if current.get(k) != r}
+        changes.update({k: None for k in current if k not in rows})
+        self.apply(changes)
+        return len(changes)
+
+    # ---------- 압축 ----------
+    def _needs_compaction(self, st: _State) -> bool:
+        dead = st.n_main - int(st.alive.sum())
+        return len(st.delta_rows) > self.delta_max or (dead > 0 and dead > self.tombstone_ratio * st.n_main)
+
+    def compact(self, wait: bool = False) -> None:
+        """살아 있는 행 전체로 본체를 새로 만든다. 이미 진행 중이면 그 작업을 재사용."""
+        with self._lock:
+            if self._thread is None:
+                self._journal = []
+                snapshot = dict(self._rows)
+                self._thread = threading.Thread(target=self._compact, args=(snapshot,),
+                                                name="live-index-compact", daemon=True)
+                self._thread.start()
+            thread = self._thread
+        if wait:
+            thread.join()
+
+    def _compact(self, snapshot: Dict[Hashable, Dict]) -> None:
+        try:
+            fresh = self._fresh(snapshot)  # 잠금 밖에서 — 그동안 읽기/쓰기는 이전 상태로 계속
+            with self._lock:
+                # 압축 시작 뒤 들어온 변경은 새 본체 위에 다시 적용 (같은 키는 마지막 값)
+                pending = dict(self._journal)
+                self._state = self._applied(fresh, pending) if pending else fresh
+                self.compactions += 1
+        finally:
+            with self._lock:
+                self._journal, self._thread = None, None
+
+    # ---------- 조회 ----------
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key) -> bool:
+        return key in self._rows
+
+    def row(self, key: Hashable) -> Dict:
+        return self._rows[key]
+
+    def get(self, key: Hashable, default: Optional[Dict] = None) -> Optional[Dict]:
+        return self._rows.get(key, default)
+
+    def items(self) -> List[tuple]:
+        """살아 있는 (키, 행) 목록 — 압축 시 본체 순서와 같음."""
+        with self._lock:
+            return list(self._rows.items())
+
+    def stats(self) -> Dict[str, int]:
+        st = self._state
+        return {"rows": len(self._rows), "main": st.n_main, "delta": len(st.delta_rows),
+                "tombstones": st.n_main - int(st.alive.sum()), "compactions": self.compactions,
+                "compacting": int(self._thread is not None)}
+
+
+def _masked(values: np.ndarray, alive: np.ndarray) -> np.ndarray:
+    """삭제 표시된 행은 -1 → 어떤 유효 점수(0 이상)보다도 뒤."""
+    return np.where(alive, values, -1)
+
+
+class LiveMentorIndex(_LiveIndex):
+    """멘토 행(CSV 컬럼 dict) 증분 인덱스. rank()는 rank_mentors와 같은 형식 + 검색한 행 수."""
+
+    def __init__(self, rows: Dict[Hashable, Dict], text_analyzer: str = LIVE_TEXT_ANALYZER,
+                 availability: str = "separate", **kwargs):
+        self.text_analyzer = text_analyzer
+        self.availability = availability
+        super().__init__(rows, **kwargs)
+
+    @classmethod
+    def from_frame(cls, mentors_df: pd.DataFrame, **kwargs) -> "LiveMentorIndex":
+        """DataFrame 행 라벨을 키로."""
+        return cls(dict(zip(mentors_df.index, mentors_df.to_dict("records"))), **kwargs)
+
+    def _build(self, keys, rows, base) -> MentorMatrix:
+        df = pd.DataFrame.from_records(rows, index=pd.Index(keys, dtype=object)) if rows \
+            else pd.DataFrame(index=pd.Index([], dtype=object))
+        vec = base.text.vectorizer if base is not None else None
+        return MentorMatrix(df, text_analyzer=self.text_analyzer, availability=self.availability,
+                            text_vectorizer=vec)
+
+    def rank(self, mentee: Dict, k: int = DEFAULT_TOP_K, chunk_size: int = CHUNK_SIZE) -> tuple:
+        """([{"pos", "idx", "total", "breakdown"}, ...], 살아 있는 멘토 수). idx = 행 키.
+
+        pos는 현재 상태에서의 위치(본체 다음 추가분) — 동점은 본체의 빠른 행, 추가분은 반영 순.
+        """
+        st = self._state
+        best_tot = np.zeros(0, dtype=np.int64)
+        best_pos = np.zeros(0, dtype=np.int64)
+        for start in range(0, st.n_main, chunk_size):
+            stop = min(start + chunk_size, st.n_main)
+            totals = st.main.score_all(mentee, rows=slice(start, stop))["total"]
+            best_tot, best_pos = _merge(best_tot, best_pos, _masked(totals, st.alive[start:stop]), start, k)
+        if st.delta is not None:
+            totals = st.delta.score_all(mentee)["total"]
+            best_tot, best_pos = _merge(best_tot, best_pos, totals, st.n_main, k)
+        best_pos = best_pos[best_tot >= 0]
+        in_main = best_pos < st.n_main
+        ranked = {}
+        for seg, pos, off in ((st.main, best_pos[in_main], 0), (st.delta, best_pos[~in_main], st.n_main)):
+            for item in _winners(seg, mentee, pos - off):
+                ranked[item["pos"] + off] = {**item, "pos": item["pos"] + off}
+        return [ranked[int(p)] for p in best_pos], int(st.alive.sum()) + len(st.delta_rows)
+
+
+class LiveMenteeIndex(_LiveIndex):
+    """등록 멘티 증분 인덱스 — 멘토 1명 기준 상호 적합도 랭킹(ReciprocalScorer.rank_mentees 형식)."""
+
+    def __init__(self, engine: MentorMatrix, rows: Dict[Hashable, Dict],
+                 mentor_prefs=None, **kwargs):
+        self.engine = engine
+        self.mentor_prefs = mentor_prefs
+        self._file_sig = None
+        super().__init__(rows, **kwargs)
+
+    @classmethod
+    def from_frames(cls, engine: MentorMatrix, mentors_df: pd.DataFrame,
+                    rows: Optional[Dict[Hashable, Dict]] = None, **kwargs) -> "LiveMenteeIndex":
+        prefs = None
+        if MENTOR_PREF_COLUMN in mentors_df.columns:
+            prefs = [list_to_set(c) for c in mentors_df[MENTOR_PREF_COLUMN].tolist()]
+        return cls(engine, rows or {}, prefs, **kwargs)
+
+    def _build(self, keys, rows, base) -> ReciprocalScorer:
+        # 멘티 note는 멘토 엔진의 vectorizer로 transform하므로 추가분도 본체와 같은 공간
+        return ReciprocalScorer(self.engine, rows, self.mentor_prefs)
+
+    def sync_file(self, path) -> int:
+        """회원 파일(users.json: 이름 → 프로필)이 바뀌었으면 달라진 프로필만 반영.
+
+        파일 크기/수정 시각이 같으면 읽지 않는다. 쓰는 도중이라 JSON이 깨져 있으면 이번에는 건너뜀.
+        """
+        path = Path(path)
+        if not path.exists():
+            return self.sync({})
+        stat = path.stat()
+        sig = (stat.st_mtime_ns, stat.st_size)
+        if sig == self._file_sig:
+            return 0
+        try:
+            users = json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return 0
+        self._file_sig = sig
+        return self.sync({name: mentee_from_profile(p) for name, p in users.items()})
+
+    def rank_mentees(self, j: int, k: int = DEFAULT_TOP_K) -> List[Dict]:
+        """멘토 j에게 잘 맞는 멘티 상위 k명 (상호 점수 내림차순, 동점은 본체 순 → 추가분 반영 순)."""
+        st = self._state
+        parts, segs = [], []
+        for seg, alive in ((st.main, st.alive), (st.delta, None)):
+            if seg is None:
+                continue
+            h, fwd, bwd = seg.mutual(j)
+            parts.append(h if alive is None else _masked(h, alive))
+            segs.append((seg, fwd, bwd, h))
+        if not parts:
+            return []
+        scores = np.concatenate(parts)
+        offsets = np.cumsum([0] + [len(p) for p in parts])
+        out = []
+        for i in top_k(scores, k):
+            if scores[i] < 0:
+                continue
+            s = int(np.searchsorted(offsets, i, side="right") - 1)
+            seg, fwd, bwd, h = segs[s]
+            out.append({**seg.entry(int(i - offsets[s]), h, fwd, bwd), "pos": int(i)})
+        return out
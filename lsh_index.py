@@ -0,0 +1,178 @@
+# lsh_index.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 근사 후보 검색 — MinHash LSH (소개글 문자 n-gram + 관심사/목적/주제 토큰)
+
+핵심
+- 멘토마다 특징 집합(소개글 문자 3-gram, "i:관심사", "p:목적", "t:주제")의 MinHash 서명 계산
+- 서명을 bands × rows로 나눈 밴드 키가 하나라도 같은 멘토만 후보로 채택 (부분선형 검색)
+- 후보만 정밀 규칙 점수(MentorMatrix.score_all)로 재정렬 → top-k
+- 후보가 min_candidates보다 적거나 멘티 특징이 비면 전수 조사로 되돌아감
+- bands/rows로 정확도↔지연을 조절, recall_at_k()/CLI로 전수 조사 대비 Recall@k를 보고
+
+사용 예
+    python lsh_index.py mentees.csv 멘토더미.csv -k 5 --configs 32x2 16x4 8x8
+"""
+
+import argparse
+import time
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from matching import APP_AVAILABILITY, AVAILABILITY_MODES, MentorMatrix
+from ranking import DEFAULT_TOP_K, _winners, rank_mentors, top_k
+
+_PRIME = np.uint64((1 << 31) - 1)
+_EMPTY = np.uint32(0xFFFFFFFF)
+SHINGLE = 3
+SIGNATURE_CHUNK = 2048
+
+
+def _token_hash(tok: str) -> int:
+    # 프로세스마다 달라지는 hash() 대신 고정 해시
+    return zlib.crc32(tok.encode("utf-8"))
+
+
+def features(intro: str, interests: Set[str] = (), purposes: Set[str] = (),
+             topics: Set[str] = ()) -> Set[str]:
+    """소개글(또는 멘티 note) 문자 n-gram + 접두어 붙인 관심사/목적/주제 토큰."""
+    text = "".join((intro or "").split()).lower()
+    out = {text[i:i + SHINGLE] for i in range(max(0, len(text) - SHINGLE + 1))}
+    if 0 < len(text) < SHINGLE:
+        out.add(text)
+    out |= {"i:" + t for t in interests}
+    out |= {"p:" + t for t in purposes}
+    out |= {"t:" + t for t in topics}
+    return out
+
+
+class MinHashLSH:
+    """MinHash 서명 + 밴드 버킷. bands * rows = 해시 함수 수."""
+
+    def __init__(self, engine: MentorMatrix, bands: int = 16, rows: int = 4, seed: int = 7):
+        self.engine = engine
+        self.bands, self.rows = bands, rows
+        rng = np.random.default_rng(seed)
+        n_perm = bands * rows
+        self._a = rng.integers(1, int(_PRIME), n_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), n_perm, dtype=np.uint64)
+
+        fm = engine.facets
+        cols = ("interests", "purpose", "topic_prefs")
+        inv = {col: np.array(sorted(fm[col].vocab, key=fm[col].vocab.get), dtype=object) for col in cols}
+        sigs = np.empty((engine.n, n_perm), dtype=np.uint32)
+        for start in range(0, engine.n, SIGNATURE_CHUNK):
+            stop = min(start + SIGNATURE_CHUNK, engine.n)
+            feats = [features(engine.intro[i], *(set(inv[c][np.flatnonzero(fm[c].matrix[i])]) for c in cols))
+                     for i in range(start, stop)]
+            sigs[start:stop] = self._signatures(feats)
+        self.signatures = sigs
+
+        # 밴드별 (키 정렬 배열, 멘토 위치) — 조회는 searchsorted
+        self._band_keys: List[np.ndarray] = []
+        self._band_pos: List[np.ndarray] = []
+        for b in range(bands):
+            keys = self._band_key(sigs[:, b * rows:(b + 1) * rows])
+            order = np.argsort(keys, kind="stable")
+            self._band_keys.append(keys[order])
+            self._band_pos.append(order)
+
+    def _signatures(self, feature_sets: List[Set[str]]) -> np.ndarray:
+        """특징 집합 여러 개의 MinHash 서명을 한 번에 — 해시 후 멘토 구간별 min(reduceat)."""
+        out = np.full((len(feature_sets), len(self._a)), _EMPTY, dtype=np.uint32)
+        lens = np.array([len(f) for f in feature_sets])
+        nonempty = np.flatnonzero(lens)
+        if not len(nonempty):
+            return out
+        x = np.array([_token_hash(t) for i in nonempty for t in feature_sets[i]], dtype=np.uint64) % _PRIME
+        h = (self._a[:, None] * x[None, :] + self._b[:, None]) % _PRIME
+        offsets = np.concatenate([[0], np.cumsum(lens[nonempty])[:-1]])
+        out[nonempty] = np.minimum.reduceat(h, offsets, axis=1).T.astype(np.uint32)
+        return out
+
+    def signature(self, feats: Set[str]) -> np.ndarray:
+        return self._signatures([feats])[0]
+
+    @staticmethod
+    def _band_key(block: np.ndarray) -> np.ndarray:
+        key = np.zeros(block.shape[0], dtype=np.uint64)
+        for c in range(block.shape[1]):
+            key = key * np.uint64(1000003) ^ block[:, c].astype(np.uint64)
+        return key
+
+    def candidates(self, mentee: Dict) -> np.ndarray:
+        """멘티와 밴드 키가 하나 이상 같은 멘토 위치(정렬됨)."""
+        feats = features(mentee.get("note", ""), mentee.get("interests", ()),
+                         mentee.get("purpose", ()), mentee.get("topics", ()))
+        if not feats:
+            return np.zeros(0, dtype=np.int64)
+        sig = self.signature(feats)
+        found = []
+        for b in range(self.bands):
+            key = self._band_key(sig[None, b * self.rows:(b + 1) * self.rows])[0]
+            keys = self._band_keys[b]
+            lo, hi = np.searchsorted(keys, key, "left"), np.searchsorted(keys, key, "right")
+            if hi > lo:
+                found.append(self._band_pos[b][lo:hi])
+        return np.unique(np.concatenate(found)) if found else np.zeros(0, dtype=np.int64)
+
+    def rank(self, mentee: Dict, k: int = DEFAULT_TOP_K,
+             min_candidates: Optional[int] = None) -> Tuple[List[Dict], int]:
+        """근사 top-k와 정밀 점수를 매긴 멘토 수. 후보가 부족하면 전수 조사."""
+        cands = self.candidates(mentee)
+        if len(cands) < (min_candidates if min_candidates is not None else k):
+            return rank_mentors(self.engine, mentee, k), self.engine.n
+        totals = self.engine.score_all(mentee, rows=cands)["total"]
+        best = cands[top_k(totals, k, cands)]
+        return _winners(self.engine, mentee, best), len(cands)
+
+
+def recall_at_k(index: MinHashLSH, mentees: List[Dict], k: int = DEFAULT_TOP_K) -> Dict[str, float]:
+    """전수 조사 top-k 대비 LSH top-k의 평균 Recall@k, 평균 후보 비율, 평균 지연(ms)."""
+    recalls, fractions, lsh_ms, exact_ms = [], [], [], []
+    for mentee in mentees:
+        t0 = time.perf_counter()
+        exact = {x["pos"] for x in rank_mentors(index.engine, mentee, k)}
+        t1 = time.perf_counter()
+        approx, scored = index.rank(mentee, k)
+        t2 = time.perf_counter()
+        got = {x["pos"] for x in approx}
+        recalls.append(len(exact & got) / len(exact) if exact else 1.0)
+        fractions.append(scored / max(1, index.engine.n))
+        exact_ms.append((t1 - t0) * 1000)
+        lsh_ms.append((t2 - t1) * 1000)
+    return {"recall": float(np.mean(recalls)) if recalls else 1.0,
+            "candidate_fraction": float(np.mean(fractions)) if fractions else 0.0,
+            "lsh_ms": float(np.mean(lsh_ms)) if lsh_ms else 0.0,
+            "exact_ms": float(np.mean(exact_ms)) if exact_ms else 0.0}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from batch_match import mentee_from_row, read_csv_any
+
+    ap = argparse.ArgumentParser(description="결 LSH 근사 검색 Recall@k 리포트")
+    ap.add_argument("mentees", help="멘티 설문 CSV(배치 매칭과 같은 형식)")
+    ap.add_argument("mentors", help="멘토 CSV")
+    ap.add_argument("-k", "--top-k", type=int, default=DEFAULT_TOP_K)
+    ap.add_argument("--configs", nargs="+", default=["32x2", "16x4", "8x8"],
+                    help="bands x rows 조합 목록 (예: 16x4)")
+    ap.add_argument("--sample", type=int, default=200, help="평가에 쓸 멘티 수")
+    ap.add_argument("--availability", choices=AVAILABILITY_MODES, default=APP_AVAILABILITY,
+                    help=f"소통 시간 겹침 방식(기본: 결 앱과 같은 {APP_AVAILABILITY})")
+    args = ap.parse_args(argv)
+
+    engine = MentorMatrix(read_csv_any(args.mentors), text_analyzer="char", availability=args.availability)
+    mentees = [mentee_from_row(r) for r in read_csv_any(args.mentees, dtype=str).head(args.sample).to_dict("records")]
+    print(f"멘토 {engine.n}명 · 멘티 {len(mentees)}명 · k={args.top_k}")
+    for cfg in args.configs:
+        bands, rows = (int(x) for x in cfg.lower().split("x"))
+        index = MinHashLSH(engine, bands=bands, rows=rows)
+        r = recall_at_k(index, mentees, args.top_k)
+        print(f"{bands:>3} bands × {rows} rows  Recall@{args.top_k}={r['recall']:.3f}  "
+              f"후보 {r['candidate_fraction']:.1%}  LSH {r['lsh_ms']:.1f}ms / 전수 {r['exact_ms']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
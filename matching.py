@@ -0,0 +1,681 @@
+# matching.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 매칭 엔진 — 멘토 테이블 1회 파싱 + 전체 멘토 배열 연산 점수 계산
+
+핵심
+- 규칙(상수/점수 함수)은 `결` 앱에서 이곳으로 옮겨 두고 앱은 import만 함
+- MentorMatrix: 멘토 CSV를 한 번만 파싱해 항목(facet)별 multi-hot 행렬로 보관
+- score_all(): 모든 멘토의 ratio_overlap(Jaccard) 항을 몇 번의 배열 연산으로 계산
+- breakdown(): 기존 compute_score와 동일한 총점/세부 점수 dict 생성
+- 텍스트 점수는 코퍼스 단위 TF-IDF 인덱스(text_index.MentorTextIndex)로 계산
+- 소통 선호는 uint32 비트마스크(AvailabilityMasks) + popcount, availability="grid"면
+  요일×시간대 28칸 겹침으로 계산(월 오전 ↔ 월 저녁은 겹치지 않음)
+- 점수 = 원시 특징 행렬(멘토 × FEATURES) · 가중치 벡터(DEFAULT_WEIGHTS), 컴포넌트 단위 반올림
+  score_weighted(): 가중치 행렬(FEATURES × 프로필)로 여러 프로필을 한 번에 (weight_profiles.py)
+"""
+
+import hashlib
+from typing import Set, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from text_index import MentorTextIndex
+
+# =========================
+# 상수
+# =========================
+GENDERS = ["남", "여", "기타"]
+AGE_BANDS = [
+    "만 13세~19세", "만 20세~29세", "만 30세~39세", "만 40세~49세",
+    "만 50세~59세", "만 60세~69세", "만 70세~79세", "만 80세~89세", "만 90세 이상"
+]
+COMM_MODES  = ["대면 만남", "화상채팅", "일반 채팅"]
+TIME_SLOTS  = ["오전", "오후", "저녁", "밤"]
+DAYS        = ["월", "화", "수", "목", "금", "토", "일"]
+STYLES = ["연두부형", "분위기메이커형", "효율추구형", "댕댕이형", "감성 충만형", "냉철한 조언자형"]
+OCCUPATION_MAJORS = [
+    "경영자", "행정관리", "의학/보건", "법률/행정", "교육", "연구개발/ IT",
+    "예술/디자인", "기술/기능", "서비스 전문", "일반 사무", "영업 원",
+    "판매", "서비스", "의료/보건 서비스", "생산/제조", "건설/시설",
+    "농림수산업", "운송/기계", "운송 관리", "청소 / 경비", "단순노무",
+    "학생", "전업주부", "구직자 / 최근 퇴사자 / 프리랜서(임시)", "기타"
+]
+INTERESTS = {
+    "여가/취미": ["독서", "음악 감상", "영화/드라마 감상", "게임", "운동/스포츠 관람", "미술·전시 감상", "여행", "요리/베이킹", "사진/영상 제작", "춤/노래"],
+    "학문/지적 관심사": ["인문학", "사회과학", "자연과학", "수학/논리 퍼즐", "IT/테크놀로지", "환경/지속가능성"],
+    "라이프스타일": ["패션/뷰티", "건강/웰빙", "자기계발", "사회참여/봉사활동", "재테크/투자", "반려동물"],
+    "대중문화": ["K-POP", "아이돌/연예인", "유튜브/스트리밍", "웹툰/웹소설", "스포츠 스타"],
+    "성향": ["혼자 보내는 시간 선호", "친구들과 어울리기 선호", "실내 활동 선호", "야외 활동 선호", "새로움 추구", "안정감 추구"],
+}
+PURPOSES   = ["진로 / 커리어 조언", "학업 / 전문지식 조언", "사회, 인생 경험 공유", "정서적 지지와 대화"]
+TOPIC_PREFS= ["진로·직업", "학업·전문 지식", "인생 경험·삶의 가치관", "대중문화·취미", "사회 문제·시사", "건강·웰빙"]
+
+COMPLEMENT_PAIRS = {
+    ("연두부형", "분위기메이커형"),
+    ("연두부형", "냉철한 조언자형"),
+    ("감성 충만형", "효율추구형"),
+    ("댕댕이형", "효율추구형"),
+    ("분위기메이커형", "냉철한 조언자형"),
+}
+SIMILAR_MAJORS = {
+    ("의학/보건", "의료/보건 서비스"),
+    ("영업 원", "판매"),
+    ("서비스", "서비스 전문"),
+    ("기술/기능", "건설/시설"),
+    ("운송/기계", "운송 관리"),
+    ("행정관리", "일반 사무"),
+}
+
+# (멘티 키, 멘토 컬럼, 가중치) — ratio_overlap 항 목록
+FACETS = [
+    ("purpose",    "purpose",     18),
+    ("topics",     "topic_prefs", 12),
+    ("comm_modes", "comm_modes",   8),
+    ("time_slots", "comm_time",    6),
+    ("days",       "comm_days",    6),
+    ("interests",  "interests",   20),
+]
+COMPONENTS = ["목적·주제", "소통 선호", "관심사/성향", "멘토 적합도", "텍스트", "스타일"]
+# 가중치 적용 전 원시 특징(멘토별 열). Jaccard/코사인은 0~1, 적합도/스타일은 규칙 점수
+FEATURES = ["purpose", "topics", "comm_modes", "time_slots", "days", "interests",
+            "major", "age", "text", "style"]
+FEATURE_INDEX = {f: i for i, f in enumerate(FEATURES)}
+# 기본 가중치 = compute_score의 상수 (규칙 점수 특징은 1배)
+DEFAULT_WEIGHTS = {**{key: w for key, _, w in FACETS}, "major": 1, "age": 1, "text": 10, "style": 1}
+DEFAULT_CLIP = (0, 100)
+# 컴포넌트 = 특징 묶음의 가중합을 반올림 (묶음 안 합산 순서는 compute_score와 같게)
+COMPONENT_FEATURES = {
+    "목적·주제": ("purpose", "topics"),
+    "소통 선호": ("comm_modes", "time_slots", "days"),
+    "관심사/성향": ("interests",),
+    "멘토 적합도": ("major", "age"),
+    "텍스트": ("text",),
+    "스타일": ("style",),
+}
+# 컴포넌트별로 점수에 쓰이는 멘티 입력 키
+COMPONENT_INPUTS = {
+    "목적·주제": ("purpose", "topics"),
+    "소통 선호": ("comm_modes", "time_slots", "days"),
+    "관심사/성향": ("interests",),
+    "멘토 적합도": ("wanted_majors", "wanted_mentor_ages"),
+    "텍스트": ("note",),
+    "스타일": ("style",),
+}
+
+# =========================
+# 유틸 / 점수 규칙
+# =========================
+def list_to_set(cell: str) -> Set[str]:
+    if pd.isna(cell) or not str(cell).strip():
+        return set()
+    return {x.strip() for x in str(cell).replace(";", ",").split(",") if x.strip()}
+
+def ratio_overlap(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def style_score(mentee_style: str, mentor_style: str) -> int:
+    if mentee_style and mentor_style:
+        if mentee_style == mentor_style:
+            return 5
+        if (mentee_style, mentor_style) in COMPLEMENT_PAIRS or (mentor_style, mentee_style) in COMPLEMENT_PAIRS:
+            return 10
+        return 3
+    return 0
+
+def major_score(wanted_majors: Set[str], mentor_major: str) -> int:
+    if not mentor_major:
+        return 0
+    if mentor_major in wanted_majors:
+        return 12
+    for a, b in SIMILAR_MAJORS:
+        if (a in wanted_majors and mentor_major == b) or (b in wanted_majors and mentor_major == a):
+            return 6
+    return 0
+
+def age_band_normalize(label: str) -> str:
+    s = str(label).strip()
+    if "13" in s or "19" in s: return "만 13세~19세"
+    if "20" in s: return "만 20세~29세"
+    if "30" in s: return "만 30세~39세"
+    if "40" in s: return "만 40세~49세"
+    if "50" in s: return "만 50세~59세"
+    if "60" in s: return "만 60세~69세"
+    if "70" in s: return "만 70세~79세"
+    if "80" in s: return "만 80세~89세"
+    if "90" in s: return "만 90세 이상"
+    return s
+
+def age_preference_score(preferred: Set[str], mentor_age_band: str) -> int:
+    if not preferred or not mentor_age_band:
+        return 0
+    mentor_age = age_band_normalize(mentor_age_band)
+    if mentor_age in preferred:
+        return 6
+    idx_map = {k: i for i, k in enumerate(AGE_BANDS)}
+    if mentor_age in idx_map:
+        m_idx = idx_map[mentor_age]
+        if any(abs(m_idx - idx_map[p]) == 1 for p in preferred if p in idx_map):
+            return 2
+    return 0
+
+def tfidf_similarity(text_a: str, text_b: str) -> float:
+    a = (text_a or "").strip()
+    b = (text_b or "").strip()
+    if not a or not b:
+        return 0.0
+    vec = TfidfVectorizer(max_features=500, ngram_range=(1, 2))
+    X = vec.fit_transform([a, b])
+    return float(cosine_similarity(X[0], X[1])[0, 0])
+
+def compute_score(mentee: Dict, mentor_row: pd.Series) -> Dict:
+    mentor_comm_modes = list_to_set(mentor_row.get("comm_modes", ""))
+    mentor_comm_times = list_to_set(mentor_row.get("comm_time", ""))
+    mentor_comm_days  = list_to_set(mentor_row.get("comm_days", ""))
+    mentor_interests  = list_to_set(mentor_row.get("interests", ""))
+    mentor_purposes   = list_to_set(mentor_row.get("purpose", ""))
+    mentor_topics     = list_to_set(mentor_row.get("topic_prefs", ""))
+    mentor_style      = str(mentor_row.get("style", "")).strip()
+    mentor_major      = str(mentor_row.get("occupation_major", "")).strip()
+    mentor_intro      = str(mentor_row.get("intro", "")).strip()
+    mentor_age_band   = str(mentor_row.get("age_band", "")).strip()
+
+    s_purpose_topics = round(ratio_overlap(mentee["purpose"], mentor_purposes) * 18
+                             + ratio_overlap(mentee["topics"], mentor_topics) * 12)
+    s_comm = round(ratio_overlap(mentee["comm_modes"], mentor_comm_modes) * 8
+                   + ratio_overlap(mentee["time_slots"], mentor_comm_times) * 6
+                   + ratio_overlap(mentee["days"], mentor_comm_days) * 6)
+    s_interests = round(ratio_overlap(mentee["interests"], mentor_interests) * 20)
+    s_fit  = major_score(mentee["wanted_majors"], mentor_major) + \
+             age_preference_score(mentee["wanted_mentor_ages"], mentor_age_band)
+    s_text = round(tfidf_similarity(mentee.get("note", ""), mentor_intro) * 10)
+    s_style= style_score(mentee.get("style", ""), mentor_style)
+
+    total = int(max(0, min(100, s_purpose_topics + s_comm + s_interests + s_fit + s_text + s_style)))
+    return {"total": total, "breakdown": {
+        "목적·주제": s_purpose_topics, "소통 선호": s_comm, "관심사/성향": s_interests,
+        "멘토 적합도": s_fit, "텍스트": s_text, "스타일": s_style
+    }}
+
+# =========================
+# 벡터화 엔진
+# =========================
+def dataset_version(df: pd.DataFrame) -> str:
+    """멘토 데이터 세트 내용 해시(컬럼 + 값). 캐시/인덱스 키로 사용."""
+    h = hashlib.sha1("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()[:16]
+
+def _str_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    """compute_score의 str(row.get(col, "")).strip()과 같은 값을 열 단위로 만든다."""
+    if col not in df.columns:
+        return np.full(len(df), "", dtype=object)
+    return np.array([str(x).strip() for x in df[col].tolist()], dtype=object)
+
+
+class FacetMatrix:
+    """멘토 한 항목(facet)의 multi-hot 행렬(멘토 × 어휘)과 행별 집합 크기.
+
+    cells는 CSV 셀 문자열 또는 이미 나뉜 집합(멘티 설문 dict 값) 모두 가능.
+    """
+
+    def __init__(self, cells: List):
+        sets = [set(c) if isinstance(c, (set, frozenset, list, tuple)) else list_to_set(c) for c in cells]
+        vocab: Dict[str, int] = {}
+        for s in sets:
+            for tok in sorted(s):
+                vocab.setdefault(tok, len(vocab))
+        mat = np.zeros((len(sets), len(vocab)), dtype=np.uint8)
+        for i, s in enumerate(sets):
+            if s:
+                mat[i, [vocab[t] for t in s]] = 1
+        self.vocab = vocab
+        self.matrix = mat
+        self.sizes = mat.sum(axis=1, dtype=np.int32)
+
+    def overlap(self, mentee_set: Set[str], rows=slice(None)) -> np.ndarray:
+        """멘토(rows: slice 또는 위치 배열)에 대한 ratio_overlap(mentee_set, 멘토 집합)."""
+        sizes = self.sizes[rows]
+        n = len(sizes)
+        if not mentee_set:
+            return np.zeros(n, dtype=np.float64)
+        cols = [self.vocab[t] for t in mentee_set if t in self.vocab]
+        inter = (self.matrix[rows][:, cols].sum(axis=1, dtype=np.int32) if cols
+                 else np.zeros(n, dtype=np.int32))
+        union = len(mentee_set) + sizes - inter
+        out = np.zeros(n, dtype=np.float64)
+        ok = sizes > 0
+        out[ok] = inter[ok] / union[ok]
+        return out
+
+    def overlap_block(self, mentee_sets: List[Set[str]], rows=slice(None)) -> np.ndarray:
+        """(멘토 rows × 멘티 m) ratio_overlap 행렬 — 멘티 여러 명을 행렬·행렬 곱 1번으로."""
+        sizes = self.sizes[rows]
+        q = np.zeros((len(self.vocab), len(mentee_sets)), dtype=np.float32)
+        for j, ms in enumerate(mentee_sets):
+            q[[self.vocab[t] for t in ms if t in self.vocab], j] = 1
+        a_len = np.array([len(ms) for ms in mentee_sets], dtype=np.int64)
+        inter = np.rint(self.matrix[rows].astype(np.float32) @ q).astype(np.int64)
+        union = a_len[None, :] + sizes[:, None] - inter
+        ok = (sizes[:, None] > 0) & (a_len[None, :] > 0)
+        out = np.zeros(inter.shape, dtype=np.float64)
+        np.divide(inter, union, out=out, where=ok)
+        return out
+
+
+# =========================
+# 규칙 조회표 (시작 시 1회 컴파일)
+# =========================
+class LookupTable:
+    """쌍 규칙 rule(멘티 값, 멘토 값)을 (기준 어휘 × 멘토 어휘) 정수 행렬로 미리 계산한 표.
+
+    - 행: 기준 어휘(STYLES 6 / OCCUPATION_MAJORS / AGE_BANDS 9)
+    - 열: 기준 어휘 + 멘토 데이터에만 있는 값 + 빈 값(항상 0점)
+    - 멘티가 여러 값을 고르면 행별 max (major_score/age_preference_score와 동일)
+    """
+
+    def __init__(self, base: List[str], rule, mentor_values=(), normalize=None):
+        self.rule = rule
+        self.normalize = normalize
+        extras = sorted({v for v in mentor_values if v} - set(base))
+        self.vocab = list(base) + extras
+        self.codes = {v: i for i, v in enumerate(self.vocab)}
+        self.empty_code = len(self.vocab)
+        table = np.zeros((len(base), len(self.vocab) + 1), dtype=np.int8)
+        for i, a in enumerate(base):
+            table[i, :-1] = [rule(a, b) for b in self.vocab]
+        self.table = table
+
+    def encode(self, values) -> np.ndarray:
+        """멘토 값 배열 → 정수 코드 배열(빈 값은 empty_code)."""
+        out = np.empty(len(values), dtype=np.int32)
+        for i, v in enumerate(values):
+            v = self.normalize(v) if v and self.normalize else v
+            out[i] = self.codes[v] if v else self.empty_code
+        return out
+
+    def scores(self, mentee_values) -> np.ndarray:
+        """멘티 값(들)에 대한 멘토 어휘별 점수 벡터(길이 = 멘토 어휘 + 1)."""
+        if isinstance(mentee_values, str):
+            mentee_values = {mentee_values} if mentee_values else set()
+        out = np.zeros(self.table.shape[1], dtype=np.int64)
+        for v in mentee_values:
+            if v in self.codes and self.codes[v] < self.table.shape[0]:
+                row = self.table[self.codes[v]]
+            else:
+                # 기준 어휘 밖 멘티 값(배치 입력 등)은 규칙으로 한 줄만 계산
+                row = np.array([self.rule(v, b) for b in self.vocab] + [0], dtype=np.int64)
+            np.maximum(out, row, out=out)
+        return out
+
+
+# 규칙은 모듈 함수로 둔다 — 조회표를 워커 프로세스로 pickle 전달할 수 있도록
+def _major_rule(wanted: str, mentor_major: str) -> int:
+    return major_score({wanted}, mentor_major)
+
+def _age_rule(preferred: str, mentor_age_band: str) -> int:
+    return age_preference_score({preferred}, mentor_age_band)
+
+def style_table(mentor_values=()) -> LookupTable:
+    return LookupTable(STYLES, style_score, mentor_values)
+
+def major_table(mentor_values=()) -> LookupTable:
+    return LookupTable(OCCUPATION_MAJORS, _major_rule, mentor_values)
+
+def age_table(mentor_values=()) -> LookupTable:
+    return LookupTable(AGE_BANDS, _age_rule,
+                       [age_band_normalize(v) for v in mentor_values if v], normalize=age_band_normalize)
+
+# 기준 어휘만으로 컴파일한 표: 6×6 스타일, |직군|×|직군| 유사도, 9×9 나이대 인접
+STYLE_TABLE = style_table().table[:, :-1]
+MAJOR_TABLE = major_table().table[:, :-1]
+AGE_TABLE = age_table().table[:, :-1]
+
+
+# =========================
+# 소통 가능 시간 비트마스크
+# =========================
+AVAILABILITY_MODES = ("separate", "grid")  # separate: 요일/시간대 따로, grid: 요일×시간대 28칸
+APP_AVAILABILITY = "grid"  # 결 앱이 쓰는 방식 — CLI(배치 매칭·프로필 비교 등) 기본값도 이것으로 맞춤
+_POPCOUNT16 = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.uint8)
+
+
+def popcount32(x: np.ndarray) -> np.ndarray:
+    """uint32 배열의 비트 수(1의 개수)."""
+    x = np.asarray(x, dtype=np.uint32)
+    return (_POPCOUNT16[x & 0xFFFF].astype(np.int64) + _POPCOUNT16[x >> 16]).astype(np.int64)
+
+
+def _mask(tokens: Set[str], vocab: List[str]) -> tuple:
+    """토큰 집합 → (비트마스크, 어휘 밖 토큰 수)."""
+    m = 0
+    for i, v in enumerate(vocab):
+        if v in tokens:
+            m |= 1 << i
+    return m, len(tokens) - bin(m).count("1")
+
+
+def grid_mask(day_mask, time_mask):
+    """요일 마스크 × 시간대 마스크 → 28칸(요일*4 + 시간대) 마스크. 스칼라/배열 모두 가능."""
+    day_mask = np.asarray(day_mask, dtype=np.uint32)
+    time_mask = np.asarray(time_mask, dtype=np.uint32)
+    g = np.zeros(np.broadcast(day_mask, time_mask).shape, dtype=np.uint32)
+    for d in range(len(DAYS)):
+        on_day = (day_mask >> np.uint32(d)) & np.uint32(1)
+        g |= (on_day * time_mask) << np.uint32(d * len(TIME_SLOTS))
+    return g
+
+
+def _mask_jaccard(q: int, q_extra: int, m: np.ndarray, m_extra: np.ndarray) -> np.ndarray:
+    """비트마스크 Jaccard. 어휘 밖 토큰은 합집합 크기에만 더한다(멘티 쪽은 0이어야 정확)."""
+    q = np.uint32(q)
+    q_size = bin(int(q)).count("1") + q_extra
+    m_size = popcount32(m) + m_extra
+    inter = popcount32(m & q)
+    union = popcount32(m | q) + m_extra + q_extra
+    out = np.zeros(len(m), dtype=np.float64)
+    if q_size == 0:
+        return out
+    ok = m_size > 0
+    out[ok] = inter[ok] / union[ok]
+    return out
+
+
+class AvailabilityMasks:
+    """멘토별 소통 방법(3비트)/시간대(4비트)/요일(7비트)/요일×시간대(28비트) uint32 마스크."""
+
+    FIELDS = [("comm_modes", "comm_modes", COMM_MODES),
+              ("time_slots", "comm_time", TIME_SLOTS),
+              ("days", "comm_days", DAYS)]
+
+    def __init__(self, mentors_df: pd.DataFrame):
+        n = len(mentors_df)
+        self.masks: Dict[str, np.ndarray] = {}
+        self.extra: Dict[str, np.ndarray] = {}
+        for key, col, vocab in self.FIELDS:
+            cells = mentors_df[col].tolist() if col in mentors_df.columns else [""] * n
+            pairs = [_mask(list_to_set(c), vocab) for c in cells]
+            self.masks[key] = np.array([p[0] for p in pairs], dtype=np.uint32)
+            self.extra[key] = np.array([p[1] for p in pairs], dtype=np.int64)
+        self.grid = grid_mask(self.masks["days"], self.masks["time_slots"])
+
+    def jaccards(self, mentee: Dict, rows=slice(None), mode: str = "separate"):
+        """(소통 방법, 시간대, 요일) Jaccard 배열. 멘티에 어휘 밖 토큰이 있으면 None(→ 집합 방식).
+
+        grid 모드는 시간대 자리에 요일×시간대 칸 Jaccard, 요일 자리에 0을 돌려준다
+        (가중치는 MentorMatrix.effective_weights가 시간대+요일로 합침).
+        """
+        q = {key: _mask(mentee[key], vocab) for key, _, vocab in self.FIELDS}
+        if any(extra for _, extra in q.values()):
+            return None
+        j = {key: _mask_jaccard(q[key][0], 0, self.masks[key][rows], self.extra[key][rows])
+             for key, _, _ in self.FIELDS}
+        if mode == "grid":
+            q_grid = int(grid_mask(q["days"][0], q["time_slots"][0]))
+            m_grid = self.grid[rows]
+            j_grid = _mask_jaccard(q_grid, 0, m_grid, np.zeros(len(m_grid), dtype=np.int64))
+            return j["comm_modes"], j_grid, np.zeros(len(j_grid))
+        return j["comm_modes"], j["time_slots"], j["days"]
+
+    def grid_overlap_block(self, mentees: List[Dict], rows=slice(None)) -> tuple:
+        """(멘토 rows × 멘티 m) 요일×시간대 칸 Jaccard 행렬과 멘티별 비트마스크 사용 가능 여부.
+
+        28칸 비트를 풀어 행렬·행렬 곱 1번으로 교집합 크기를 구한다.
+        """
+        q = np.zeros((len(DAYS) * len(TIME_SLOTS), len(mentees)), dtype=np.float32)
+        usable = np.zeros(len(mentees), dtype=bool)
+        for j, mentee in enumerate(mentees):
+            mk = {key: _mask(mentee[key], vocab) for key, _, vocab in self.FIELDS}
+            if any(extra for _, extra in mk.values()):
+                continue
+            usable[j] = True
+            g = int(grid_mask(mk["days"][0], mk["time_slots"][0]))
+            q[[b for b in range(q.shape[0]) if g >> b & 1], j] = 1
+        bits = ((self.grid[rows][:, None] >> np.arange(q.shape[0], dtype=np.uint32)) & 1).astype(np.float32)
+        inter = np.rint(bits @ q).astype(np.int64)
+        m_size = bits.sum(axis=1, dtype=np.int64)
+        q_size = q.sum(axis=0, dtype=np.int64)
+        union = m_size[:, None] + q_size[None, :] - inter
+        ok = (m_size[:, None] > 0) & (q_size[None, :] > 0)
+        out = np.zeros(inter.shape, dtype=np.float64)
+        np.divide(inter, union, out=out, where=ok)
+        return out, usable
+
+    def comm_score(self, mentee: Dict, rows=slice(None), mode: str = "separate"):
+        """기본 가중치 "소통 선호" 점수 배열. 멘티에 어휘 밖 토큰이 있으면 None."""
+        j = self.jaccards(mentee, rows, mode)
+        if j is None:
+            return None
+        w_time = DEFAULT_WEIGHTS["time_slots"] + (DEFAULT_WEIGHTS["days"] if mode == "grid" else 0)
+        w_days = 0 if mode == "grid" else DEFAULT_WEIGHTS["days"]
+        return np.rint(j[0] * DEFAULT_WEIGHTS["comm_modes"] + j[1] * w_time + j[2] * w_days)
+
+
+def _weighted(F: np.ndarray, W: np.ndarray) -> np.ndarray:
+    """(n × g) 특징 × (g × P) 가중치 — 열 순서대로 누적해 compute_score와 같은 부동소수 합산 순서 유지."""
+    acc = F[:, 0, None] * W[0]
+    for i in range(1, F.shape[1]):
+        acc = acc + F[:, i, None] * W[i]
+    return acc
+
+
+class MentorMatrix:
+    """멘토 테이블을 한 번만 파싱해 보관하고, 멘티 1명에 대한 전체 점수를 배열로 계산."""
+
+    def __init__(self, mentors_df: pd.DataFrame, text_analyzer: str = "word",
+                 availability: str = "separate", text_vectorizer=None):
+        if availability not in AVAILABILITY_MODES:
+            raise ValueError(f"지원하지 않는 availability: {availability} (가능: {', '.join(AVAILABILITY_MODES)})")
+        self.n = len(mentors_df)
+        self.availability = availability
+        self.index = mentors_df.index
+        self.facets = {
+            col: FacetMatrix(mentors_df[col].tolist() if col in mentors_df.columns else [""] * self.n)
+            for _, col, _ in FACETS
+        }
+        self.names = _str_column(mentors_df, "name")
+        self.style = _str_column(mentors_df, "style")
+        self.major = _str_column(mentors_df, "occupation_major")
+        self.intro = _str_column(mentors_df, "intro")
+        self.age_band = _str_column(mentors_df, "age_band")
+        # text_vectorizer: 다른 엔진에서 적합된 vectorizer 재사용(증분 인덱스 추가분)
+        self.text = MentorTextIndex(list(self.intro), analyzer=text_analyzer, vectorizer=text_vectorizer)
+        self.avail = AvailabilityMasks(mentors_df)
+        # 범주형 컬럼은 조회표 어휘의 정수 코드로 1회 인코딩 → 점수는 gather 한 번
+        self.style_lut = style_table(self.style)
+        self.major_lut = major_table(self.major)
+        self.age_lut = age_table(self.age_band)
+        self.style_codes = self.style_lut.encode(self.style)
+        self.major_codes = self.major_lut.encode(self.major)
+        self.age_codes = self.age_lut.encode(self.age_band)
+
+    def _overlap(self, mentee: Dict, key: str, rows) -> np.ndarray:
+        col = next(c for k, c, _ in FACETS if k == key)
+        return self.facets[col].overlap(mentee[key], rows)
+
+    def _comm_features(self, mentee: Dict, rows) -> tuple:
+        """소통 선호 Jaccard 3개와 grid(요일×시간대 칸) 사용 여부."""
+        j = self.avail.jaccards(mentee, rows, self.availability)
+        if j is None:
+            # 멘티 입력에 어휘 밖 값이 있으면 집합(Jaccard) 방식으로 정확히 계산
+            return tuple(self._overlap(mentee, key, rows) for key in ("comm_modes", "time_slots", "days")), False
+        return j, self.availability == "grid"
+
+    def features(self, mentee: Dict, rows=slice(None), names=FEATURES) -> tuple:
+        """원시 특징 행렬 (멘토 rows × len(names), float64)과 grid 사용 여부.
+
+        적합도/스타일은 조회표 행(max)을 멘토 코드로 gather.
+        """
+        grid = False
+        comm = None
+        cols = []
+        for f in names:
+            if f in ("purpose", "topics", "interests"):
+                cols.append(self._overlap(mentee, f, rows))
+            elif f in ("comm_modes", "time_slots", "days"):
+                if comm is None:
+                    comm, grid = self._comm_features(mentee, rows)
+                cols.append(comm[("comm_modes", "time_slots", "days").index(f)])
+            elif f == "major":
+                cols.append(self.major_lut.scores(mentee["wanted_majors"])[self.major_codes[rows]])
+            elif f == "age":
+                cols.append(self.age_lut.scores(mentee["wanted_mentor_ages"])[self.age_codes[rows]])
+            elif f == "text":
+                cols.append(self.text.similarity(mentee.get("note", ""), rows))
+            elif f == "style":
+                cols.append(self.style_lut.scores(mentee.get("style", ""))[self.style_codes[rows]])
+            else:
+                raise KeyError(f)
+        return np.column_stack(cols).astype(np.float64, copy=False), grid
+
+    @staticmethod
+    def effective_weights(W: np.ndarray, names=FEATURES, grid: bool = False) -> np.ndarray:
+        """가중치 행렬(names × 프로필)을 특징 행렬에 맞춤 — grid면 요일 가중치를 시간대 칸으로 합침."""
+        W = np.asarray(W, dtype=np.float64).reshape(len(names), -1)
+        if grid and "time_slots" in names and "days" in names:
+            W = W.copy()
+            t, d = names.index("time_slots"), names.index("days")
+            W[t] = W[t] + W[d]
+            W[d] = 0
+        return W
+
+    def comm_score(self, mentee: Dict, rows=slice(None)) -> np.ndarray:
+        """"소통 선호" 점수 — 비트마스크 AND/OR + popcount."""
+        return self.component("소통 선호", mentee, rows)
+
+    def component(self, name: str, mentee: Dict, rows=slice(None),
+                  weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """컴포넌트 하나의 점수 배열(int64) = round(특징 묶음 · 가중치). 기본은 DEFAULT_WEIGHTS."""
+        names = list(COMPONENT_FEATURES[name])
+        F, grid = self.features(mentee, rows, names)
+        w = weights or DEFAULT_WEIGHTS
+        W = self.effective_weights([w.get(f, DEFAULT_WEIGHTS[f]) for f in names], names, grid)
+        return np.rint(_weighted(F, W)[:, 0]).astype(np.int64)
+
+    def score_weighted(self, mentee: Dict, W: np.ndarray, rows=slice(None), clip=DEFAULT_CLIP) -> Dict[str, np.ndarray]:
+        """가중치 행렬 W(FEATURES × 프로필 P)로 P개 프로필 점수를 한 번에.
+
+        특징 행렬은 1회만 계산하고 컴포넌트별 (rows × P) 점수와 "total"을 반환.
+        clip은 (하한, 상한) — 스칼라 또는 프로필별 길이 P 배열.
+        """
+        F, grid = self.features(mentee, rows)
+        W = self.effective_weights(W, FEATURES, grid)
+        comps = {}
+        for c in COMPONENTS:
+            idx = [FEATURE_INDEX[f] for f in COMPONENT_FEATURES[c]]
+            comps[c] = np.rint(_weighted(F[:, idx], W[idx])).astype(np.int64)
+        comps["total"] = np.clip(sum(comps[c] for c in COMPONENTS), clip[0], clip[1]).astype(np.int64)
+        return comps
+
+    def score_all(self, mentee: Dict, rows=slice(None)) -> Dict[str, np.ndarray]:
+        """컴포넌트별 점수 배열(COMPONENTS 키)과 "total" 배열을 반환.
+
+        rows로 멘토 일부(slice 또는 위치 배열)만 계산할 수 있다 — 청크 단위 랭킹용.
+        """
+        comps = {c: self.component(c, mentee, rows) for c in COMPONENTS}
+        comps["total"] = np.clip(sum(comps[c] for c in COMPONENTS), *DEFAULT_CLIP)
+        return comps
+
+    def score_block(self, mentees: List[Dict], rows=slice(None)) -> Dict[str, np.ndarray]:
+        """멘티 여러 명을 한 번에: 컴포넌트별 (멘토 rows × 멘티 m) 점수 행렬과 "total"."""
+        def ov(key: str) -> np.ndarray:
+            col = next(c for k, c, _ in FACETS if k == key)
+            return self.facets[col].overlap_block([m[key] for m in mentees], rows)
+
+        def each(name: str) -> np.ndarray:
+            return np.stack([self.component(name, m, rows) for m in mentees], axis=1)
+
+        w = DEFAULT_WEIGHTS
+        s_purpose_topics = np.rint(ov("purpose") * w["purpose"] + ov("topics") * w["topics"])
+        s_interests = np.rint(ov("interests") * w["interests"])
+        s_text = np.rint(self.text.similarity_block([m.get("note", "") for m in mentees], rows) * w["text"])
+
+        # 소통 선호: 비트마스크 Jaccard와 같은 값을 항목 행렬 곱으로 (grid는 28칸 비트 행렬 곱)
+        j_modes, j_time, j_days = ov("comm_modes"), ov("time_slots"), ov("days")
+        w_time = np.full(len(mentees), float(w["time_slots"]))
+        w_days = np.full(len(mentees), float(w["days"]))
+        if self.availability == "grid":
+            j_grid, usable = self.avail.grid_overlap_block(mentees, rows)
+            j_time = np.where(usable[None, :], j_grid, j_time)
+            j_days = np.where(usable[None, :], 0.0, j_days)
+            w_time[usable] += w["days"]
+            w_days[usable] = 0
+        s_comm = np.rint(j_modes * w["comm_modes"] + j_time * w_time + j_days * w_days)
+
+        comps = {
+            "목적·주제": s_purpose_topics.astype(np.int64),
+            "소통 선호": s_comm.astype(np.int64),
+            "관심사/성향": s_interests.astype(np.int64),
+            "멘토 적합도": each("멘토 적합도"),
+            "텍스트": s_text.astype(np.int64),
+            "스타일": each("스타일"),
+        }
+        comps["total"] = np.clip(sum(comps[c] for c in COMPONENTS), *DEFAULT_CLIP)
+        return comps
+
+    # ---------- 공유 메모리 샤딩용 직렬화 ----------
+    def shared_state(self) -> tuple:
+        """점수 계산 상태를 (큰 숫자 배열 dict, 작은 메타데이터 dict)로 분리.
+
+        배열은 multiprocessing.shared_memory에 올리고, 메타데이터만 워커에 pickle로 전달한다.
+        이름/소개글 같은 object 배열은 점수 계산에 필요 없어 제외.
+        """
+        arrays: Dict[str, np.ndarray] = {}
+        for col, fm in self.facets.items():
+            arrays[f"facet:{col}:matrix"] = fm.matrix
+            arrays[f"facet:{col}:sizes"] = fm.sizes
+        for key in self.avail.masks:
+            arrays[f"avail:{key}:mask"] = self.avail.masks[key]
+            arrays[f"avail:{key}:extra"] = self.avail.extra[key]
+        arrays["avail:grid"] = self.avail.grid
+        for name in ("style", "major", "age"):
+            arrays[f"codes:{name}"] = getattr(self, f"{name}_codes")
+        tm = self.text.matrix
+        if tm is not None:
+            arrays.update({"text:data": tm.data, "text:indices": tm.indices, "text:indptr": tm.indptr})
+        meta = {
+            "n": self.n, "availability": self.availability,
+            "facet_vocab": {col: fm.vocab for col, fm in self.facets.items()},
+            "luts": {name: getattr(self, f"{name}_lut") for name in ("style", "major", "age")},
+            "text_analyzer": self.text.analyzer, "text_vectorizer": self.text.vectorizer,
+            "text_shape": None if tm is None else tm.shape,
+        }
+        return arrays, meta
+
+    @classmethod
+    def from_shared_state(cls, arrays: Dict[str, np.ndarray], meta: Dict) -> "MentorMatrix":
+        """shared_state()의 배열(공유 메모리 뷰)로 점수 계산 전용 엔진을 복원."""
+        self = cls.__new__(cls)
+        self.n = meta["n"]
+        self.availability = meta["availability"]
+        self.index = pd.RangeIndex(self.n)
+        self.names = self.style = self.major = self.intro = self.age_band = None
+        self.facets = {}
+        for col, vocab in meta["facet_vocab"].items():
+            fm = FacetMatrix.__new__(FacetMatrix)
+            fm.vocab, fm.matrix, fm.sizes = vocab, arrays[f"facet:{col}:matrix"], arrays[f"facet:{col}:sizes"]
+            self.facets[col] = fm
+        self.avail = AvailabilityMasks.__new__(AvailabilityMasks)
+        self.avail.masks = {key: arrays[f"avail:{key}:mask"] for key, _, _ in AvailabilityMasks.FIELDS}
+        self.avail.extra = {key: arrays[f"avail:{key}:extra"] for key, _, _ in AvailabilityMasks.FIELDS}
+        self.avail.grid = arrays["avail:grid"]
+        for name in ("style", "major", "age"):
+            setattr(self, f"{name}_lut", meta["luts"][name])
+            setattr(self, f"{name}_codes", arrays[f"codes:{name}"])
+        matrix = None
+        if meta["text_shape"] is not None:
+            from scipy.sparse import csr_matrix
+            matrix = csr_matrix((arrays["text:data"], arrays["text:indices"], arrays["text:indptr"]),
+                                shape=meta["text_shape"], copy=False)
+        self.text = MentorTextIndex.from_parts(meta["text_vectorizer"], matrix, self.n, meta["text_analyzer"])
+        return self
+
+    def breakdown(self, comps: Dict[str, np.ndarray], pos: int) -> Dict:
+        """score_all 결과에서 pos번째 멘토의 compute_score 형식 dict를 만든다."""
+        return {"total": int(comps["total"][pos]),
+                "breakdown": {c: int(comps[c][pos]) for c in COMPONENTS}}
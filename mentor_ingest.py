@@ -0,0 +1,211 @@
+# mentor_ingest.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 멘토 CSV 업로드 수집 — 청크 단위 스트리밍 읽기 + 검증 + 이름 중복 제거 + 증분 인덱스
+
+핵심
+- 업로드 파일을 pd.read_csv(chunksize=INGEST_CHUNK_ROWS)로 청크씩 읽음 → 파싱 중 추가 메모리는 청크 크기로 제한
+  (인코딩 utf-8 → cp949, 도중에 디코드 실패하면 처음부터 다음 인코딩으로)
+- 백그라운드 스레드에서 실행(MentorIngest) — 관리자 세션은 진행률만 표시하고 멈추지 않음
+- 청크마다 검증: 필수 컬럼(첫 청크에서 1회), 이름 빈 값, 나이대(AGE_BANDS, age_band_normalize 후)/
+  스타일(STYLES)/직종(OCCUPATION_MAJORS) 어휘 — 빈 값은 허용(0점), 어휘 밖 값은 행 제외
+  → 잘못된 행은 데이터 행 번호(헤더 제외, 1부터)와 사유로 보고(앞쪽 MAX_REPORTED_ERRORS건만 보관, 개수는 전체)
+    — 따옴표 안 줄바꿈이 있으면 물리적 줄 번호와 어긋나므로 줄 번호 대신 행 번호
+- 이름 기준 중복 제거: 처음 나온 유효 행을 유지, 뒤의 같은 이름 행은 사유 "이름 중복"으로 보고
+- 인덱스는 청크가 들어올 때마다 세그먼트 추가(ChunkedMentorIndex): 청크별 MentorMatrix + 공유 HashingVectorizer
+  (텍스트 analyzer "hash"는 적합이 없어 모든 세그먼트가 같은 공간) → 전체 재구축 없이 누적,
+  rank()는 세그먼트별 상위 k를 병합(동점은 앞 행 우선, rank_mentors와 같은 규칙)
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from matching import AGE_BANDS, OCCUPATION_MAJORS, STYLES, MentorMatrix, age_band_normalize
+from ranking import DEFAULT_TOP_K, _merge, _winners
+from text_index import make_vectorizer
+
+INGEST_CHUNK_ROWS = 20_000
+INGEST_REQUIRED_COLUMNS = ["name", "age_band", "occupation_major", "style"]
+INGEST_TEXT_ANALYZER = "hash"
+MAX_REPORTED_ERRORS = 1000
+ENCODINGS = ("utf-8", "cp949")
+# (컬럼, 화면 이름, 허용 어휘, 비교 전 정규화)
+VOCAB_CHECKS = [
+    ("age_band", "나이대", set(AGE_BANDS), age_band_normalize),
+    ("style", "스타일", set(STYLES), None),
+    ("occupation_major", "직종", set(OCCUPATION_MAJORS), None),
+]
+
+
+def _text(chunk: pd.DataFrame, col: str) -> pd.Series:
+    return chunk[col].map(lambda v: "" if pd.isna(v) else str(v).strip())
+
+
+def validate_chunk(chunk: pd.DataFrame, first_row: int, seen: Set[str]) -> Tuple[pd.DataFrame, List[Dict]]:
+    """청크 검증 → (유효 행, 잘못된 행 보고 [{"row", "name", "reason"}]). 받아들인 이름은 seen에 추가.
+
+    first_row는 청크 첫 행의 데이터 행 번호(헤더 제외, 1부터). 검사는 고유값 단위(어휘 대조)라 청크 크기에 선형.
+    """
+    names = _text(chunk, "name").to_numpy(dtype=object)
+    reason = np.where(names == "", "이름 없음", "").astype(object)
+    for col, label, vocab, norm in VOCAB_CHECKS:
+        values = _text(chunk, col)
+        ok = {v: (not v) or ((norm(v) if norm else v) in vocab) for v in values.unique()}
+        bad = ~values.map(ok).to_numpy(dtype=bool) & (reason == "")
+        reason[bad] = [f"{label} 어휘 밖: {v}" for v in values.to_numpy()[bad]]
+    valid = np.flatnonzero(reason == "")
+    dup = (pd.Series(names[valid]).duplicated().to_numpy()
+           | np.fromiter((n in seen for n in names[valid]), dtype=bool, count=len(valid)))
+    reason[valid[dup]] = "이름 중복(앞 행 유지)"
+    keep = valid[~dup]
+    seen.update(names[keep])
+    errors = [{"row": first_row + int(i), "name": names[i], "reason": reason[i]}
+              for i in np.flatnonzero(reason != "")]
+    return chunk.iloc[keep], errors
+
+
+class ChunkedMentorIndex:
+    """청크마다 만든 MentorMatrix 세그먼트 목록. 세그먼트 행은 전체 프레임에서의 위치 순서 그대로 이어짐."""
+
+    def __init__(self, availability: str = "separate"):
+        self.availability = availability
+        self.vectorizer = make_vectorizer(INGEST_TEXT_ANALYZER)
+        self.segments: List[MentorMatrix] = []
+        self.offsets: List[int] = []
+        self.n = 0
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """유효 행 청크 추가(그 청크만 인코딩)."""
+        if not len(chunk):
+            return
+        seg = MentorMatrix(chunk, text_analyzer=INGEST_TEXT_ANALYZER, availability=self.availability,
+                           text_vectorizer=self.vectorizer)
+        self.offsets.append(self.n)
+        self.segments.append(seg)
+        self.n += seg.n
+
+    def locate(self, pos: int) -> Tuple[int, int]:
+        """전체 위치 → (세그먼트 번호, 세그먼트 안 위치)."""
+        s = int(np.searchsorted(self.offsets, pos, side="right")) - 1
+        return s, pos - self.offsets[s]
+
+    def rank(self, mentee: Dict, k: int = DEFAULT_TOP_K) -> tuple:
+        """([{"pos", "idx", "total", "breakdown"}, ...], 검색한 행 수) — pos는 전체 위치, idx는 행 라벨."""
+        segments, offsets = list(self.segments), list(self.offsets)
+        best_tot = np.zeros(0, dtype=np.int64)
+        best_pos = np.zeros(0, dtype=np.int64)
+        for seg, off in zip(segments, offsets):
+            best_tot, best_pos = _merge(best_tot, best_pos, seg.score_all(mentee)["total"], off, k)
+        ranked = {}
+        bounds = offsets + [offsets[-1] + segments[-1].n] if segments else [0]
+        for s, seg in enumerate(segments):
+            pos = best_pos[(best_pos >= bounds[s]) & (best_pos < bounds[s + 1])]
+            for item in _winners(seg, mentee, pos - bounds[s]):
+                ranked[item["pos"] + bounds[s]] = {**item, "pos": item["pos"] + bounds[s]}
+        return [ranked[int(p)] for p in best_pos], sum(seg.n for seg in segments)
+
+
+class MentorIngest:
+    """업로드 파일 1개의 백그라운드 수집 작업. 진행 상태는 속성으로 읽음(완료 전 frame은 None).
+
+    status: "running" → "done" / "failed"(필수 컬럼 누락·디코드 실패 등, message에 사유)
+    """
+
+    def __init__(self, source, chunk_rows: int = INGEST_CHUNK_ROWS,
+                 required_columns: Sequence[str] = INGEST_REQUIRED_COLUMNS, availability: str = "separate",
+                 start: bool = True):
+        self.source = source  # 파일 객체(읽기/seek 가능) — 업로드 버퍼를 그대로 사용(복사 없음)
+        self.chunk_rows = chunk_rows
+        self.required_columns = list(required_columns)
+        self.availability = availability
+        source.seek(0, 2)
+        self.total_bytes = source.tell()
+        source.seek(0)
+        self.status = "running"
+        self.message = ""
+        self.frame: Optional[pd.DataFrame] = None
+        self.elapsed = 0.0
+        self._reset(None)
+        self._thread = threading.Thread(target=self._run, name="mentor-ingest", daemon=True)
+        if start:
+            self._thread.start()
+
+    def _reset(self, encoding: Optional[str]) -> None:
+        self.encoding = encoding
+        self.rows_read = 0
+        self.rows_ok = 0
+        self.error_count = 0
+        self.errors: List[Dict] = []
+        self.index = ChunkedMentorIndex(self.availability)
+        self._parts: List[pd.DataFrame] = []
+        self._seen: Set[str] = set()
+        self._columns: Optional[pd.Index] = None
+
+    @property
+    def progress(self) -> float:
+        """읽은 바이트 비율(0~1, 완료 시 1)."""
+        if self.status != "running" or not self.total_bytes:
+            return 1.0
+        try:
+            return min(1.0, self.source.tell() / self.total_bytes)
+        except (ValueError, OSError):
+            return 0.0
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._thread.join(timeout)
+
+    def run(self) -> None:
+        """현재 스레드에서 실행(start=False로 만든 경우)."""
+        self._run()
+
+    def _run(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            for enc in ENCODINGS:
+                self.source.seek(0)
+                self._reset(enc)
+                try:
+                    self._read(enc)
+                    break
+                except UnicodeDecodeError:
+                    continue
+            else:
+                raise ValueError(f"인코딩을 알 수 없습니다({'/'.join(ENCODINGS)} 모두 실패)")
+            self.frame = (pd.concat(self._parts) if self._parts
+                          else pd.DataFrame(columns=self.required_columns))
+            self._parts = []
+            self.status = "done"
+        except Exception as e:
+            self.status, self.message = "failed", str(e)
+        finally:
+            self.elapsed = time.perf_counter() - t0
+
+    def _read(self, encoding: str) -> None:
+        reader = pd.read_csv(self.source, encoding=encoding, chunksize=self.chunk_rows)
+        for chunk in reader:
+            if self._columns is None:
+                columns = chunk.columns.str.strip()
+                # 파일 컬럼 이름이 'communication_style'이면 'style'로 (load_mentor_data와 같은 정리)
+                if "communication_style" in columns and "style" not in columns:
+                    columns = columns.where(columns != "communication_style", "style")
+                missing = [c for c in self.required_columns if c not in columns]
+                if missing:
+                    raise ValueError(f"멘토 CSV 파일에 다음 컬럼이 누락되었습니다: {', '.join(missing)}")
+                self._columns = columns
+            chunk.columns = self._columns
+            # 행 라벨 = 전체 위치(0부터), 보고용 행 번호는 1부터
+            chunk.index = pd.RangeIndex(self.rows_read, self.rows_read + len(chunk))
+            valid, errors = validate_chunk(chunk, self.rows_read + 1, self._seen)
+            self.rows_read += len(chunk)
+            self.error_count += len(errors)
+            self.errors.extend(errors[:max(0, MAX_REPORTED_ERRORS - len(self.errors))])
+            if len(valid):
+                valid = valid.reset_index(drop=True)
+                valid.index = pd.RangeIndex(self.rows_ok, self.rows_ok + len(valid))
+                self.index.add(valid)
+                self._parts.append(valid)
+                self.rows_ok += len(valid)
@@ -0,0 +1,268 @@
+# mentor_search.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 멘토 검색 — app.py / app1.py / app22.py 공용 recommend_mentors 점수(직종 3 · 주제 2 · 스타일 1)
+
+핵심
+- 데이터 세트당 1회: 직종/스타일 컬럼을 정수 코드로(pd.factorize), 주제 컬럼은 고유 문자열 + 코드로,
+  검색 조건이 없을 때의 이름순 순서도 미리 계산
+- 검색 1회: 코드 비교(==)와 고유값 단위 부분 문자열 검사 결과 gather → int8 점수 배열,
+  DataFrame 복사/Series.apply 없음
+- 결과는 데이터 내 행 위치 배열(점수 내림차순, 동점은 원래 순서) — 화면에 필요한 행만 iloc으로 꺼냄
+- 주제는 기존과 같이 topic_prefs 원문에 대한 부분 문자열 검사(고유 문자열 수만큼만, 주제별 캐시)
+- 스타일: "substring"(app.py/app1.py — 선택값이 셀에 포함) / "exact"(app22.py — 셀과 같음)
+- MentorFacets: 검색 폼 선택지(직종/주제/스타일)와 모든 선택 조합(각 칸 '(전체)' 포함)의 검색 결과 수를
+  데이터 세트당 1회 계산 — 선택지 옆 인원수 표시, 결과 0명인 조합은 표를 훑지 않고 바로 안내
+- MaterializedSearch: 모든 선택 조합의 추천 순서를 데이터 로드 때 한 번에 만들어 두고(한 버퍼에 이어 붙인
+  uint16/uint32 위치 배열 + 조합 → 구간 dict) 검색은 dict 조회 — 조합 결과 총량이 상한을 넘으면
+  조합별 요청 시 계산 + LRU(ResultCache)로 대체, memory_report()로 방식/크기/적중 확인
+
+사용 예
+    python mentor_search.py 멘토더미.csv   # 조합 수 · 위치 총량 · 메모리 보고
+"""
+
+import argparse
+import itertools
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from result_cache import ResultCache
+
+FIELD_POINTS, TOPIC_POINTS, STYLE_POINTS = 3, 2, 1
+STYLE_MATCH_MODES = ("substring", "exact")
+FACETS = ("field", "topic", "style")
+TOPIC_SPLIT = re.compile(r"[,;]")
+MATERIALIZE_MAX_POSITIONS = 1 << 24  # 조합 결과 위치 총합 상한(uint32 기준 64MB)
+SEARCH_LRU_ENTRIES = 256
+
+
+def _column(df: pd.DataFrame, col: str) -> pd.Series:
+    return df[col] if col in df.columns else pd.Series([np.nan] * len(df), index=df.index, dtype=object)
+
+
+class MentorSearchIndex:
+    """멘토 테이블의 검색용 코드. 데이터 세트가 바뀌면 새로 만든다."""
+
+    def __init__(self, mentors_df: pd.DataFrame, style_match: str = "substring"):
+        if style_match not in STYLE_MATCH_MODES:
+            raise ValueError(f"지원하지 않는 style_match: {style_match} (가능: {', '.join(STYLE_MATCH_MODES)})")
+        self.n = len(mentors_df)
+        self.style_match = style_match
+        # 직종: x == search_field (빈 값은 코드 -1 → 일치 없음)
+        self._field_codes, fields = pd.factorize(_column(mentors_df, "occupation_major"))
+        self._field_vocab = {v: i for i, v in enumerate(fields)}
+        # 주제: search_topic in str(x) — 고유 문자열 단위로 검사 후 코드로 펼침
+        self._topic_codes, topics = pd.factorize(_column(mentors_df, "topic_prefs").map(str))
+        self._topic_values = list(topics)
+        self._topic_masks: Dict[str, np.ndarray] = {}
+        # 스타일: 문자열이 아닌 셀(빈 값)은 어느 모드에서도 불일치
+        self._style_codes, styles = pd.factorize(_column(mentors_df, "style"))
+        self._style_values = list(styles)
+        self._style_vocab = {v: i for i, v in enumerate(styles)}
+        self._style_masks: Dict[str, np.ndarray] = {}
+        # 조건 없음: 이름 오름차순(빈 이름은 뒤, 같은 이름은 원래 순서)
+        names = _column(mentors_df, "name")
+        has = names.notna().to_numpy()
+        present = np.flatnonzero(has)
+        keys = names.to_numpy(dtype=object)[present].astype(str)
+        self._name_order = np.concatenate([present[np.argsort(keys, kind="stable")], np.flatnonzero(~has)])
+
+    def codes(self, facet: str) -> np.ndarray:
+        """facet("field"/"topic"/"style")의 행별 고유값 코드(빈 값은 -1)."""
+        return {"field": self._field_codes, "topic": self._topic_codes, "style": self._style_codes}[facet]
+
+    def per_value(self, facet: str, option: str) -> np.ndarray:
+        """고유값별 일치 여부 + 끝에 코드 -1용 False — codes(facet)로 인덱싱하면 행별 일치 여부."""
+        if facet == "field":
+            hit = np.arange(len(self._field_vocab)) == self._field_vocab.get(option, -1)
+        elif facet == "topic":
+            hit = np.array([option in v for v in self._topic_values], dtype=bool)
+        elif self.style_match == "exact":
+            hit = np.arange(len(self._style_values)) == self._style_vocab.get(option, -1)
+        else:
+            hit = np.array([isinstance(v, str) and option in v for v in self._style_values], dtype=bool)
+        return np.concatenate([hit, np.zeros(1, dtype=bool)])
+
+    def _topic_mask(self, topic: str) -> np.ndarray:
+        mask = self._topic_masks.get(topic)
+        if mask is None:
+            mask = self._topic_masks[topic] = self.per_value("topic", topic)[self._topic_codes]
+        return mask
+
+    def _style_mask(self, style: str) -> np.ndarray:
+        if self.style_match == "exact":
+            code = self._style_vocab.get(style)
+            return self._style_codes == (-2 if code is None else code)
+        mask = self._style_masks.get(style)
+        if mask is None:
+            mask = self._style_masks[style] = self.per_value("style", style)[self._style_codes]
+        return mask
+
+    def scores(self, search_field: str = "", search_topic: str = "", search_style: str = "") -> np.ndarray:
+        """행별 점수(int8) = 직종 일치 3 + 주제 포함 2 + 스타일 일치 1. 빈 조건은 0점."""
+        score = np.zeros(self.n, dtype=np.int8)
+        if search_field:
+            code = self._field_vocab.get(search_field)
+            if code is not None:
+                score += np.int8(FIELD_POINTS) * (self._field_codes == code)
+        if search_topic:
+            score += np.int8(TOPIC_POINTS) * self._topic_mask(search_topic)
+        if search_style:
+            score += np.int8(STYLE_POINTS) * self._style_mask(search_style)
+        return score
+
+    def search(self, search_field: str = "", search_topic: str = "", search_style: str = "",
+               scores: Optional[np.ndarray] = None) -> np.ndarray:
+        """추천 순서의 행 위치 배열. 조건이 있으면 0점 초과만(점수 내림차순), 없으면 전체 이름순."""
+        if not (search_field or search_topic or search_style):
+            return self._name_order
+        if scores is None:
+            scores = self.scores(search_field, search_topic, search_style)
+        hit = np.flatnonzero(scores > 0)
+        return hit[np.argsort(-scores[hit], kind="stable")]
+
+
+def topic_options(mentors_df: pd.DataFrame) -> List[str]:
+    """topic_prefs 셀을 , ; 로 나눈 주제 선택지(정렬, 중복/빈 값 제외)."""
+    values = _column(mentors_df, "topic_prefs").map(str).unique()
+    return sorted({t.strip() for v in values for t in TOPIC_SPLIT.split(v) if t.strip()})
+
+
+def style_options(mentors_df: pd.DataFrame) -> List[str]:
+    """데이터의 style 고유값 선택지(정렬, 빈 값 제외). 컬럼이 없으면 빈 목록."""
+    return sorted(_column(mentors_df, "style").dropna().unique()) if "style" in mentors_df.columns else []
+
+
+class MentorFacets:
+    """검색 폼 선택지와 선택 조합별 검색 결과 수. 데이터 세트(검색 인덱스)가 바뀌면 새로 만든다.
+
+    결과 수 = search()가 돌려주는 인원 = 선택한 조건 중 하나라도 맞는 멘토 수(조건이 없으면 전체).
+    직종/주제/스타일 코드가 같은 행끼리 묶은 뒤 "어느 조건에도 안 맞는" 수를 조합 전체에 대해
+    한 번에 세고(빈 칸 '(전체)'는 모든 행이 안 맞는 것으로 취급) 전체 수에서 뺀다.
+    """
+
+    def __init__(self, index: MentorSearchIndex, fields: Sequence[str], topics: Sequence[str],
+                 styles: Sequence[str]):
+        self.n = index.n
+        self.options: Dict[str, List[str]] = {"field": list(fields), "topic": list(topics), "style": list(styles)}
+        self._slot = {facet: {v: i + 1 for i, v in enumerate(opts)} for facet, opts in self.options.items()}
+        groups, weight = np.unique(np.stack([index.codes(facet) for facet in FACETS]), axis=1, return_counts=True)
+        miss = []
+        for facet, group_codes in zip(FACETS, groups):
+            # 0번 칸 = '(전체)'(조건 없음) → 모든 묶음이 "안 맞음"
+            cols = [np.ones(len(group_codes), dtype=bool)]
+            cols += [~index.per_value(facet, v)[group_codes] for v in self.options[facet]]
+            miss.append(np.stack(cols, axis=1).astype(np.int64))
+        self.counts = self.n - np.einsum("g,gf,gt,gs->fts", weight.astype(np.int64), *miss, optimize=True)
+        self.counts[0, 0, 0] = self.n
+
+    def count(self, search_field: str = "", search_topic: str = "", search_style: str = "") -> Optional[int]:
+        """선택 조합의 검색 결과 수. 빈 문자열은 '(전체)', 선택지에 없는 값이 있으면 None(직접 검색)."""
+        slots = []
+        for facet, value in zip(FACETS, (search_field, search_topic, search_style)):
+            slot = self._slot[facet].get(value) if value else 0
+            if slot is None:
+                return None
+            slots.append(slot)
+        return int(self.counts[tuple(slots)])
+
+    def option_counts(self, facet: str) -> Dict[str, int]:
+        """facet의 선택지별 결과 수(그 칸만 고르고 나머지는 '(전체)')."""
+        axis = FACETS.index(facet)
+        line = np.moveaxis(self.counts, axis, 0)[:, 0, 0]
+        return {v: int(line[i + 1]) for i, v in enumerate(self.options[facet])}
+
+    def label(self, facet: str, option: str) -> str:
+        """선택지 표시용 "값 (N명)" — 선택지가 아니면('(전체)' 등) 그대로."""
+        slot = self._slot[facet].get(option)
+        if slot is None:
+            return option
+        index = [0, 0, 0]
+        index[FACETS.index(facet)] = slot
+        return f"{option} ({int(self.counts[tuple(index)])}명)"
+
+
+class MaterializedSearch:
+    """(직종, 주제, 스타일) 선택 조합 → 추천 순서 표. 빈 문자열은 '(전체)'.
+
+    위치 총합(facets.counts 합)이 max_positions 이하면 모든 조합을 미리 만들고, 넘으면 조합별로
+    처음 요청될 때 계산해 LRU에 둔다. with_scores=True면 위치와 같은 순서의 점수(int8)도 함께 보관.
+    """
+
+    def __init__(self, index: MentorSearchIndex, facets: MentorFacets, with_scores: bool = False,
+                 max_positions: int = MATERIALIZE_MAX_POSITIONS, lru_entries: int = SEARCH_LRU_ENTRIES):
+        self.index = index
+        self.with_scores = with_scores
+        self.dtype = np.uint16 if index.n <= np.iinfo(np.uint16).max + 1 else np.uint32
+        self.positions = int(facets.counts.sum())
+        self.combinations = int(facets.counts.size)
+        self.materialized = self.positions <= max_positions
+        self._table: Dict[Tuple[str, str, str], Tuple[np.ndarray, Optional[np.ndarray]]] = {}
+        self._lru = ResultCache(max_entries=lru_entries)
+        self._buffers: List[np.ndarray] = []
+        t0 = time.perf_counter()
+        if self.materialized:
+            self._materialize(facets)
+        self.build_seconds = time.perf_counter() - t0
+
+    def _compute(self, key: Tuple[str, str, str]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        scores = self.index.scores(*key)
+        order = self.index.search(*key, scores=scores)
+        return order.astype(self.dtype), (scores[order] if self.with_scores else None)
+
+    def _materialize(self, facets: MentorFacets) -> None:
+        flat = np.empty(self.positions, dtype=self.dtype)
+        flat_scores = np.empty(self.positions, dtype=np.int8) if self.with_scores else None
+        start = 0
+        for key in itertools.product(*([""] + facets.options[facet] for facet in FACETS)):
+            order, scores = self._compute(key)
+            end = start + len(order)
+            flat[start:end] = order
+            if flat_scores is not None:
+                flat_scores[start:end] = scores
+            self._table[key] = (flat[start:end], None if flat_scores is None else flat_scores[start:end])
+            start = end
+        self._buffers = [b for b in (flat, flat_scores) if b is not None]
+
+    def lookup(self, search_field: str = "", search_topic: str = "",
+               search_style: str = "") -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """(추천 순서 위치 배열, 같은 순서의 점수 또는 None). 표에 없는 조합은 계산 후 LRU."""
+        key = (search_field, search_topic, search_style)
+        hit = self._table.get(key)
+        if hit is not None:
+            return hit
+        return self._lru.get_or_compute("\x1f".join(key), lambda: self._compute(key))
+
+    def memory_report(self) -> Dict[str, Any]:
+        lru = self._lru.stats()
+        return {"mode": "materialized" if self.materialized else "lru",
+                "combinations": self.combinations, "positions": self.positions,
+                "dtype": np.dtype(self.dtype).name,
+                "bytes": sum(b.nbytes for b in self._buffers),
+                "build_seconds": round(self.build_seconds, 4),
+                "lru_size": lru["size"], "lru_hits": lru["hits"], "lru_misses": lru["misses"]}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from batch_match import read_csv_any
+
+    ap = argparse.ArgumentParser(description="결 멘토 검색 조합 표 메모리 보고")
+    ap.add_argument("mentors", help="멘토 CSV")
+    ap.add_argument("--style-match", choices=STYLE_MATCH_MODES, default="substring")
+    ap.add_argument("--max-positions", type=int, default=MATERIALIZE_MAX_POSITIONS)
+    args = ap.parse_args(argv)
+
+    df = read_csv_any(args.mentors)
+    index = MentorSearchIndex(df, style_match=args.style_match)
+    fields = sorted(_column(df, "occupation_major").dropna().unique())  # 앱은 OCCUPATION_GROUPS 전체
+    facets = MentorFacets(index, fields, topic_options(df), style_options(df))
+    report = MaterializedSearch(index, facets, max_positions=args.max_positions).memory_report()
+    print(" · ".join(f"{k}={v}" for k, v in report.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# mentor_snapshot.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 멘토 데이터 컴파일 스냅샷 — CSV를 열 단위 .npy 묶음으로 미리 변환해 시작 시 파싱 생략
+
+핵심
+- 컴파일 1회: CSV 읽기(인코딩 판별) + 컬럼 정리(strip, communication_style → style)를 끝낸 프레임을
+  "<CSV 이름>.snapshot/" 폴더에 열마다 저장
+  · 문자열 열: 범주 코드(int32, 빈 값 -1) + 범주 문자열(UTF-8 바이트 + 오프셋)
+  · 숫자 열: 값 배열 그대로
+  · 목록 열(쉼표 목록)은 따로 나눠 두지 않음 — 엔진(FacetMatrix)이 어차피 빌드 때 한 번 나누므로 문자열 열로만
+- meta.json: 원본 크기/mtime/sha1(내용 해시), 인코딩, 데이터 세트 버전(dataset_version), 열 목록
+- 로드: np.load(mmap_mode="r")로 배열을 메모리 매핑, 범주 문자열은 고유값 수만큼만 디코드해 코드로 펼침
+  → CSV와 같은 DataFrame(equals, 같은 dataset_version)
+- 최신 여부: 원본 (size, mtime_ns)가 같으면 바로 사용, 다르면 원본 바이트 sha1 비교(파싱 없음)
+  — 다르면 None → 앱(MentorStore)은 CSV로 읽음
+- 앱은 MentorStore(..., snapshot_dir=snapshot_path(CSV))로 사용
+
+사용 예
+    python mentor_snapshot.py 멘토더미.csv           # 멘토더미.snapshot/ 생성
+    python mentor_snapshot.py 멘토더미.csv --check   # 최신 여부만 확인
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from matching import dataset_version
+
+SNAPSHOT_SUFFIX = ".snapshot"
+SNAPSHOT_FORMAT = 2  # 2: 목록 열 파일 제거(형식 1 스냅샷은 오래된 것으로 보고 CSV로 읽음)
+ENCODINGS = ("utf-8", "cp949")
+
+
+def snapshot_path(csv_path: str) -> Path:
+    p = Path(csv_path)
+    return p.with_name(p.stem + SNAPSHOT_SUFFIX)
+
+
+def decode_csv(raw: bytes, first: Optional[str] = None) -> Tuple[str, str]:
+    """CSV 바이트 → (문자열, 인코딩). first가 있으면 그 인코딩부터 시도."""
+    order = [first] + [e for e in ENCODINGS if e != first] if first else list(ENCODINGS)
+    for enc in order:
+        try:
+            return raw.decode(enc), enc
+        except UnicodeDecodeError:
+            continue
+    raise UnicodeDecodeError(order[-1], raw, 0, len(raw), f"{'/'.join(order)} 모두 실패")
+
+
+def clean_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """앱 load_mentor_data와 같은 컬럼 정리."""
+    df.columns = df.columns.str.strip()
+    # 파일 컬럼 이름이 'communication_style'이면 'style'로 변경하여 호환성 확보
+    if "communication_style" in df.columns and "style" not in df.columns:
+        df = df.rename(columns={"communication_style": "style"})
+    return df
+
+
+def _strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    blobs = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in blobs], out=offsets[1:])
+    return np.frombuffer(b"".join(blobs), dtype=np.uint8), offsets
+
+
+def _unstrings(chars: np.ndarray, offsets: np.ndarray) -> List[str]:
+    raw = chars.tobytes()
+    return [raw[a:b].decode("utf-8") for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def compile_snapshot(csv_path: str, out_dir: Optional[str] = None) -> Path:
+    """CSV → 스냅샷 폴더(기존 폴더는 새 내용으로 교체). 저장 경로 반환."""
+    out = Path(out_dir) if out_dir else snapshot_path(csv_path)
+    st = os.stat(csv_path)
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    text, encoding = decode_csv(raw)
+    df = clean_columns(pd.read_csv(io.StringIO(text)))
+
+    tmp = out.with_name(out.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    columns = []
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        if s.dtype.kind in "biuf":
+            np.save(tmp / f"{i}.values.npy", s.to_numpy())
+            columns.append({"name": col, "kind": "numeric", "dtype": str(s.dtype)})
+            continue
+        codes, cats = pd.factorize(s)
+        chars, offsets = _strings([str(v) for v in cats])
+        np.save(tmp / f"{i}.codes.npy", codes.astype(np.int32))
+        np.save(tmp / f"{i}.chars.npy", chars)
+        np.save(tmp / f"{i}.offsets.npy", offsets)
+        columns.append({"name": col, "kind": "category", "dtype": str(s.dtype)})
+    meta = {
+        "format": SNAPSHOT_FORMAT, "source": os.path.basename(csv_path),
+        "source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns,
+        "source_sha1": hashlib.sha1(raw).hexdigest(), "encoding": encoding,
+        "version": dataset_version(df), "n": len(df), "columns": columns,
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=1), encoding="utf-8")
+    shutil.rmtree(out, ignore_errors=True)
+    os.replace(tmp, out)
+    return out
+
+
+def read_meta(snapshot_dir) -> Optional[Dict]:
+    try:
+        meta = json.loads((Path(snapshot_dir) / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == SNAPSHOT_FORMAT else None
+
+
+def is_fresh(meta: Optional[Dict], csv_path: str, signature: Optional[Tuple[int, int]] = None) -> bool:
+    """스냅샷이 원본 CSV와 같은 내용인지. (size, mtime_ns)가 같으면 바로 참, 아니면 sha1 비교."""
+    if meta is None:
+        return False
+    if signature is None:
+        try:
+            st = os.stat(csv_path)
+        except OSError:
+            return False
+        signature = (st.st_mtime_ns, st.st_size)
+    if signature == (meta["source_mtime_ns"], meta["source_size"]):
+        return True
+    if signature[1] != meta["source_size"]:
+        return False
+    try:
+        with open(csv_path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest() == meta["source_sha1"]
+    except OSError:
+        return False
+
+
+def load_snapshot(snapshot_dir, csv_path: Optional[str] = None, signature: Optional[Tuple[int, int]] = None
+                  ) -> Optional[Tuple[pd.DataFrame, Dict]]:
+    """스냅샷 → (DataFrame, meta). csv_path가 주어지면 최신이 아닐 때 None."""
+    snapshot_dir = Path(snapshot_dir)
+    meta = read_meta(snapshot_dir)
+    if meta is None or (csv_path is not None and not is_fresh(meta, csv_path, signature)):
+        return None
+
+    def arr(name: str) -> np.ndarray:
+        return np.load(snapshot_dir / name, mmap_mode="r")
+
+    try:
+        df = _read_columns(meta, arr)
+    except (OSError, ValueError, KeyError):  # 일부 파일이 없거나 깨진 스냅샷 → CSV로
+        return None
+    return df, meta
+
+
+def _read_columns(meta: Dict, arr) -> pd.DataFrame:
+    data = {}
+    for i, c in enumerate(meta["columns"]):
+        if c["kind"] == "numeric":
+            data[c["name"]] = pd.Series(arr(f"{i}.values.npy"), dtype=c["dtype"])
+            continue
+        cats = np.array(_unstrings(arr(f"{i}.chars.npy"), arr(f"{i}.offsets.npy")) + [np.nan], dtype=object)
+        data[c["name"]] = pd.Series(cats[arr(f"{i}.codes.npy")], dtype=c["dtype"])
+    return pd.DataFrame(data, index=pd.RangeIndex(meta["n"]))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="결 멘토 CSV → 열 단위 스냅샷 컴파일")
+    ap.add_argument("mentors", help="멘토 CSV")
+    ap.add_argument("-o", "--output", default=None, help=f"스냅샷 폴더(기본: CSV 옆 *{SNAPSHOT_SUFFIX})")
+    ap.add_argument("--check", action="store_true", help="컴파일하지 않고 최신 여부만 확인")
+    args = ap.parse_args(argv)
+
+    out = Path(args.output) if args.output else snapshot_path(args.mentors)
+    if args.check:
+        fresh = is_fresh(read_meta(out), args.mentors)
+        print(f"{out}: {'최신' if fresh else '없음 또는 오래됨(다시 컴파일 필요)'}")
+        raise SystemExit(0 if fresh else 1)
+    t0 = time.perf_counter()
+    compile_snapshot(args.mentors, str(out))
+    meta = read_meta(out)
+    print(f"멘토 {meta['n']}명 · 열 {len(meta['columns'])}개 · "
+          f"버전 {meta['version']} · {time.perf_counter() - t0:.2f}s · 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# mentor_store.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 멘토 데이터 저장소 — 프로세스 공용, 파일이 바뀔 때만 CSV를 다시 읽음
+
+핵심
+- 앱(app.py/app22.py)은 st.cache_resource로 프로세스당 저장소 1개 → 모든 세션이 같은 DataFrame(읽기 전용) 공유
+- 접근마다 os.stat 한 번((mtime_ns, size) 비교) — 같으면 기존 스냅샷 그대로, 다르면 다시 읽음
+- 인코딩은 처음 한 번 판별(파일 바이트를 utf-8 → cp949 순으로 디코드)하고 다음 로드는 판별된 인코딩부터 시도
+  → cp949 파일(멘토더미.csv)도 CSV 파싱은 로드당 1회
+- 컬럼 정리(strip, communication_style → style) · 필수 컬럼 검사 · 데이터 세트 버전 해시도 로드당 1회
+- 오류는 스냅샷에 문구로 보관(화면 표시는 앱), 실패 시 빈 DataFrame
+- 다시 읽기는 Lock 안에서 한 번만(동시에 들어온 세션은 끝난 새 스냅샷을 받음)
+- snapshot_dir(mentor_snapshot 컴파일 결과)이 원본과 같은 내용이면 CSV 대신 메모리 매핑으로 읽음
+  (버전/인코딩도 스냅샷 것 사용), 오래됐거나 없으면 CSV
+"""
+
+import io
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from matching import dataset_version
+from mentor_snapshot import clean_columns, decode_csv, load_snapshot
+
+
+class MentorSnapshot:
+    """한 번 읽은 멘토 데이터(공유, 수정 금지 — 바꿔야 하면 df.copy())."""
+
+    __slots__ = ("df", "version", "encoding", "signature", "error", "missing_cols", "source")
+
+    def __init__(self, df: pd.DataFrame, signature: Optional[Tuple[int, int]], encoding: Optional[str] = None,
+                 error: Optional[str] = None, missing_cols: Sequence[str] = (), version: Optional[str] = None,
+                 source: str = "csv"):
+        self.df = df
+        self.version = version or dataset_version(df)
+        self.encoding = encoding
+        self.signature = signature
+        self.error = error
+        self.missing_cols = list(missing_cols)
+        self.source = source  # "csv" / "snapshot"
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class MentorStore:
+    """멘토 CSV 한 개의 공용 저장소. get()은 파일이 그대로면 같은 스냅샷을 돌려준다."""
+
+    def __init__(self, path: str, required_cols: Sequence[str] = (), snapshot_dir=None):
+        self.path = path
+        self.required_cols = list(required_cols)
+        self.snapshot_dir = snapshot_dir
+        self.encoding: Optional[str] = None  # 판별된 인코딩(다음 로드에서 먼저 시도)
+        self.loads = 0
+        self._snapshot: Optional[MentorSnapshot] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> MentorSnapshot:
+        sig = _signature(self.path)
+        snap = self._snapshot
+        if snap is not None and snap.signature == sig:
+            return snap
+        with self._lock:
+            snap = self._snapshot
+            if snap is None or snap.signature != sig:
+                snap = self._snapshot = self._load(sig)
+            return snap
+
+    def is_stale(self) -> bool:
+        """마지막으로 읽은 뒤 파일이 바뀌었는지(os.stat 한 번, 읽지는 않음)."""
+        snap = self._snapshot
+        return snap is None or snap.signature != _signature(self.path)
+
+    def _load(self, sig: Optional[Tuple[int, int]]) -> MentorSnapshot:
+        self.loads += 1
+        if sig is None:
+            return MentorSnapshot(pd.DataFrame(), None,
+                                  error=f"Error: 멘토 데이터 파일 '{self.path}'을(를) 찾을 수 없습니다.")
+        compiled = load_snapshot(self.snapshot_dir, self.path, sig) if self.snapshot_dir else None
+        if compiled is not None:
+            df, meta = compiled
+            self.encoding = meta["encoding"]
+            extra = {"version": meta["version"], "source": "snapshot"}
+        else:
+            try:
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                text, self.encoding = decode_csv(raw, self.encoding)
+                df = clean_columns(pd.read_csv(io.StringIO(text)))
+            except Exception as e:
+                return MentorSnapshot(pd.DataFrame(), sig, error=f"CSV 파일 로드 중 예상치 못한 오류 발생: {e}")
+            extra = {}
+        missing: List[str] = [c for c in self.required_cols if c not in df.columns]
+        if missing:
+            return MentorSnapshot(pd.DataFrame(), sig, self.encoding, missing_cols=missing,
+                                  error=f"멘토 CSV 파일에 다음 컬럼이 누락되었습니다: {', '.join(missing)} "
+                                        f"(현재 파일의 컬럼 목록: {', '.join(df.columns)})")
+        return MentorSnapshot(df, sig, self.encoding, **extra)
@@ -0,0 +1,203 @@
+# ranking.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 랭킹 단계 — argpartition 기반 top-k 선택 + 청크 스트리밍
+
+핵심
+- 전체 정렬 없이 k등까지만 선택(np.argpartition), 동점은 멘토 순서(위치) 우선
+  → 기존 sorted(..., reverse=True)[:k]와 같은 순서
+- 멘토 테이블을 chunk_size 단위로 점수화해 메모리 사용량을 풀 크기와 무관하게 유지
+- breakdown dict는 최종 k명에 대해서만 생성
+- rank_many: 멘티 여러 명을 (멘토 청크 × 멘티) 행렬 단위로 한 번에 랭킹(배치용)
+- ComponentCache: 세션별 컴포넌트 점수 벡터를 입력 키와 함께 보관,
+  재제출 시 입력이 바뀐 컴포넌트만 다시 계산해 합산(텍스트 재계산 회피)
+- rank_anytime: 지연 예산(초) 안에서 랭킹 — 값싼 범주형 컴포넌트로 전체를 먼저 훑고,
+  텍스트는 상한(범주형 합 + 텍스트 최대점)이 k등 하한 이상인 후보만 상한 높은 순으로 남은 시간 동안 계산.
+  시간이 모자라면 그때까지의 잠정 top-k를 돌려주고 항목마다 exact(순위 확정 여부) 표시
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from matching import COMPONENTS, COMPONENT_INPUTS, DEFAULT_CLIP, DEFAULT_WEIGHTS, MentorMatrix
+from result_cache import normalize_note
+
+DEFAULT_TOP_K = 5
+CHUNK_SIZE = 65536
+BLOCK_CHUNK_SIZE = 4096  # rank_many: (멘토 청크 × 멘티 블록) 행렬 크기 제한
+ANYTIME_CHUNK_SIZE = 8192  # rank_anytime: 마감 시각 확인 간격(행)
+TEXT_COMPONENT = "텍스트"
+CHEAP_COMPONENTS = [c for c in COMPONENTS if c != TEXT_COMPONENT]
+
+
+def top_k(scores: np.ndarray, k: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+    """scores 상위 k개의 인덱스를 (점수 내림차순, 위치 오름차순)으로 반환.
+
+    positions를 주면 동점 처리에 그 값을 사용한다(청크 병합 시 전역 위치).
+    """
+    n = len(scores)
+    if positions is None:
+        positions = np.arange(n)
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < n:
+        # k등 점수(kth)보다 큰 것은 모두, kth와 같은 것은 위치가 빠른 순으로 남은 자리만
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)
+        ties = ties[np.argsort(positions[ties], kind="stable")][:k - len(above)]
+        sel = np.concatenate([above, ties])
+    else:
+        sel = np.arange(n)
+    return sel[np.lexsort((positions[sel], -scores[sel]))]
+
+
+def _merge(best_tot: np.ndarray, best_pos: np.ndarray, totals: np.ndarray,
+           start: int, k: int) -> tuple:
+    """이전 후보 + 이번 청크(start부터) 후보를 합쳐 다시 k개만 유지."""
+    local = top_k(totals, k)
+    cand_tot = np.concatenate([best_tot, totals[local]])
+    cand_pos = np.concatenate([best_pos, local + start])
+    keep = top_k(cand_tot, k, cand_pos)
+    return cand_tot[keep], cand_pos[keep]
+
+
+def _winners(engine: MentorMatrix, mentee: Dict, best_pos: np.ndarray) -> List[Dict]:
+    if not len(best_pos):
+        return []
+    comps = engine.score_all(mentee, rows=best_pos)
+    return [{"pos": int(p), "idx": engine.index[p], **engine.breakdown(comps, i)}
+            for i, p in enumerate(best_pos)]
+
+
+def rank_mentors(engine: MentorMatrix, mentee: Dict, k: int = DEFAULT_TOP_K,
+                 chunk_size: int = CHUNK_SIZE) -> List[Dict]:
+    """멘티 1명에 대한 상위 k명: [{"pos", "idx", "total", "breakdown"}, ...]"""
+    best_tot = np.zeros(0, dtype=np.int64)
+    best_pos = np.zeros(0, dtype=np.int64)
+    for start in range(0, engine.n, chunk_size):
+        stop = min(start + chunk_size, engine.n)
+        totals = engine.score_all(mentee, rows=slice(start, stop))["total"]
+        best_tot, best_pos = _merge(best_tot, best_pos, totals, start, k)
+    return _winners(engine, mentee, best_pos)
+
+
+def rank_many(engine: MentorMatrix, mentees: List[Dict], k: int = DEFAULT_TOP_K,
+              chunk_size: int = BLOCK_CHUNK_SIZE) -> List[List[Dict]]:
+    """멘티 여러 명을 행렬·행렬 연산으로 한 번에 랭킹 — rank_mentors와 같은 결과를 멘티별 리스트로."""
+    m = len(mentees)
+    best = [(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)) for _ in range(m)]
+    for start in range(0, engine.n, chunk_size):
+        stop = min(start + chunk_size, engine.n)
+        totals = engine.score_block(mentees, rows=slice(start, stop))["total"]
+        for j in range(m):
+            best[j] = _merge(best[j][0], best[j][1], totals[:, j], start, k)
+    return [_winners(engine, mentee, pos) for mentee, (_, pos) in zip(mentees, best)]
+
+
+def rank_anytime(engine: MentorMatrix, mentee: Dict, k: int = DEFAULT_TOP_K, budget: Optional[float] = None,
+                 chunk_size: int = ANYTIME_CHUNK_SIZE) -> tuple:
+    """지연 예산 budget(초, None이면 무제한) 안에서 상위 k명.
+
+    ([{"pos", "idx", "total", "breakdown", "exact"}, ...], {"scored", "refined", "exact", "elapsed"})
+    - 예산 안에 끝나면 rank_mentors와 같은 결과(모든 항목 exact=True)
+    - 시간이 모자라면 잠정 순위: 텍스트를 계산하지 못한 멘토는 하한(범주형 합)으로 비교
+    - 최종 k명의 점수/breakdown은 항상 정밀 계산(k행이라 값쌈). exact는 그 멘토가 top-k에 드는 것이
+      확정인지 여부(남은 모든 멘토의 상한보다 높을 때) — 첫 청크와 최종 k명 계산은 예산을 넘어도 수행
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + budget if budget is not None else float("inf")
+    n = engine.n
+    hi = DEFAULT_CLIP[1]
+    cheap = np.zeros(n, dtype=np.int64)
+    scanned = 0
+    # 1단계: 범주형 컴포넌트(텍스트 제외)로 전체 훑기
+    for start in range(0, n, chunk_size):
+        if start and time.perf_counter() > deadline:
+            break
+        stop = min(start + chunk_size, n)
+        rows = slice(start, stop)
+        cheap[start:stop] = sum(engine.component(c, mentee, rows) for c in CHEAP_COMPONENTS)
+        scanned = stop
+    lower = np.clip(cheap[:scanned], DEFAULT_CLIP[0], hi)
+    final = lower.copy()
+    refined = np.zeros(scanned, dtype=bool)
+    no_text = not (mentee.get("note", "") or "").strip() or engine.text.vectorizer is None
+    if no_text:
+        refined[:] = True  # 텍스트 점수가 항상 0 → 범주형 합이 곧 총점
+        upper = lower
+    else:
+        # 2단계: 상한이 k등 하한 이상인 후보만, 상한 높은 순으로 텍스트 계산
+        upper = np.minimum(lower + int(round(DEFAULT_WEIGHTS["text"])), hi)
+        kth = lower[np.argpartition(-lower, k - 1)[k - 1]] if 0 < k < scanned else -1
+        cand = np.flatnonzero(upper >= kth)
+        cand = cand[np.argsort(-upper[cand], kind="stable")]
+        for start in range(0, len(cand), chunk_size):
+            if time.perf_counter() > deadline:
+                break
+            batch = np.sort(cand[start:start + chunk_size])
+            text = engine.component(TEXT_COMPONENT, mentee, batch)
+            final[batch] = np.clip(cheap[batch] + text, DEFAULT_CLIP[0], hi)
+            refined[batch] = True
+        if refined[cand].all():
+            refined[:] = True  # 후보 밖 멘토는 상한 < k등 하한 → 순위에 영향 없음
+    exact = scanned == n and bool(refined.all())
+
+    best = top_k(final, k)
+    ranked = _winners(engine, mentee, best)
+    if not exact:
+        # 최종 k명은 정밀 점수로 다시 정렬, 나머지 멘토의 상한보다 높으면 순위 확정
+        ranked.sort(key=lambda x: (-x["total"], x["pos"]))
+        rest = np.where(refined, final, upper)
+        rest[best] = -1
+        bound = rest.max() if scanned == n and len(rest) else hi
+    for item in ranked:
+        item["exact"] = exact or bool(item["total"] > bound)
+    return ranked, {"scored": scanned, "refined": int(refined.sum()), "exact": exact,
+                    "elapsed": time.perf_counter() - t0}
+
+
+class ComponentCache:
+    """세션 1개 × 데이터 세트 1개용 컴포넌트 점수 캐시(멘토 전체 int8 벡터 6개)."""
+
+    def __init__(self, engine: MentorMatrix):
+        self.engine = engine
+        self._keys: Dict[str, tuple] = {}
+        self._vecs: Dict[str, np.ndarray] = {}
+        self.recomputed: List[str] = []  # 직전 호출에서 다시 계산한 컴포넌트
+
+    @staticmethod
+    def input_key(name: str, mentee: Dict) -> tuple:
+        key = []
+        for k in COMPONENT_INPUTS[name]:
+            v = mentee.get(k, "")
+            if k == "note":
+                key.append(normalize_note(v))
+            elif isinstance(v, str):
+                key.append(v.strip())
+            else:
+                key.append(tuple(sorted(v)))
+        return tuple(key)
+
+    def scores(self, mentee: Dict) -> Dict[str, np.ndarray]:
+        """컴포넌트별 점수 벡터 + "total". 입력이 그대로인 컴포넌트는 캐시 사용."""
+        self.recomputed = []
+        for name in COMPONENTS:
+            key = self.input_key(name, mentee)
+            if self._keys.get(name) != key:
+                # 컴포넌트 점수는 0~30 범위 → int8로 보관
+                self._vecs[name] = self.engine.component(name, mentee).astype(np.int8)
+                self._keys[name] = key
+                self.recomputed.append(name)
+        comps = dict(self._vecs)
+        comps["total"] = np.clip(sum(v.astype(np.int16) for v in self._vecs.values()), 0, 100)
+        return comps
+
+    def rank(self, mentee: Dict, k: int = DEFAULT_TOP_K) -> List[Dict]:
+        """rank_mentors와 같은 결과. breakdown은 캐시된 벡터에서 바로 읽는다."""
+        comps = self.scores(mentee)
+        best = top_k(comps["total"], k)
+        return [{"pos": int(p), "idx": self.engine.index[p], **self.engine.breakdown(comps, p)}
+                for p in best]
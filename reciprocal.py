@@ -0,0 +1,243 @@
+# reciprocal.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 상호 매칭 — 멘토 1명 기준으로 등록 멘티 전체의 양방향 적합도를 한 번에
+
+핵심
+- MenteeIndex: 등록 멘티 설문을 멘티 쪽 배열로 1회 인코딩
+  (항목 multi-hot, 요일×시간대 비트마스크, 희망 직군/나이대 multi-hot, 스타일 코드, note TF-IDF)
+- 멘티→멘토(forward): 기존 compute_score와 같은 점수 — 같은 Jaccard/조회표/TF-IDF 구성 요소를
+  멘토 1명 × 멘티 전체 방향으로 계산 (MentorMatrix.score_all의 해당 열과 동일)
+- 멘토→멘티(backward): 대칭 컴포넌트(목적·주제, 소통, 관심사, 텍스트, 스타일)는 같은 값,
+  적합도만 멘토 쪽 선호(멘토 CSV의 선택 컬럼 wanted_mentee_ages)로 계산 — 컬럼이 없거나 멘토가 비워 두면
+  적합도를 빼고 나머지 컴포넌트 합을 만점(100) 기준으로 다시 환산(없는 선호 때문에 상호 점수가 깎이지 않게)
+- 상호 점수 = 두 방향 총점의 조화 평균 → 한쪽만 높은 쌍은 낮게
+- 페이지 조회마다 멘티 수만큼 Python 루프를 돌지 않음(멘토 1명당 배열 연산 몇 번)
+"""
+
+import io
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from matching import (
+    COMPONENTS, DEFAULT_CLIP, DEFAULT_WEIGHTS, FACETS, AvailabilityMasks, FacetMatrix, LookupTable,
+    MentorMatrix, _mask, _mask_jaccard, age_band_normalize, age_table, grid_mask, list_to_set,
+)
+from ranking import DEFAULT_TOP_K, top_k
+
+MENTOR_PREF_COLUMN = "wanted_mentee_ages"
+# 멘토→멘티 적합도: 나이대 규칙(6/2점) × 3 → 멘티→멘토 적합도(직군 12 + 나이 6)와 같은 최대 18점
+BACKWARD_FIT_SCALE = 3
+BACKWARD_FIT_MAX = 6 * BACKWARD_FIT_SCALE
+_COMM_KEYS = ("comm_modes", "time_slots", "days")
+
+
+def mentee_from_profile(profile: Dict) -> Dict:
+    """app.py 회원가입(users.json) 프로필 → 결 설문 mentee dict."""
+    comm = profile.get("comm_method")
+    return {
+        "name": profile.get("name", ""), "gender": profile.get("gender", ""),
+        "age_band": profile.get("age_band", ""),
+        "comm_modes": {comm} if comm else set(),
+        "time_slots": set(profile.get("available_times", [])),
+        "days": set(profile.get("available_days", [])),
+        "style": profile.get("comm_style", "") or "",
+        "interests": set(), "purpose": set(),
+        "topics": set(profile.get("topic_prefs", [])),
+        "wanted_majors": set(), "wanted_mentor_ages": set(), "note": "",
+    }
+
+
+def parse_registered_mentees(data: bytes, suffix: str) -> List[Dict]:
+    """등록 멘티 파일 내용: ".json"(app.py users.json) 또는 ".csv"(배치 매칭 설문 형식, UTF-8/cp949)."""
+    if suffix.lower() == ".json":
+        users = json.loads(data.decode("utf-8"))
+        return [mentee_from_profile(p) for p in users.values()]
+    from batch_match import mentee_from_row
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = data.decode("cp949")
+    df = pd.read_csv(io.StringIO(text), dtype=str)
+    df.columns = df.columns.str.strip()
+    return [mentee_from_row(r) for r in df.to_dict("records")]
+
+
+def load_registered_mentees(path) -> List[Dict]:
+    """등록 멘티 파일(.json 또는 .csv) 경로에서 읽기."""
+    path = Path(path)
+    return parse_registered_mentees(path.read_bytes(), path.suffix)
+
+
+def _wanted_hot(lut: LookupTable, value_sets: List[Set[str]]) -> tuple:
+    """멘티별 선택 값 → (기준 어휘 multi-hot, 기준 어휘 밖 값 [(멘티, 값)])."""
+    n_base = lut.table.shape[0]
+    hot = np.zeros((len(value_sets), n_base), dtype=bool)
+    extras = []
+    for i, values in enumerate(value_sets):
+        for v in values:
+            code = lut.codes.get(v)
+            if code is not None and code < n_base:
+                hot[i, code] = True
+            elif v:
+                extras.append((i, v))
+    return hot, extras
+
+
+def _lut_column_scores(lut: LookupTable, hot: np.ndarray, extras: list, code: int) -> np.ndarray:
+    """멘토 값 코드 1개에 대한 멘티별 max 규칙 점수 — LookupTable.scores를 멘티 방향으로."""
+    col = lut.table[:, code].astype(np.int64)
+    out = np.where(hot, col[None, :], 0).max(axis=1) if hot.shape[1] else np.zeros(len(hot), dtype=np.int64)
+    if extras and code != lut.empty_code:
+        mentor_value = lut.vocab[code]
+        for i, v in extras:
+            out[i] = max(out[i], lut.rule(v, mentor_value))
+    return out
+
+
+class MenteeIndex:
+    """등록 멘티 목록을 멘토 1명 기준 일괄 계산용 배열로 보관. 멘티가 바뀌면 새로 만든다."""
+
+    def __init__(self, mentees: List[Dict], engine: MentorMatrix):
+        self.n = len(mentees)
+        self.names = np.array([m.get("name", "") for m in mentees], dtype=object)
+        self.facets = {key: FacetMatrix([m.get(key, set()) for m in mentees]) for key, _, _ in FACETS}
+        # 소통 비트마스크: 어휘 밖 토큰이 있는 멘티는 MentorMatrix와 같이 집합 방식으로
+        masks = [{key: _mask(m.get(key, set()), vocab) for key, _, vocab in AvailabilityMasks.FIELDS}
+                 for m in mentees]
+        self.mask_ok = np.array([not any(e for _, e in mk.values()) for mk in masks], dtype=bool)
+        self.grid = np.array([int(grid_mask(mk["days"][0], mk["time_slots"][0])) for mk in masks],
+                             dtype=np.uint32)
+        # 멘티→멘토 적합도/스타일: 멘토 조회표의 기준 어휘(행) 쪽으로 인코딩
+        self.major_hot, self.major_extra = _wanted_hot(engine.major_lut, [m.get("wanted_majors", set()) for m in mentees])
+        self.age_hot, self.age_extra = _wanted_hot(engine.age_lut, [m.get("wanted_mentor_ages", set()) for m in mentees])
+        styles = [(m.get("style") or "").strip() for m in mentees]
+        self.style_hot, self.style_extra = _wanted_hot(engine.style_lut, [{s} if s else set() for s in styles])
+        # 멘토→멘티 적합도: 멘티 나이대를 조회표 열 코드로
+        ages = [(m.get("age_band") or "").strip() for m in mentees]
+        self.age_lut = age_table(ages)
+        self.age_codes = self.age_lut.encode([age_band_normalize(a) if a else "" for a in ages])
+        # note TF-IDF (멘토 소개글 코퍼스에 적합된 vectorizer 재사용)
+        notes = [(m.get("note", "") or "").strip() for m in mentees]
+        self.has_note = np.array([bool(t) for t in notes], dtype=bool)
+        self.notes = None
+        if engine.text.vectorizer is not None and self.has_note.any():
+            self.notes = engine.text.vectorizer.transform(notes).tocsr()
+
+
+class ReciprocalScorer:
+    """멘토 엔진 + 등록 멘티 인덱스 → 멘토별 멘티 상호 적합도."""
+
+    def __init__(self, engine: MentorMatrix, mentees: List[Dict],
+                 mentor_prefs: Optional[List[Set[str]]] = None):
+        self.engine = engine
+        self.mentees = MenteeIndex(mentees, engine)
+        self.mentor_prefs = mentor_prefs
+        self._inv = {col: np.array(sorted(fm.vocab, key=fm.vocab.get), dtype=object)
+                     for col, fm in engine.facets.items()}
+
+    @classmethod
+    def from_frames(cls, engine: MentorMatrix, mentors_df: pd.DataFrame, mentees: List[Dict]) -> "ReciprocalScorer":
+        """멘토 CSV에 wanted_mentee_ages 컬럼이 있으면 멘토 쪽 선호로 사용."""
+        prefs = None
+        if MENTOR_PREF_COLUMN in mentors_df.columns:
+            prefs = [list_to_set(c) for c in mentors_df[MENTOR_PREF_COLUMN].tolist()]
+        return cls(engine, mentees, prefs)
+
+    def _mentor_set(self, col: str, j: int) -> Set[str]:
+        return set(self._inv[col][np.flatnonzero(self.engine.facets[col].matrix[j])])
+
+    def _jaccard(self, key: str, j: int) -> np.ndarray:
+        col = next(c for k, c, _ in FACETS if k == key)
+        return self.mentees.facets[key].overlap(self._mentor_set(col, j))
+
+    def _comm(self, j: int) -> np.ndarray:
+        mi, w = self.mentees, DEFAULT_WEIGHTS
+        j_modes, j_time, j_days = (self._jaccard(k, j) for k in _COMM_KEYS)
+        w_time = np.full(mi.n, float(w["time_slots"]))
+        w_days = np.full(mi.n, float(w["days"]))
+        if self.engine.availability == "grid":
+            j_grid = _mask_jaccard(int(self.engine.avail.grid[j]), 0, mi.grid, np.zeros(mi.n, dtype=np.int64))
+            ok = mi.mask_ok
+            j_time = np.where(ok, j_grid, j_time)
+            j_days = np.where(ok, 0.0, j_days)
+            w_time[ok] += w["days"]
+            w_days[ok] = 0
+        return np.rint(j_modes * w["comm_modes"] + j_time * w_time + j_days * w_days).astype(np.int64)
+
+    def _text(self, j: int) -> np.ndarray:
+        out = np.zeros(self.mentees.n, dtype=np.float64)
+        if self.mentees.notes is None:
+            return out
+        sim = (self.mentees.notes @ self.engine.text.matrix[j].T).toarray().ravel()
+        out[self.mentees.has_note] = np.clip(sim[self.mentees.has_note], 0.0, 1.0)
+        return out
+
+    def _symmetric(self, j: int) -> Dict[str, np.ndarray]:
+        """방향과 무관한 컴포넌트(목적·주제, 소통, 관심사, 텍스트, 스타일)."""
+        w, eng, mi = DEFAULT_WEIGHTS, self.engine, self.mentees
+        return {
+            "목적·주제": np.rint(self._jaccard("purpose", j) * w["purpose"]
+                             + self._jaccard("topics", j) * w["topics"]).astype(np.int64),
+            "소통 선호": self._comm(j),
+            "관심사/성향": np.rint(self._jaccard("interests", j) * w["interests"]).astype(np.int64),
+            "텍스트": np.rint(self._text(j) * w["text"]).astype(np.int64),
+            "스타일": _lut_column_scores(eng.style_lut, mi.style_hot, mi.style_extra, int(eng.style_codes[j])),
+        }
+
+    @staticmethod
+    def _with_total(comps: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        comps["total"] = np.clip(sum(comps[c] for c in COMPONENTS), *DEFAULT_CLIP)
+        return comps
+
+    def forward(self, j: int) -> Dict[str, np.ndarray]:
+        """멘티→멘토 점수(compute_score(멘티 i, 멘토 j)) — 컴포넌트별 멘티 배열 + "total"."""
+        eng, mi = self.engine, self.mentees
+        comps = self._symmetric(j)
+        comps["멘토 적합도"] = (_lut_column_scores(eng.major_lut, mi.major_hot, mi.major_extra, int(eng.major_codes[j]))
+                            + _lut_column_scores(eng.age_lut, mi.age_hot, mi.age_extra, int(eng.age_codes[j])))
+        return self._with_total(comps)
+
+    def backward(self, j: int, symmetric: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """멘토→멘티 점수 — 적합도 자리에 멘토의 희망 멘티 나이대 점수(선호가 없으면 나머지로 환산)."""
+        comps = dict(symmetric if symmetric is not None else self._symmetric(j))
+        if self.mentor_prefs is not None and self.mentor_prefs[j]:
+            table = self.mentees.age_lut.scores(self.mentor_prefs[j])
+            comps["멘토 적합도"] = table[self.mentees.age_codes] * BACKWARD_FIT_SCALE
+            return self._with_total(comps)
+        comps["멘토 적합도"] = np.zeros(self.mentees.n, dtype=np.int64)
+        hi = DEFAULT_CLIP[1]
+        rest = sum(comps[c] for c in COMPONENTS)
+        comps["total"] = np.clip(np.rint(rest * hi / (hi - BACKWARD_FIT_MAX)).astype(np.int64), *DEFAULT_CLIP)
+        return comps
+
+    def mutual(self, j: int) -> tuple:
+        """(조화 평균 상호 점수, forward 결과, backward 결과)."""
+        fwd = self.forward(j)
+        bwd = self.backward(j, {c: fwd[c] for c in COMPONENTS if c != "멘토 적합도"})
+        a, b = fwd["total"].astype(np.float64), bwd["total"].astype(np.float64)
+        s = a + b
+        h = np.zeros(len(a), dtype=np.float64)
+        np.divide(2 * a * b, s, out=h, where=s > 0)
+        return h, fwd, bwd
+
+    def mutual_block(self, mentor_positions) -> np.ndarray:
+        """(멘토 len × 멘티) 상호 점수 행렬."""
+        return np.stack([self.mutual(int(j))[0] for j in mentor_positions]) if len(mentor_positions) \
+            else np.zeros((0, self.mentees.n))
+
+    def entry(self, i: int, h: np.ndarray, fwd: Dict[str, np.ndarray], bwd: Dict[str, np.ndarray]) -> Dict:
+        """mutual() 결과에서 멘티 i의 랭킹 항목 dict."""
+        return {"pos": int(i), "name": self.mentees.names[i], "mutual": float(h[i]),
+                "forward": int(fwd["total"][i]), "backward": int(bwd["total"][i]),
+                "breakdown": {c: int(fwd[c][i]) for c in COMPONENTS},
+                "mentor_fit": int(bwd["멘토 적합도"][i])}
+
+    def rank_mentees(self, j: int, k: int = DEFAULT_TOP_K) -> List[Dict]:
+        """멘토 j에게 잘 맞는 멘티 상위 k명 (상호 점수 내림차순, 동점은 등록 순)."""
+        h, fwd, bwd = self.mutual(j)
+        return [self.entry(i, h, fwd, bwd) for i in top_k(h, k)]
@@ -0,0 +1,96 @@
+# result_cache.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 추천 결과 캐시 — 멘티 설문 지문(fingerprint) 기반 LRU(+선택 TTL)
+
+핵심
+- 지문: 점수에 쓰이는 설문 항목만 정규화(집합은 정렬, note는 공백/대소문자 정리)
+  + 데이터 세트 버전 + 엔진 설정을 sha1로 요약 → 기본값 그대로 제출하는 방문자는 캐시 적중
+- 프로세스 전체에서 공유(st.cache_resource), 세션 스레드 동시 접근을 위해 Lock 사용
+- 적중/미스/축출 카운터는 관리자 모드(?admin=1)에서 표시
+- 레지스트리에서 축출된 데이터 세트 버전의 결과는 discard(version)로 비움
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+SCORED_SET_KEYS = [
+    "purpose", "topics", "comm_modes", "time_slots", "days", "interests",
+    "wanted_majors", "wanted_mentor_ages",
+]
+
+
+def normalize_note(note: str) -> str:
+    """한 줄 요청사항 정규화 — 공백 정리 + 소문자(TF-IDF가 어차피 소문자화)."""
+    return " ".join((note or "").split()).lower()
+
+
+def mentee_fingerprint(mentee: Dict, version: str, *config) -> str:
+    """점수에 영향을 주는 입력만 모아 만든 정규형 해시."""
+    canon = {k: sorted(mentee.get(k, ())) for k in SCORED_SET_KEYS}
+    canon["style"] = (mentee.get("style") or "").strip()
+    canon["note"] = normalize_note(mentee.get("note", ""))
+    canon["_version"] = version
+    canon["_config"] = [str(c) for c in config]
+    raw = json.dumps(canon, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """크기 제한 LRU 캐시(선택 TTL, 초). 값은 (데이터 세트 버전, 결과)로 보관."""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and self.ttl is not None and time.monotonic() - item[0] > self.ttl:
+                del self._data[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[2]
+
+    def put(self, key: str, value: Any, version: str = "") -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), version, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: str, compute, version: str = "") -> Any:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value, version)
+        return value
+
+    def discard(self, version: str) -> int:
+        """해당 데이터 세트 버전의 결과만 지움(축출된 버전 정리). 지운 개수 반환."""
+        with self._lock:
+            drop = [k for k, (_, v, _) in self._data.items() if v == version]
+            for k in drop:
+                del self._data[k]
+            return len(drop)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"size": len(self._data), "max_entries": self.max_entries, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions,
+                    "hit_rate": (self.hits / total) if total else 0.0}
@@ -0,0 +1,154 @@
+# sharded_scoring.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 멀티코어 샤딩 점수 계산 — 공유 메모리 멘토 행렬 + 상주 프로세스 풀
+
+핵심
+- MentorMatrix.shared_state()의 숫자 배열(항목 multi-hot, 비트마스크, 코드, TF-IDF CSR)을
+  multiprocessing.shared_memory에 한 번 올림 → 요청마다 pickle 없음(멘티 dict만 전송)
+- 워커는 시작 시 1회 공유 메모리에 붙어 점수 계산 전용 엔진을 복원
+- 요청 1건 = 멘토 풀을 워커 수만큼 구간(shard)으로 나눠 각자 local top-k → 병합
+- min_rows 미만 풀은 프로세스 풀을 띄우지 않고 기존 in-process 계산(rank_mentors)
+- 풀/공유 메모리 해제는 close() 또는 weakref 파이널라이저(객체가 사라지거나 종료 시) — 앱은 ScorerSlot으로
+  키(데이터 세트 버전·설정)당 1개만 두고 키가 바뀌면 이전 것을 바로 close()
+"""
+
+import multiprocessing as mp
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from matching import MentorMatrix
+from ranking import CHUNK_SIZE, DEFAULT_TOP_K, _merge, _winners, rank_mentors, top_k
+
+SHARDED_MIN_ROWS = 100_000
+
+# 워커 프로세스 전역: 공유 메모리에서 복원한 엔진과 세그먼트 핸들
+_WORKER_ENGINE: Optional[MentorMatrix] = None
+_WORKER_SEGMENTS: List[SharedMemory] = []
+
+
+class SharedArrays:
+    """numpy 배열 묶음을 공유 메모리 세그먼트로 복사해 두고 (이름, shape, dtype) 명세를 제공."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.segments: Dict[str, SharedMemory] = {}
+        self.specs: Dict[str, tuple] = {}
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = SharedMemory(create=True, size=max(1, arr.nbytes))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self.segments[key] = shm
+            self.specs[key] = (shm.name, arr.shape, arr.dtype.str)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(shm.size for shm in self.segments.values())
+
+    def close(self) -> None:
+        for shm in self.segments.values():
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self.segments.clear()
+
+
+def _attach(specs: Dict[str, tuple], meta: Dict) -> None:
+    """워커 initializer: 공유 메모리에 붙어 엔진 복원."""
+    global _WORKER_ENGINE
+    arrays = {}
+    for key, (name, shape, dtype) in specs.items():
+        # spawn 워커는 부모의 resource_tracker를 공유 → 등록이 중복될 뿐, 해제는 부모 close()가 담당
+        shm = SharedMemory(name=name)
+        _WORKER_SEGMENTS.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    _WORKER_ENGINE = MentorMatrix.from_shared_state(arrays, meta)
+
+
+def _shutdown(pool: ProcessPoolExecutor, shared: SharedArrays) -> None:
+    """ShardedScorer 자원 해제(파이널라이저 — scorer 자신을 참조하지 않음)."""
+    pool.shutdown(wait=False, cancel_futures=True)
+    shared.close()
+
+
+def _score_shard(args) -> Tuple[np.ndarray, np.ndarray]:
+    """[start, stop) 구간의 local top-k (총점, 전역 위치)."""
+    mentee, start, stop, k = args
+    best_tot = np.zeros(0, dtype=np.int64)
+    best_pos = np.zeros(0, dtype=np.int64)
+    for a in range(start, stop, CHUNK_SIZE):
+        b = min(a + CHUNK_SIZE, stop)
+        totals = _WORKER_ENGINE.score_all(mentee, rows=slice(a, b))["total"]
+        best_tot, best_pos = _merge(best_tot, best_pos, totals, a, k)
+    return best_tot, best_pos
+
+
+class ShardedScorer:
+    """데이터 세트 1개에 대한 상주 샤딩 점수 계산기. 사용이 끝나면 close()."""
+
+    def __init__(self, engine: MentorMatrix, workers: Optional[int] = None,
+                 min_rows: int = SHARDED_MIN_ROWS):
+        self.engine = engine
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.min_rows = min_rows
+        self._shared: Optional[SharedArrays] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._finalizer: Optional[weakref.finalize] = None
+        if engine.n >= min_rows and self.workers > 1:
+            arrays, meta = engine.shared_state()
+            self._shared = SharedArrays(arrays)
+            # Streamlit 서버 스레드에서 fork하지 않도록 spawn 사용
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"),
+                                             initializer=_attach, initargs=(self._shared.specs, meta))
+            self._finalizer = weakref.finalize(self, _shutdown, self._pool, self._shared)
+
+    @property
+    def active(self) -> bool:
+        return self._pool is not None
+
+    @property
+    def shared_bytes(self) -> int:
+        return self._shared.nbytes if self._shared is not None else 0
+
+    def rank(self, mentee: Dict, k: int = DEFAULT_TOP_K) -> Tuple[List[Dict], int]:
+        """rank_mentors와 같은 결과(및 점수를 매긴 멘토 수)."""
+        if self._pool is None:
+            return rank_mentors(self.engine, mentee, k), self.engine.n
+        bounds = np.linspace(0, self.engine.n, self.workers + 1).astype(int)
+        futures = [self._pool.submit(_score_shard, (mentee, int(a), int(b), k))
+                   for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+        parts = [f.result() for f in futures]
+        tot = np.concatenate([t for t, _ in parts])
+        pos = np.concatenate([p for _, p in parts])
+        best = pos[top_k(tot, k, pos)]
+        return _winners(self.engine, mentee, best), self.engine.n
+
+    def close(self) -> None:
+        if self._finalizer is not None:
+            self._finalizer()  # 한 번만 실행(이후 호출·종료 시에는 아무것도 안 함)
+        self._pool = None
+        self._shared = None
+
+
+class ScorerSlot:
+    """ShardedScorer 1개 보관 — 키가 바뀌면 이전 것을 close()하고 새로 만든다(프로세스 풀/공유 메모리 누수 방지)."""
+
+    def __init__(self):
+        self.key: Optional[Hashable] = None
+        self.scorer: Optional[ShardedScorer] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], ShardedScorer]) -> ShardedScorer:
+        with self._lock:
+            if self.scorer is None or key != self.key:
+                if self.scorer is not None:
+                    self.scorer.close()
+                self.scorer, self.key = build(), key
+            return self.scorer
@@ -0,0 +1,335 @@
+# similar_mentors.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 비슷한 멘토 — 멘토 프로필 k-최근접 이웃 그래프를 미리 계산해 CSR로 보관
+
+핵심
+- 멘토 간 유사도 = 항목(FACETS) Jaccard와 소개글 코사인의 가중 평균(가중치는 점수 가중치와 같은 비율, 0~1)
+  (멘토 블록 × 전체 멘토 multi-hot 행렬 곱 + 희소 텍스트 행렬 곱, 블록 크기로 메모리 제한)
+- 멘토마다 자기 자신을 뺀 상위 k명만 남긴 희소 그래프: indptr/indices/data 배열을
+  멘토 CSV 옆 "<이름>.neighbors.npz"에 저장 → 조회는 indptr 두 칸으로 자르는 상수 시간
+- 동점은 멘토 위치가 빠른 쪽 우선((양자화 유사도 << 32) | 뒤집은 위치 정수 키, assignment와 같은 방식)
+- 증분 갱신: 행 내용 해시로 이전 그래프와 새 CSV의 행을 짝지어, 바뀐/추가된 멘토 행만 전체와 비교하고
+  나머지 멘토는 기존 이웃 목록에 바뀐 멘토 후보만 합쳐 다시 고름(정확성이 보장되지 않는 행만 다시 계산)
+- 텍스트는 기본 analyzer "hash"(적합 불필요) — 데이터가 바뀌어도 기존 벡터가 그대로 유효해 증분 갱신과 맞음
+- 앱은 그래프 파일만 읽음(버전이 맞을 때만 사용, 페이지 조회 중 유사도 계산 없음) — 저장본이 없으면
+  SIMILAR_MAX_ROWS 이하 데이터만 백그라운드에서 계산(O(n²)), 넘으면 이 CLI로 미리 만들어 두어야 함
+  (GraphJob.close()는 블록 사이에서 계산을 중단)
+
+사용 예
+    python similar_mentors.py 멘토더미.csv -k 5
+    python similar_mentors.py 멘토더미.csv -k 5 --refresh   # 바뀐 행만 다시 계산
+"""
+
+import argparse
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from matching import DEFAULT_WEIGHTS, FACETS, MentorMatrix, dataset_version
+
+SIMILAR_K = 5
+GRAPH_SUFFIX = ".neighbors.npz"
+SIMILARITY_WEIGHTS = {**{col: DEFAULT_WEIGHTS[key] for key, col, _ in FACETS}, "intro": DEFAULT_WEIGHTS["text"]}
+SIMILAR_MAX_ROWS = 20_000  # 앱 프로세스 안에서 계산할 최대 멘토 수(넘으면 오프라인 CLI)
+BLOCK_CELLS = 1 << 23  # 유사도 블록(행 × 전체 멘토) 최대 칸 수
+_SIM_SCALE = 1 << 20  # 유사도 양자화(정수 키) 단위 — float32로 정확히 표현됨
+_POS_MASK = (1 << 32) - 1
+
+
+def similarity_block(engine: MentorMatrix, rows: np.ndarray) -> np.ndarray:
+    """(len(rows) × 전체 멘토) 프로필 유사도(float32). 양쪽 모두 빈 항목은 0(ratio_overlap과 같음).
+
+    블록이 커서 임시 배열을 만들지 않도록 float32 제자리 연산만 쓴다.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    total_w = float(sum(SIMILARITY_WEIGHTS.values()))
+    out = np.zeros((len(rows), engine.n), dtype=np.float32)
+    for col, w in SIMILARITY_WEIGHTS.items():
+        if col == "intro":
+            tm = engine.text.matrix
+            if tm is not None and tm.shape[1]:
+                cos = (tm[rows] @ tm.T).toarray().astype(np.float32)
+                np.clip(cos, 0.0, 1.0, out=cos)
+                cos *= np.float32(w / total_w)
+                out += cos
+            continue
+        fm = engine.facets[col]
+        if not fm.matrix.shape[1]:
+            continue
+        inter = fm.matrix[rows].astype(np.float32) @ fm.matrix.T.astype(np.float32)
+        union = np.add.outer(fm.sizes[rows].astype(np.float32), fm.sizes.astype(np.float32))
+        union -= inter
+        np.divide(inter, union, out=inter, where=union > 0)
+        inter *= np.float32(w / total_w)
+        out += inter
+    return out
+
+
+class _Stopped(Exception):
+    """GraphJob.close()로 계산이 중단됨."""
+
+
+def _keys(sim: np.ndarray, rows: np.ndarray, cols: Optional[np.ndarray] = None) -> np.ndarray:
+    """유사도 → (양자화 유사도 << 32) | (뒤집은 열 위치) 정수 키. 자기 자신은 -1."""
+    cols = np.arange(sim.shape[1], dtype=np.int64) if cols is None else cols
+    q = np.rint(sim * _SIM_SCALE).astype(np.int64)
+    keys = (q << 32) | (_POS_MASK - cols)[None, :]
+    keys[cols[None, :] == rows[:, None]] = -1
+    return keys
+
+
+def _top_keys(keys: np.ndarray, k: int) -> np.ndarray:
+    """행별 상위 k개 키(내림차순)."""
+    if keys.shape[1] > k:
+        keys = np.take_along_axis(keys, np.argpartition(-keys, k - 1, axis=1)[:, :k], axis=1)
+    return -np.sort(-keys, axis=1)
+
+
+def _block_rows(n: int) -> int:
+    return max(1, BLOCK_CELLS // max(1, n))
+
+
+def _neighbor_keys(engine: MentorMatrix, rows: np.ndarray, k: int,
+                   stop: Optional[threading.Event] = None) -> np.ndarray:
+    """rows 멘토별 상위 k 이웃 키 (len(rows) × k). stop이 켜지면 다음 블록 전에 _Stopped."""
+    out = np.zeros((len(rows), k), dtype=np.int64)
+    step = _block_rows(engine.n)
+    for start in range(0, len(rows), step):
+        if stop is not None and stop.is_set():
+            raise _Stopped()
+        block = rows[start:start + step]
+        out[start:start + step] = _top_keys(_keys(similarity_block(engine, block), block), k)
+    return out
+
+
+def _to_graph(keys: np.ndarray, n: int) -> csr_matrix:
+    m, k = keys.shape
+    indptr = np.arange(m + 1, dtype=np.int64) * k
+    indices = (_POS_MASK - (keys & _POS_MASK)).ravel().astype(np.int32)
+    data = ((keys >> 32).ravel() / _SIM_SCALE).astype(np.float32)
+    return csr_matrix((data, indices, indptr), shape=(m, n))
+
+
+def _from_graph(graph: csr_matrix) -> np.ndarray:
+    """그래프 → 행별 키 (n × k). 모든 행의 이웃 수는 같다(k = min(요청 k, n - 1))."""
+    n = graph.shape[0]
+    k = graph.nnz // n if n else 0
+    q = np.rint(graph.data.astype(np.float64) * _SIM_SCALE).astype(np.int64)
+    return ((q << 32) | (_POS_MASK - graph.indices.astype(np.int64))).reshape(n, k)
+
+
+def neighbor_graph(engine: MentorMatrix, k: int = SIMILAR_K, stop: Optional[threading.Event] = None) -> csr_matrix:
+    """멘토 × 멘토 k-NN 그래프(CSR, 값 = 유사도, 행마다 유사도 내림차순)."""
+    k = max(0, min(k, engine.n - 1))
+    return _to_graph(_neighbor_keys(engine, np.arange(engine.n), k, stop), engine.n)
+
+
+def refresh_graph(graph: csr_matrix, engine: MentorMatrix, changed: np.ndarray,
+                  old_to_new: Optional[np.ndarray] = None, k: int = SIMILAR_K) -> tuple:
+    """바뀐 멘토만 다시 비교해 그래프 갱신. (새 그래프, 전체를 다시 계산한 행 수)를 반환.
+
+    changed: 새 엔진에서 내용이 바뀌었거나 새로 추가된 멘토 위치
+    old_to_new: 이전 그래프 위치 → 새 위치(삭제된 멘토는 -1, 생략하면 위치 그대로)
+    """
+    n = engine.n
+    k = max(0, min(k, n - 1))
+    changed = np.unique(np.asarray(changed, dtype=np.int64))
+    old_keys = _from_graph(graph)
+    if old_to_new is None:
+        old_to_new = np.arange(graph.shape[0], dtype=np.int64)
+    old_to_new = np.asarray(old_to_new, dtype=np.int64)
+    kept_new = old_to_new[old_to_new >= 0]
+    if k == 0 or old_keys.shape[1] != k or np.any(np.diff(kept_new) <= 0):
+        # 이웃 수가 달라지거나(멘토 수가 k 근처에서 변동) 남은 행 순서가 바뀌면(동점 순서가 달라짐) 전체 재계산
+        return neighbor_graph(engine, k), n
+
+    # 이전 행을 새 위치로 옮기고, 삭제/변경된 멘토를 가리키는 이웃은 뺀다
+    keys = np.full((n, k), -1, dtype=np.int64)
+    kth = np.full(n, -1, dtype=np.int64)
+    kept = old_to_new >= 0
+    old_pos = _POS_MASK - (old_keys[kept] & _POS_MASK)
+    new_pos = old_to_new[old_pos]
+    stale = np.zeros(n, dtype=bool)
+    stale[changed] = True
+    valid = (new_pos >= 0) & ~stale[np.maximum(new_pos, 0)]
+    remapped = np.where(valid, ((old_keys[kept] >> 32) << 32) | (_POS_MASK - np.maximum(new_pos, 0)), -1)
+    keys[old_to_new[kept]] = remapped
+    kth[old_to_new[kept]] = old_keys[kept][:, -1] >> 32
+    lost = (keys < 0).sum(axis=1)
+    fresh = np.ones(n, dtype=bool)
+    fresh[old_to_new[kept]] = False
+    fresh[changed] = True
+
+    # 바뀐 멘토 ↔ 전체 유사도(대칭)로 나머지 행 후보 보충
+    cand = np.zeros((n, 0), dtype=np.int64)
+    if len(changed):
+        sim = np.zeros((n, len(changed)), dtype=np.float64)
+        step = _block_rows(n)
+        for start in range(0, len(changed), step):
+            block = changed[start:start + step]
+            sim[:, start:start + step] = similarity_block(engine, block).T
+        cand = _keys(sim, np.arange(n), changed)
+    merged = _top_keys(np.hstack([keys, cand]), k)
+    # 잃은 이웃이 있는데 새 k등 유사도가 이전 k등보다 높지 않으면, 이전 k등 아래의 모르는 멘토가 들어올 수 있음
+    redo = fresh | ((lost > 0) & ((merged[:, -1] >> 32) <= kth))
+    redo_rows = np.flatnonzero(redo)
+    if len(redo_rows):
+        merged[redo_rows] = _neighbor_keys(engine, redo_rows, k)
+    return _to_graph(merged, n), len(redo_rows)
+
+
+def similar(graph: csr_matrix, pos: int) -> tuple:
+    """멘토 pos의 이웃 (위치 배열, 유사도 배열) — indptr 슬라이스."""
+    a, b = graph.indptr[pos], graph.indptr[pos + 1]
+    return graph.indices[a:b], graph.data[a:b]
+
+
+# ---------- 저장/로드 (멘토 CSV 옆 .npz) ----------
+def graph_path(mentor_csv) -> Path:
+    p = Path(mentor_csv)
+    return p.with_name(p.stem + GRAPH_SUFFIX)
+
+
+def row_hashes(mentors_df: pd.DataFrame) -> np.ndarray:
+    """행 내용 해시(행 라벨 제외) — 증분 갱신 시 이전/새 행 짝짓기용."""
+    return pd.util.hash_pandas_object(mentors_df, index=False).to_numpy(dtype=np.uint64)
+
+
+def save_graph(path, graph: csr_matrix, mentors_df: pd.DataFrame, text_analyzer: str) -> None:
+    np.savez(path, indptr=graph.indptr, indices=graph.indices, data=graph.data,
+             shape=np.array(graph.shape), version=np.array(dataset_version(mentors_df)),
+             row_hashes=row_hashes(mentors_df), text_analyzer=np.array(text_analyzer))
+
+
+def load_graph(path, version: Optional[str] = None) -> Optional[Dict]:
+    """저장된 그래프 {"graph", "version", "row_hashes", "text_analyzer"}. 없거나 버전이 다르면 None."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with np.load(path) as z:
+        if version is not None and str(z["version"]) != version:
+            return None
+        graph = csr_matrix((z["data"], z["indices"], z["indptr"]), shape=tuple(z["shape"]))
+        return {"graph": graph, "version": str(z["version"]), "row_hashes": z["row_hashes"],
+                "text_analyzer": str(z["text_analyzer"])}
+
+
+def match_rows(old_hashes: np.ndarray, new_hashes: np.ndarray) -> tuple:
+    """(이전 위치 → 새 위치 배열(-1 = 삭제), 바뀌었거나 새로 생긴 새 위치 배열).
+
+    같은 내용 행은 앞에서부터 짝짓고, 순서가 뒤바뀐 짝은 버린다(남은 행 순서 = 동점 순서 유지).
+    """
+    free: Dict[int, List[int]] = {}
+    for i, h in enumerate(old_hashes.tolist()):
+        free.setdefault(h, []).append(i)
+    old_to_new = np.full(len(old_hashes), -1, dtype=np.int64)
+    for j, h in enumerate(new_hashes.tolist()):
+        q = free.get(h)
+        if q:
+            old_to_new[q.pop(0)] = j
+    last = -1
+    for i, j in enumerate(old_to_new.tolist()):
+        if j < 0:
+            continue
+        if j < last:
+            old_to_new[i] = -1
+        else:
+            last = j
+    matched = np.zeros(len(new_hashes), dtype=bool)
+    matched[old_to_new[old_to_new >= 0]] = True
+    return old_to_new, np.flatnonzero(~matched)
+
+
+class GraphJob:
+    """앱용 백그라운드 작업: 저장된 그래프가 현재 데이터 세트와 맞으면 읽고, 아니면 스레드에서 계산.
+
+    계산이 끝나기 전에는 graph가 None → 화면은 "비슷한 멘토"를 생략(요청 처리 중 계산 없음).
+    status: "running" → "done" / "too_large"(저장본 없음 + max_rows 초과 → 오프라인 CLI 필요) / "stopped"(close)
+    engine이 None이면(업로드 데이터) 필요할 때 이 스레드에서 text_analyzer로 엔진을 만든다.
+    """
+
+    def __init__(self, engine: Optional[MentorMatrix], mentors_df: pd.DataFrame, path=None, k: int = SIMILAR_K,
+                 max_rows: int = SIMILAR_MAX_ROWS, text_analyzer: str = "hash"):
+        self.graph: Optional[csr_matrix] = None
+        self.status = "running"
+        self.max_rows = max_rows
+        self.text_analyzer = text_analyzer
+        self._engine, self._df, self._path, self._k = engine, mentors_df, path, k
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="similar-mentors", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            saved = load_graph(self._path, dataset_version(self._df)) if self._path else None
+            if saved is not None and saved["graph"].shape[0] == len(self._df):
+                self.graph, self.status = saved["graph"], "done"
+                return
+            if len(self._df) > self.max_rows:
+                self.status = "too_large"
+                return
+            engine = self._engine or MentorMatrix(self._df, text_analyzer=self.text_analyzer)
+            graph = neighbor_graph(engine, self._k, stop=self._stop)
+            if self._path:
+                try:
+                    save_graph(self._path, graph, self._df, engine.text.analyzer)
+                except OSError:
+                    pass
+            self.graph, self.status = graph, "done"
+        except _Stopped:
+            self.status = "stopped"
+        finally:
+            self._engine = self._df = None  # 끝나면(중단 포함) 엔진/프레임 참조를 놓음
+
+    def close(self) -> None:
+        """계산 중단 요청(다음 블록 전에 멈춤, 기다리지 않음)."""
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._thread.join(timeout)
+
+    def similar(self, pos: int) -> tuple:
+        """(위치 배열, 유사도 배열). 아직 준비 전이면 빈 배열."""
+        if self.graph is None:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        return similar(self.graph, pos)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from batch_match import read_csv_any
+
+    ap = argparse.ArgumentParser(description="결 비슷한 멘토 k-NN 그래프 생성/갱신")
+    ap.add_argument("mentors", help="멘토 CSV")
+    ap.add_argument("-o", "--output", default=None, help=f"그래프 파일(기본: CSV 옆 *{GRAPH_SUFFIX})")
+    ap.add_argument("-k", type=int, default=SIMILAR_K, help="멘토별 이웃 수")
+    ap.add_argument("--text-analyzer", choices=["hash", "word", "char"], default="hash")
+    ap.add_argument("--refresh", action="store_true", help="기존 그래프에서 바뀐 행만 다시 계산")
+    args = ap.parse_args(argv)
+
+    df = read_csv_any(args.mentors)
+    out = Path(args.output) if args.output else graph_path(args.mentors)
+    t0 = time.perf_counter()
+    engine = MentorMatrix(df, text_analyzer=args.text_analyzer)
+    saved = load_graph(out) if args.refresh else None
+    if saved is not None and saved["text_analyzer"] == args.text_analyzer == "hash":
+        old_to_new, changed = match_rows(saved["row_hashes"], row_hashes(df))
+        graph, redone = refresh_graph(saved["graph"], engine, changed, old_to_new, args.k)
+        how = f"증분 갱신: 바뀐/추가 {len(changed)}행, 삭제 {int((old_to_new < 0).sum())}행, 전체 재계산 {redone}행"
+    else:
+        if args.refresh:
+            print("증분 갱신 불가(기존 그래프 없음 또는 TF-IDF 텍스트) → 전체 계산")
+        graph = neighbor_graph(engine, args.k)
+        how = "전체 계산"
+    save_graph(out, graph, df, args.text_analyzer)
+    print(f"멘토 {engine.n}명 · 이웃 {graph.nnz // max(1, engine.n)}명 · {how} · "
+          f"{time.perf_counter() - t0:.1f}s · 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
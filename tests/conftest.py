@@ -0,0 +1,68 @@
+# tests/conftest.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 엔진 동치성 테스트 공용 — 시드 고정 무작위 멘토 테이블/멘티 설문
+
+핵심
+- 최적화 경로(역색인·샤딩·시간 예산·청크 수집·전체 배정)를 기준 구현(rank_mentors / compute_score)과 비교
+- 멘토 값에는 빈 칸/None/어휘 밖 나이대("40대")를 섞어 정규화·빈 값 처리까지 확인
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from matching import (  # noqa: E402
+    AGE_BANDS, COMM_MODES, DAYS, GENDERS, INTERESTS, OCCUPATION_MAJORS, PURPOSES, STYLES, TIME_SLOTS,
+    TOPIC_PREFS,
+)
+
+ALL_INTERESTS = [i for group in INTERESTS.values() for i in group]
+WORDS = "데이터 분석 직무 이직 준비 포트폴리오 피드백 경청 상담 진로 코딩 건강 여행 독서 교사 연구".split()
+
+
+def _some(rng: random.Random, values, k=None):
+    return rng.sample(values, rng.randint(0, k or len(values)))
+
+
+def make_mentors(n: int, seed: int = 0, valid_only: bool = False) -> pd.DataFrame:
+    """무작위 멘토 n명. valid_only면 업로드 검증(mentor_ingest)을 통과하는 값만."""
+    rng = random.Random(seed)
+    ages = AGE_BANDS if valid_only else AGE_BANDS + ["", "40대"]
+    majors = OCCUPATION_MAJORS if valid_only else OCCUPATION_MAJORS + [""]
+    styles = STYLES if valid_only else STYLES + [None]
+    return pd.DataFrame([{
+        "name": f"멘토{i}", "gender": rng.choice(GENDERS), "age_band": rng.choice(ages),
+        "occupation_major": rng.choice(majors), "comm_modes": ", ".join(_some(rng, COMM_MODES)),
+        "comm_time": ", ".join(_some(rng, TIME_SLOTS)), "comm_days": ", ".join(_some(rng, DAYS)),
+        "style": rng.choice(styles), "interests": ", ".join(_some(rng, ALL_INTERESTS, 6)),
+        "purpose": ", ".join(_some(rng, PURPOSES)), "topic_prefs": "; ".join(_some(rng, TOPIC_PREFS, 3)),
+        "intro": " ".join(rng.sample(WORDS, rng.randint(0, 5))) or None,
+    } for i in range(n)])
+
+
+def make_mentee(seed: int) -> dict:
+    rng = random.Random(seed)
+    return {
+        "name": "멘티", "gender": "남", "age_band": rng.choice(AGE_BANDS),
+        "comm_modes": set(_some(rng, COMM_MODES)), "time_slots": set(_some(rng, TIME_SLOTS)),
+        "days": set(_some(rng, DAYS)), "style": rng.choice(STYLES), "interests": set(_some(rng, ALL_INTERESTS, 5)),
+        "purpose": set(_some(rng, PURPOSES)), "topics": set(_some(rng, TOPIC_PREFS)),
+        "wanted_majors": set(_some(rng, OCCUPATION_MAJORS, 3)), "wanted_mentor_ages": set(_some(rng, AGE_BANDS, 2)),
+        "note": " ".join(rng.sample(WORDS, rng.randint(0, 4))),
+    }
+
+
+@pytest.fixture(scope="session")
+def mentors_df() -> pd.DataFrame:
+    return make_mentors(400, seed=7)
+
+
+@pytest.fixture(scope="session")
+def mentees() -> list:
+    return [make_mentee(s) for s in range(25)]
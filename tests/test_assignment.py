@@ -0,0 +1,57 @@
+# tests/test_assignment.py
+# -*- coding: utf-8 -*-
+"""후보 그래프 = 멘티별 rank_mentors 상위 N, 희소 배정 = 조밀 헝가리안(정원만큼 펼친 슬롯) 최적해."""
+
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from assignment import assign, assignment_report, candidate_graph
+from matching import MentorMatrix
+from ranking import rank_mentors
+
+
+def _dense_optimum(engine, mentees, capacity):
+    """(총점 합, 배정 인원) — 전체 M × n 점수를 정원 슬롯으로 펼친 조밀 헝가리안, 동점이면 배정 인원 최대."""
+    M = len(mentees)
+    scores = engine.score_block(mentees)["total"].T.astype(np.float64)  # M × n
+    slots = np.repeat(np.arange(engine.n), capacity)
+    # 배정 1명당 +BONUS: 총점 합을 먼저, 같으면 배정 인원을 최대화(BONUS * M < 1)
+    bonus = 1.0 / (2 * (M + 1))
+    weights = np.full((M, len(slots) + M), -1e9)
+    weights[:, :len(slots)] = scores[:, slots] + bonus
+    weights[np.arange(M), len(slots) + np.arange(M)] = 0.0
+    rows, cols = linear_sum_assignment(weights, maximize=True)
+    real = cols < len(slots)
+    return int(scores[rows[real], slots[cols[real]]].sum()), int(real.sum())
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_assign_matches_dense_hungarian(mentors_df, mentees, seed):
+    rng = np.random.default_rng(seed)
+    frame = mentors_df.sample(12, random_state=seed).reset_index(drop=True)
+    engine = MentorMatrix(frame, text_analyzer="char")
+    capacity = rng.integers(0, 3, size=engine.n)
+    graph = candidate_graph(engine, mentees, n_candidates=engine.n, chunk_size=5)
+    assigned = assign(graph, capacity)
+    report = assignment_report(graph, assigned, capacity)
+    assert report["over_capacity"] == 0
+    assert (report["total"], report["assigned"]) == _dense_optimum(engine, mentees, capacity)
+
+
+def test_candidate_graph_rows_are_top_n(mentors_df, mentees):
+    engine = MentorMatrix(mentors_df, text_analyzer="char")
+    graph = candidate_graph(engine, mentees, n_candidates=7, chunk_size=64)
+    for i, mentee in enumerate(mentees):
+        ranked = rank_mentors(engine, mentee, k=7)
+        row = slice(graph.indptr[i], graph.indptr[i + 1])
+        assert graph.indices[row].tolist() == [r["pos"] for r in ranked]
+        assert graph.data[row].tolist() == [r["total"] for r in ranked]
+
+
+@pytest.mark.parametrize("n_mentors, n_candidates", [(0, 5), (10, 0)])
+def test_empty_graph_leaves_everyone_unassigned(mentors_df, mentees, n_mentors, n_candidates):
+    engine = MentorMatrix(mentors_df.head(n_mentors))
+    graph = candidate_graph(engine, mentees, n_candidates=n_candidates)
+    assert graph.nnz == 0
+    assert (assign(graph, np.ones(engine.n, dtype=np.int64)) == -1).all()
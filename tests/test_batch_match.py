@@ -0,0 +1,34 @@
+# tests/test_batch_match.py
+# -*- coding: utf-8 -*-
+"""배치 매칭 CLI 기본값 = 결 앱(컬럼 정리 + APP_AVAILABILITY): 결과가 앱 엔진의 rank_mentors와 같음."""
+
+import pandas as pd
+
+from batch_match import MENTEE_SET_COLS, MENTEE_STR_COLS, main, mentee_from_row, read_csv_any
+from conftest import make_mentors
+from matching import APP_AVAILABILITY, MentorMatrix
+from ranking import rank_mentors
+
+
+def test_defaults_match_app_engine(tmp_path, mentees):
+    frame = make_mentors(150, seed=12)
+    mentor_csv = tmp_path / "mentors.csv"
+    frame.rename(columns={"style": "communication_style", "name": " name"}).to_csv(mentor_csv, index=False,
+                                                                                encoding="cp949")
+    mentee_csv = tmp_path / "mentees.csv"
+    pd.DataFrame([{**{c: m[c] for c in MENTEE_STR_COLS}, **{c: ", ".join(sorted(m[c])) for c in MENTEE_SET_COLS}}
+                  for m in mentees]).to_csv(mentee_csv, index=False)
+    out = tmp_path / "rec.csv"
+    main([str(mentee_csv), str(mentor_csv), "-o", str(out), "-k", "5", "--workers", "1"])
+
+    cleaned = read_csv_any(str(mentor_csv))
+    assert "style" in cleaned.columns and "name" in cleaned.columns
+    engine = MentorMatrix(cleaned, text_analyzer="char", availability=APP_AVAILABILITY)
+    result = pd.read_csv(out, encoding="utf-8-sig")
+    # 설문 CSV를 거친 멘티와 비교(목적 선택지 '사회, 인생 경험 공유'의 쉼표는 CSV에서 목록 구분자로 나뉨)
+    parsed = [mentee_from_row(r) for r in read_csv_any(str(mentee_csv), dtype=str).to_dict("records")]
+    for i, mentee in enumerate(parsed):
+        got = result[result["mentee_row"] == i]
+        expected = rank_mentors(engine, mentee, k=5)
+        assert got["mentor_row"].tolist() == [r["pos"] for r in expected]
+        assert got["total"].tolist() == [r["total"] for r in expected]
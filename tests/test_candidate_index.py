@@ -0,0 +1,32 @@
+# tests/test_candidate_index.py
+# -*- coding: utf-8 -*-
+"""CandidateIndex(역색인 + 상한 가지치기) = rank_mentors 전수 결과."""
+
+import pytest
+
+from candidate_index import CandidateIndex
+from matching import MentorMatrix
+from ranking import rank_mentors
+
+
+@pytest.mark.parametrize("availability", ["separate", "grid"])
+def test_rank_matches_exhaustive(mentors_df, mentees, availability):
+    engine = MentorMatrix(mentors_df, text_analyzer="char", availability=availability)
+    index = CandidateIndex(engine)
+    for mentee in mentees:
+        ranked, scored = index.rank(mentee, k=5)
+        assert ranked == rank_mentors(engine, mentee, k=5)
+        assert 5 <= scored <= engine.n
+
+
+def test_upper_bounds_dominate_totals(mentors_df, mentees):
+    engine = MentorMatrix(mentors_df, text_analyzer="char")
+    index = CandidateIndex(engine)
+    for mentee in mentees:
+        assert (index.upper_bounds(mentee) >= engine.score_all(mentee)["total"]).all()
+
+
+def test_small_pool_returns_everyone(mentors_df, mentees):
+    engine = MentorMatrix(mentors_df.head(3))
+    ranked, _ = CandidateIndex(engine).rank(mentees[0], k=5)
+    assert ranked == rank_mentors(engine, mentees[0], k=5)
@@ -0,0 +1,101 @@
+# tests/test_dataset_manager.py
+# -*- coding: utf-8 -*-
+"""데이터 세트 교체: 빌려 간 버전은 반납 전까지 유지, 마지막 반납에 해제, 오류 스냅샷은 공개 안 함, 예약 교체."""
+
+import os
+import threading
+
+from conftest import make_mentors
+from dataset_manager import DatasetManager
+from mentor_store import MentorSnapshot, MentorStore
+
+
+def _build(snap):
+    return {"n": len(snap.df)}
+
+
+def _write(path, n, seed, bump_ns=0):
+    make_mentors(n, seed=seed).to_csv(path, index=False)
+    if bump_ns:
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+    return str(path)
+
+
+def _manager(tmp_path, build=_build, background=False):
+    path = _write(tmp_path / "mentors.csv", 30, seed=1)
+    return DatasetManager(MentorStore(path, ["name"]), build, background=background), path
+
+
+def test_swap_keeps_leased_version_until_last_release(tmp_path):
+    manager, _ = _manager(tmp_path)
+    old = manager.acquire()
+    other = manager.acquire()
+    assert old is other and old.refs == 2 and old["n"] == 30
+
+    assert manager.publish(MentorSnapshot(make_mentors(12, seed=2), None), wait=True)
+    new = manager.current
+    assert new is not old and new["n"] == 12 and manager.swaps == 1
+    assert old.retired and old.df is not None and old["n"] == 30  # 빌려 간 요청은 그대로 사용
+    assert manager.stats()["retired"] == [(old.version, 2)]
+
+    manager.release(other)
+    assert old.snapshot is not None and old.refs == 1
+    manager.release(old)
+    assert old.refs == 0 and old.snapshot is None and old.derived == {}
+    assert manager.stats()["retired"] == [] and new.refs == 0
+
+    with manager.lease() as ds:
+        assert ds is new and new.refs == 1
+    assert new.refs == 0 and not new.retired
+
+
+def test_check_swaps_on_file_change_only(tmp_path):
+    manager, path = _manager(tmp_path)
+    first = manager.current
+    assert not manager.check()
+    _write(path, 30, seed=1, bump_ns=10**9)  # 같은 내용 → 교체 없음
+    with manager.lease() as ds:
+        assert ds is first
+    _write(path, 45, seed=3, bump_ns=2 * 10**9)
+    with manager.lease() as ds:
+        assert ds is not first and ds["n"] == 45
+    assert first.snapshot is None and manager.swaps == 1
+
+
+def test_error_snapshots_and_build_failures_keep_current(tmp_path):
+    manager, path = _manager(tmp_path)
+    first = manager.current
+    os.remove(path)
+    manager.check()
+    assert manager.current is first and "찾을 수 없습니다" in manager.last_error
+
+    def broken(snap):
+        raise RuntimeError("boom")
+
+    manager.build = broken
+    assert not manager.publish(MentorSnapshot(make_mentors(5, seed=4), None), wait=True)
+    assert manager.current is first and "boom" in manager.last_error
+
+
+def test_publish_during_rebuild_is_queued_latest_wins(tmp_path):
+    entered, release = threading.Event(), threading.Event()
+    built = []
+
+    def slow(snap):
+        built.append(len(snap.df))
+        if len(built) == 2:  # 첫 로드 다음(= 첫 재구축)에서 멈춤
+            entered.set()
+            release.wait(10)
+        return _build(snap)
+
+    manager, _ = _manager(tmp_path, slow, background=True)
+    manager.publish(MentorSnapshot(make_mentors(10, seed=5), None))
+    assert entered.wait(10)
+    manager.publish(MentorSnapshot(make_mentors(11, seed=6), None))
+    manager.publish(MentorSnapshot(make_mentors(12, seed=7), None))
+    assert manager.stats()["building"]
+    release.set()
+    manager.join(10)
+    assert built == [30, 10, 12] and manager.current["n"] == 12 and manager.swaps == 2
+    assert not manager.stats()["building"]
@@ -0,0 +1,90 @@
+# tests/test_dataset_registry.py
+# -*- coding: utf-8 -*-
+"""버전 레지스트리: 상한 초과 시 고정·활성이 아닌 버전만 LRU로 축출, 파생 구조는 크기에 포함되고 축출 때 닫힘."""
+
+import io
+
+import numpy as np
+
+from conftest import make_mentors
+from dataset_registry import DatasetRegistry, resident_bytes, upload_digest
+
+
+class _Job:
+    def __init__(self, nbytes: int):
+        self.array = np.zeros(nbytes, dtype=np.uint8)
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _frames(count, n=60):
+    return [make_mentors(n, seed=100 + i) for i in range(count)]
+
+
+def test_eviction_skips_pinned_and_active():
+    frames = _frames(5)
+    size = resident_bytes(frames[0])
+    registry = DatasetRegistry(max_bytes=int(size * 3.5))
+    base = registry.add(frames[0], "기본", pinned=True)  # 첫 버전 → 활성 + 고정
+    a, b = registry.add(frames[1], "a"), registry.add(frames[2], "b")
+    registry.activate(b.key)
+    c = registry.add(frames[3], "c")
+    assert registry.pop_evicted() == [a.key]  # 가장 오래 안 쓴(고정·활성 아닌) 버전
+    registry.get(c.key)
+    d = registry.add(frames[4], "d")
+    assert registry.pop_evicted() == [c.key]
+    keys = {e["key"] for e in registry.report()}
+    assert keys == {base.key, b.key, d.key} and registry.active_key == b.key
+
+    # 고정·활성만 남아 상한을 넘어도 그대로 둠
+    registry.max_bytes = 1
+    registry.pin(d.key)
+    assert registry.pop_evicted() == [] and {e["key"] for e in registry.report()} == keys
+
+
+def test_lru_order_follows_use_and_same_content_is_deduplicated():
+    frames = _frames(4)
+    registry = DatasetRegistry(max_bytes=int(resident_bytes(frames[0]) * 3.5))
+    registry.add(frames[0], "기본", pinned=True)
+    a, b = registry.add(frames[1], "a"), registry.add(frames[2], "b")
+    assert registry.add(frames[1].copy(), "a 다시") is a and a.label == "a"  # 같은 내용 → 같은 버전, 사용 갱신
+    registry.add(frames[3], "c")
+    assert registry.pop_evicted() == [b.key] and registry.get(b.key) is None
+
+
+def test_derived_structures_count_and_close_on_eviction():
+    frames = _frames(3)
+    size = resident_bytes(frames[0])
+    registry = DatasetRegistry()
+    registry.add(frames[0], "기본", pinned=True)
+    a, b = registry.add(frames[1], "a"), registry.add(frames[2], "b")
+    registry.max_bytes = registry.resident + int(size * 1.5)  # 파생 구조 하나는 들어가고 둘은 넘침
+
+    job = registry.derive(a, "graph", lambda: _Job(size), tag=1)
+    assert registry.derive(a, "graph", lambda: _Job(size), tag=1) is job and a.peek("graph", 1) is job
+    assert a.nbytes >= a.base_bytes + size and registry.pop_evicted() == []
+    # tag가 바뀌면 다시 만들고 이전 것은 닫음
+    newer = registry.derive(a, "graph", lambda: _Job(size), tag=2)
+    assert job.closed and not newer.closed and a.peek("graph", 1) is None
+
+    # b의 파생 구조가 커져 상한을 넘으면 a가 축출되고 a의 파생 구조는 닫힘
+    registry.derive(b, "engine", lambda: _Job(size * 2))
+    assert registry.pop_evicted() == [a.key]
+    assert newer.closed and a.derived == {} and a.nbytes == a.base_bytes
+    assert registry.resident == sum(e["bytes"] for e in registry.report())
+
+
+def test_upload_is_ingested_once_per_digest(mentors_df):
+    frame = make_mentors(80, seed=8, valid_only=True)
+    raw = frame.to_csv(index=False).encode("utf-8")
+    digest = upload_digest(io.BytesIO(raw))
+    registry = DatasetRegistry()
+    registry.add(mentors_df, "기본", pinned=True)
+    entry, job = registry.upload(digest, io.BytesIO(raw), "up.csv")
+    job.join(30)
+    entry, again = registry.upload(digest, io.BytesIO(raw), "up.csv")
+    assert again is job and entry is not None and len(entry.frame) == 80
+    assert job.frame is None and entry.index is not None  # 데이터는 버전이 소유
+    assert registry.upload(digest, io.BytesIO(raw), "다시.csv") == (entry, job)
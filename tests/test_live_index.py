@@ -0,0 +1,105 @@
+# tests/test_live_index.py
+# -*- coding: utf-8 -*-
+"""LiveMentorIndex: 무작위 추가/수정/삭제 뒤 rank() = 살아 있는 행으로 새로 만든 MentorMatrix, 압축 중 쓰기 보존."""
+
+import random
+import threading
+
+import pandas as pd
+import pytest
+
+from conftest import make_mentors
+from live_index import LIVE_TEXT_ANALYZER, LiveMentorIndex
+from matching import MentorMatrix
+from ranking import rank_mentors
+
+
+def _fresh(live: LiveMentorIndex) -> MentorMatrix:
+    keys, rows = zip(*live.items())
+    df = pd.DataFrame.from_records(list(rows), index=pd.Index(list(keys), dtype=object))
+    return MentorMatrix(df, text_analyzer=LIVE_TEXT_ANALYZER, availability=live.availability)
+
+
+def _assert_matches_fresh(live: LiveMentorIndex, mentees, k: int = 5) -> None:
+    """순위 점수열과 각 멘토의 점수/breakdown이 새 엔진과 같음(동점 순서는 본체 → 추가분 순이라 키로 비교)."""
+    engine = _fresh(live)
+    pos = {key: i for i, key in enumerate(engine.index)}
+    for mentee in mentees:
+        ranked, n = live.rank(mentee, k=k)
+        expected = rank_mentors(engine, mentee, k=k)
+        assert n == engine.n == len(live)
+        assert [r["total"] for r in ranked] == [r["total"] for r in expected]
+        comps = engine.score_all(mentee)
+        for r in ranked:
+            assert engine.breakdown(comps, pos[r["idx"]]) == {"total": r["total"], "breakdown": r["breakdown"]}
+
+
+def _random_writes(live: LiveMentorIndex, pool: pd.DataFrame, rng: random.Random, n: int) -> None:
+    for step in range(n):
+        keys = [k for k, _ in live.items()]
+        if keys and rng.random() < 0.35:
+            live.delete(rng.choice(keys))
+        else:
+            row = pool.iloc[rng.randrange(len(pool))].to_dict()
+            key = rng.choice(keys) if keys and rng.random() < 0.5 else f"new-{step}"
+            live.upsert(key, row)
+
+
+@pytest.mark.parametrize("availability", ["separate", "grid"])
+def test_rank_after_random_writes_matches_fresh(mentees, availability):
+    rng = random.Random(11)
+    live = LiveMentorIndex.from_frame(make_mentors(120, seed=5), availability=availability,
+                                      delta_max=16, background=False)
+    pool = make_mentors(200, seed=6)
+    for _ in range(4):
+        _random_writes(live, pool, rng, 25)
+        _assert_matches_fresh(live, mentees[:8])
+    assert live.compactions > 0
+    live.compact(wait=True)
+    st = live.stats()
+    assert st["delta"] == st["tombstones"] == 0
+    engine = _fresh(live)
+    for mentee in mentees[:8]:
+        # 압축 뒤 본체 순서 = 살아 있는 행 순서 → 위치까지 같음
+        assert live.rank(mentee, k=5)[0] == rank_mentors(engine, mentee, k=5)
+
+
+def test_deleting_everything_returns_no_results(mentees):
+    live = LiveMentorIndex.from_frame(make_mentors(5, seed=1), background=False)
+    live.apply({key: None for key, _ in live.items()})
+    live.delete("missing")  # 없는 키 삭제는 무시
+    assert live.rank(mentees[0], k=5) == ([], 0)
+
+
+class _GatedLive(LiveMentorIndex):
+    """압축(본체 새로 만들기)이 gate가 열릴 때까지 기다리는 인덱스 — 압축 도중 쓰기 재현용."""
+
+    def __init__(self, *args, **kwargs):
+        self.gate = None
+        super().__init__(*args, **kwargs)
+
+    def _build(self, keys, rows, base):
+        if base is None and self.gate is not None:
+            self.gate.wait(10)
+        return super()._build(keys, rows, base)
+
+
+def test_writes_during_compaction_are_kept(mentees):
+    live = _GatedLive.from_frame(make_mentors(60, seed=8), delta_max=10_000, tombstone_ratio=1.0)
+    pool = make_mentors(40, seed=9)
+    live.delete(0)
+    live.gate = threading.Event()
+    live.compact()
+    assert live.stats()["compacting"]
+    # 압축 스레드가 이전 행 스냅샷으로 본체를 만드는 동안 추가/수정/삭제
+    live.upsert("late-add", pool.iloc[0].to_dict())
+    live.upsert(3, pool.iloc[1].to_dict())
+    live.delete(4)
+    live.gate.set()
+    live.compact(wait=True)  # 진행 중인 압축을 기다림
+    st = live.stats()
+    assert live.compactions == 1 and not st["compacting"]
+    assert st["delta"] == 2 and st["tombstones"] == 2  # 3(수정)·4(삭제)는 새 본체에서 삭제 표시
+    assert "late-add" in live and 4 not in live and 0 not in live
+    assert live.row(3) == pool.iloc[1].to_dict()
+    _assert_matches_fresh(live, mentees[:8])
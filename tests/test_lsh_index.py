@@ -0,0 +1,64 @@
+# tests/test_lsh_index.py
+# -*- coding: utf-8 -*-
+"""MinHash LSH: 후보 = 밴드 서명이 하나라도 같은 멘토 전수 비교, 후보 점수 = 정밀 점수, 후보 부족 시 전수 조사."""
+
+import numpy as np
+import pytest
+
+import lsh_index
+from lsh_index import MinHashLSH, features, recall_at_k
+from matching import MentorMatrix, list_to_set
+from ranking import rank_mentors
+
+
+@pytest.fixture(scope="module")
+def index(mentors_df):
+    return MinHashLSH(MentorMatrix(mentors_df), bands=8, rows=2)
+
+
+def _query(mentee):
+    return features(mentee["note"], mentee["interests"], mentee["purpose"], mentee["topics"])
+
+
+def test_signatures_match_per_mentor(index, mentors_df, monkeypatch):
+    monkeypatch.setattr(lsh_index, "SIGNATURE_CHUNK", 64)  # 청크 경계를 여러 번 지나게
+    chunked = MinHashLSH(index.engine, bands=8, rows=2)
+    assert chunked.signatures.tolist() == index.signatures.tolist()
+    for pos, (_, row) in enumerate(mentors_df.iterrows()):
+        intro = "" if row["intro"] is None else str(row["intro"]).strip()
+        feats = features(intro, list_to_set(row["interests"]), list_to_set(row["purpose"]),
+                         list_to_set(row["topic_prefs"]))
+        assert index.signature(feats).tolist() == index.signatures[pos].tolist()
+
+
+def test_candidates_match_band_collisions(index, mentees):
+    r = index.rows
+    for mentee in mentees:
+        sig = index.signature(_query(mentee))
+        hit = np.zeros(index.engine.n, dtype=bool)
+        for b in range(index.bands):
+            hit |= (index.signatures[:, b * r:(b + 1) * r] == sig[b * r:(b + 1) * r]).all(axis=1)
+        assert index.candidates(mentee).tolist() == np.flatnonzero(hit).tolist()
+
+
+def test_rank_scores_candidates_exactly(index, mentees):
+    for mentee in mentees:
+        ranked, scored = index.rank(mentee, k=5)
+        totals = index.engine.score_all(mentee)["total"]
+        assert all(r["total"] == totals[r["pos"]] for r in ranked)
+        assert [r["total"] for r in ranked] == sorted((r["total"] for r in ranked), reverse=True)
+        assert scored == index.engine.n or set(r["pos"] for r in ranked) <= set(index.candidates(mentee).tolist())
+
+
+def test_too_few_candidates_falls_back_to_exhaustive(index, mentees):
+    for mentee in mentees[:5]:
+        ranked, scored = index.rank(mentee, k=5, min_candidates=index.engine.n + 1)
+        assert scored == index.engine.n and ranked == rank_mentors(index.engine, mentee, k=5)
+    empty = {**mentees[0], "note": "", "interests": set(), "purpose": set(), "topics": set()}
+    assert len(index.candidates(empty)) == 0
+    assert index.rank(empty, k=5)[0] == rank_mentors(index.engine, empty, k=5)
+
+
+def test_recall_reported_against_exhaustive(index, mentees):
+    report = recall_at_k(index, mentees, k=5)
+    assert 0.0 <= report["recall"] <= 1.0 and 0.0 < report["candidate_fraction"] <= 1.0
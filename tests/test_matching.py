@@ -0,0 +1,104 @@
+# tests/test_matching.py
+# -*- coding: utf-8 -*-
+"""소통 가능 시간 비트마스크(separate/grid) = 집합 Jaccard 기준 계산, 규칙 조회표 = 규칙 함수."""
+
+import random
+
+import numpy as np
+import pytest
+
+from conftest import make_mentors
+from matching import (
+    AGE_BANDS, AGE_TABLE, DAYS, DEFAULT_WEIGHTS, MAJOR_TABLE, OCCUPATION_MAJORS, STYLE_TABLE, STYLES, TIME_SLOTS,
+    MentorMatrix, age_preference_score, compute_score, list_to_set, major_score, popcount32, ratio_overlap,
+    style_score,
+)
+
+
+@pytest.fixture(scope="module")
+def frame():
+    frame = make_mentors(200, seed=11)
+    # 어휘 밖 토큰(합집합 크기에만 들어감)과 빈 칸도 섞는다
+    frame.loc[[5, 6], "comm_modes"] = ["전화, 비둘기", "비둘기"]
+    frame.loc[[7, 8], "comm_time"] = ["새벽", ""]
+    frame.loc[9, "comm_days"] = "주말, 월"
+    return frame
+
+
+def _cells(days, times) -> set:
+    return {(d, t) for d in days for t in times}
+
+
+def _grid_comm(mentee, row) -> int:
+    """grid 기준: 요일×시간대 칸 집합의 Jaccard에 시간대+요일 가중치를 합쳐 적용."""
+    w = DEFAULT_WEIGHTS
+    mentor_cells = _cells(list_to_set(row["comm_days"]) & set(DAYS), list_to_set(row["comm_time"]) & set(TIME_SLOTS))
+    return round(ratio_overlap(mentee["comm_modes"], list_to_set(row["comm_modes"])) * w["comm_modes"]
+                 + ratio_overlap(_cells(mentee["days"], mentee["time_slots"]), mentor_cells)
+                 * (w["time_slots"] + w["days"]))
+
+
+def test_popcount32_matches_bin_count():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.integers(0, 2**32, size=1000, dtype=np.uint64), [0, 2**32 - 1]]).astype(np.uint32)
+    assert popcount32(x).tolist() == [bin(int(v)).count("1") for v in x]
+
+
+def test_separate_comm_score_matches_compute_score(frame, mentees):
+    engine = MentorMatrix(frame, availability="separate")
+    for mentee in mentees:
+        expected = [compute_score({**mentee, "note": ""}, row)["breakdown"]["소통 선호"] for _, row in frame.iterrows()]
+        assert engine.comm_score(mentee).tolist() == expected
+
+
+def test_grid_comm_score_matches_cell_jaccard(frame, mentees):
+    engine = MentorMatrix(frame, availability="grid")
+    for mentee in mentees:
+        expected = [_grid_comm(mentee, row) for _, row in frame.iterrows()]
+        assert engine.comm_score(mentee).tolist() == expected
+
+
+@pytest.mark.parametrize("availability", ["separate", "grid"])
+def test_out_of_vocab_mentee_falls_back_to_sets(frame, mentees, availability):
+    engine = MentorMatrix(frame, availability=availability)
+    mentee = {**mentees[0], "comm_modes": {"비둘기", "화상"}}
+    expected = [compute_score({**mentee, "note": ""}, row)["breakdown"]["소통 선호"] for _, row in frame.iterrows()]
+    assert engine.comm_score(mentee).tolist() == expected
+
+
+@pytest.mark.parametrize("availability", ["separate", "grid"])
+def test_score_block_matches_score_all(frame, mentees, availability):
+    engine = MentorMatrix(frame, availability=availability)
+    rng = random.Random(1)
+    batch = mentees[:8] + [{**mentees[8], "time_slots": {"새벽"}}]
+    rows = np.array(sorted(rng.sample(range(engine.n), 60)))
+    block = engine.score_block(batch, rows)
+    for j, mentee in enumerate(batch):
+        single = engine.score_all(mentee, rows)
+        for key, values in single.items():
+            assert block[key][:, j].tolist() == values.tolist(), key
+
+
+def test_compiled_tables_match_rules():
+    assert STYLE_TABLE.tolist() == [[style_score(a, b) for b in STYLES] for a in STYLES]
+    assert MAJOR_TABLE.tolist() == [[major_score({a}, b) for b in OCCUPATION_MAJORS] for a in OCCUPATION_MAJORS]
+    assert AGE_TABLE.tolist() == [[age_preference_score({a}, b) for b in AGE_BANDS] for a in AGE_BANDS]
+
+
+def test_lookup_components_match_rules(frame):
+    # 멘토 쪽 어휘 밖 값("40대" → 정규화, 빈 칸, None)과 멘티 쪽 다중 선택·어휘 밖 값
+    frame = frame.copy()
+    frame.loc[[0, 1], "age_band"] = ["40대", "만 20~29세"]
+    frame.loc[2, "occupation_major"] = "우주비행사"
+    engine = MentorMatrix(frame)
+    rng = random.Random(2)
+    for _ in range(40):
+        mentee = {"style": rng.choice(STYLES + ["", "잔소리형"]),
+                  "wanted_majors": set(rng.sample(OCCUPATION_MAJORS + ["우주비행사"], rng.randint(0, 3))),
+                  "wanted_mentor_ages": set(rng.sample(AGE_BANDS, rng.randint(0, 3)))}
+        fit = [major_score(mentee["wanted_majors"], str(row["occupation_major"]).strip())
+               + age_preference_score(mentee["wanted_mentor_ages"], str(row["age_band"]).strip())
+               for _, row in frame.iterrows()]
+        style = [style_score(mentee["style"], str(row["style"]).strip()) for _, row in frame.iterrows()]
+        assert engine.component("멘토 적합도", mentee).tolist() == fit
+        assert engine.component("스타일", mentee).tolist() == style
@@ -0,0 +1,59 @@
+# tests/test_mentor_ingest.py
+# -*- coding: utf-8 -*-
+"""청크 수집: 잘못된 행 보고(데이터 행 번호), ChunkedMentorIndex 순위 = 수집된 프레임 전체의 rank_mentors."""
+
+import io
+
+import pytest
+
+from conftest import make_mentors
+from matching import MentorMatrix
+from mentor_ingest import INGEST_TEXT_ANALYZER, MentorIngest
+from ranking import rank_mentors
+
+BAD_ROWS = {3: ("age_band", "외계인"), 10: ("style", "잔소리형"), 17: ("occupation_major", "우주비행사"),
+            40: ("name", ""), 41: ("name", "멘토2")}
+
+
+def _upload(frame, encoding="utf-8") -> io.BytesIO:
+    return io.BytesIO(frame.to_csv(index=False).encode(encoding))
+
+
+@pytest.fixture(scope="module")
+def upload_frame():
+    frame = make_mentors(150, seed=3, valid_only=True)
+    for row, (col, value) in BAD_ROWS.items():
+        frame.loc[row, col] = value
+    frame.loc[[1, 20], "intro"] = ["여러 줄\n소개", "따옴표 안\n줄바꿈\n두 번"]  # 물리적 줄 수 ≠ 행 수
+    return frame
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp949"])
+def test_invalid_rows_reported_with_row_numbers(upload_frame, encoding):
+    job = MentorIngest(_upload(upload_frame, encoding), chunk_rows=16, start=False)
+    job.run()
+    assert job.status == "done" and job.encoding == encoding
+    # 헤더 제외 1부터 → 데이터 i행(0부터)은 i + 1, 여러 줄 값이 있어도 같음
+    assert [e["row"] for e in job.errors] == [row + 1 for row in sorted(BAD_ROWS)]
+    assert job.errors[-1]["reason"] == "이름 중복(앞 행 유지)"
+    assert job.rows_read == len(upload_frame)
+    assert job.rows_ok == len(job.frame) == len(upload_frame) - len(BAD_ROWS)
+    assert job.frame["name"].tolist() == upload_frame.drop(index=list(BAD_ROWS))["name"].tolist()
+
+
+@pytest.mark.parametrize("availability", ["separate", "grid"])
+def test_chunked_rank_matches_exhaustive(upload_frame, mentees, availability):
+    job = MentorIngest(_upload(upload_frame), chunk_rows=16, availability=availability, start=False)
+    job.run()
+    assert len(job.index.segments) > 1
+    engine = MentorMatrix(job.frame, text_analyzer=INGEST_TEXT_ANALYZER, availability=availability)
+    for mentee in mentees:
+        ranked, n = job.index.rank(mentee, k=5)
+        assert ranked == rank_mentors(engine, mentee, k=5)
+        assert n == engine.n
+
+
+def test_missing_columns_fail(upload_frame):
+    job = MentorIngest(_upload(upload_frame.drop(columns=["style"])), start=False)
+    job.run()
+    assert job.status == "failed" and "style" in job.message
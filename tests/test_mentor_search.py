@@ -0,0 +1,114 @@
+# tests/test_mentor_search.py
+# -*- coding: utf-8 -*-
+"""멘토 검색: MentorSearchIndex = 기존 recommend_mentors(DataFrame 복사 + apply + 정렬)의 행 순서,
+MentorFacets 조합별 결과 수 = 그 검색 결과 인원, MaterializedSearch(미리 만든 표/LRU) = 검색 결과."""
+
+import itertools
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_mentors
+from matching import OCCUPATION_MAJORS
+from mentor_search import MaterializedSearch, MentorFacets, MentorSearchIndex, style_options, topic_options
+
+
+def recommend_mentors(mentors_df, search_field, search_topic, search_style, style_match="substring"):
+    """app.py(스타일 포함 검사) / app22.py(스타일 일치) 원래 구현.
+
+    달라진 점은 두 가지뿐: 정렬을 stable로(원래 quicksort는 동점 순서가 정해지지 않음),
+    빈 셀을 "nan" 문자열/불일치로 처리(pandas 2의 astype(str) 결과, 원래 코드는 빈 스타일 셀에서 TypeError).
+    """
+    mentors = mentors_df.copy()
+    mentors["score"] = 0
+    if search_field:
+        mentors["score"] += mentors["occupation_major"].apply(lambda x: 3 if x == search_field else 0)
+    if search_topic:
+        mentors["score"] += mentors["topic_prefs"].map(str).apply(lambda x: 2 if search_topic in x else 0)
+    if search_style:
+        if style_match == "exact":
+            mentors["score"] += mentors["style"].apply(lambda x: 1 if x == search_style else 0)
+        else:
+            mentors["score"] += mentors["style"].apply(lambda x: 1 if isinstance(x, str) and search_style in x else 0)
+    if search_field or search_topic or search_style:
+        recommended = mentors[mentors["score"] > 0].sort_values(by="score", ascending=False, kind="stable")
+    else:
+        recommended = mentors.sort_values(by="name", ascending=True, kind="stable")
+    return recommended
+
+
+@pytest.fixture(scope="module")
+def frame():
+    frame = make_mentors(300, seed=21)
+    frame.loc[[4, 9], "name"] = [None, "멘토1"]  # 빈 이름(맨 뒤)과 같은 이름(원래 순서)
+    frame.loc[[5, 6], "topic_prefs"] = [None, "진로"]
+    frame.loc[7, "occupation_major"] = None
+    return frame
+
+
+def _options(frame):
+    return {"field": [""] + OCCUPATION_MAJORS + ["없는 직종"],
+            "topic": [""] + topic_options(frame) + ["진로", "없는 주제"],
+            "style": [""] + style_options(frame) + ["형", "없는 스타일"]}
+
+
+def _combinations(frame, sample=None):
+    """모든 선택 조합(sample이면 한 칸만 고른 조합 전부 + 무작위 sample개)."""
+    opts = _options(frame)
+    combos = list(itertools.product(opts["field"], opts["topic"], opts["style"]))
+    if sample is None:
+        return combos
+    single = [c for c in combos if sum(map(bool, c)) <= 1]
+    return single + random.Random(0).sample([c for c in combos if sum(map(bool, c)) > 1], sample)
+
+
+@pytest.mark.parametrize("style_match", ["substring", "exact"])
+def test_search_matches_recommend_mentors(frame, style_match):
+    index = MentorSearchIndex(frame, style_match=style_match)
+    for key in _combinations(frame, sample=150):
+        expected = recommend_mentors(frame, *key, style_match=style_match)
+        order = index.search(*key)
+        assert order.tolist() == expected.index.tolist(), key
+        if any(key):
+            assert index.scores(*key)[order].tolist() == expected["score"].tolist()
+
+
+def test_missing_columns_score_nothing():
+    frame = pd.DataFrame({"name": ["나", "가", np.nan]})
+    index = MentorSearchIndex(frame)
+    assert index.search().tolist() == [1, 0, 2]
+    assert index.search("IT 개발", "진로", "연두부형").tolist() == []
+
+
+@pytest.mark.parametrize("style_match", ["substring", "exact"])
+def test_facet_counts_match_search_sizes(frame, style_match):
+    index = MentorSearchIndex(frame, style_match=style_match)
+    known = {"field": OCCUPATION_MAJORS, "topic": topic_options(frame), "style": style_options(frame)}
+    facets = MentorFacets(index, known["field"], known["topic"], known["style"])
+    for key in itertools.product(*([""] + known[f] for f in ("field", "topic", "style"))):
+        assert facets.count(*key) == len(index.search(*key)), key
+    for facet, kw in (("field", 0), ("topic", 1), ("style", 2)):
+        for option, n in facets.option_counts(facet).items():
+            key = ["", "", ""]
+            key[kw] = option
+            assert n == len(recommend_mentors(frame, *key, style_match=style_match))
+            assert facets.label(facet, option) == f"{option} ({n}명)"
+    assert facets.count("없는 직종") is None and facets.label("field", "(전체)") == "(전체)"
+
+
+@pytest.mark.parametrize("max_positions", [None, 0])
+def test_materialized_lookup_matches_search(frame, max_positions):
+    index = MentorSearchIndex(frame)
+    facets = MentorFacets(index, OCCUPATION_MAJORS, topic_options(frame), style_options(frame))
+    kwargs = {} if max_positions is None else {"max_positions": max_positions, "lru_entries": 16}
+    table = MaterializedSearch(index, facets, with_scores=True, **kwargs)
+    assert table.materialized == (max_positions is None)
+    for key in _combinations(frame, sample=150) * 2:
+        order, scores = table.lookup(*key)
+        assert order.dtype == np.uint16 and order.tolist() == index.search(*key).tolist(), key
+        assert scores.tolist() == index.scores(*key)[index.search(*key)].tolist()
+    report = table.memory_report()
+    assert report["mode"] == ("materialized" if max_positions is None else "lru")
+    assert report["positions"] == int(facets.counts.sum())
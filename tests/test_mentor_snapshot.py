@@ -0,0 +1,53 @@
+# tests/test_mentor_snapshot.py
+# -*- coding: utf-8 -*-
+"""열 단위 스냅샷(mentor_snapshot) 왕복 = CSV를 그대로 읽은 DataFrame, 데이터셋 버전 유지"""
+
+import io
+
+import pandas as pd
+
+from conftest import make_mentors
+from matching import dataset_version
+from mentor_snapshot import SNAPSHOT_FORMAT, clean_columns, compile_snapshot, load_snapshot, read_meta
+from mentor_store import MentorStore
+
+
+def _write_csv(path, df, encoding="utf-8"):
+    df.assign(**{" 나이 ": range(len(df))}).to_csv(path, index=False, encoding=encoding)
+    return str(path)
+
+
+def _read_csv(path, encoding="utf-8"):
+    with open(path, "rb") as f:
+        return clean_columns(pd.read_csv(io.StringIO(f.read().decode(encoding))))
+
+
+def test_round_trip_equals_csv_frame(tmp_path):
+    for encoding in ("utf-8", "cp949"):
+        csv = _write_csv(tmp_path / f"mentors_{encoding}.csv", make_mentors(300, seed=3), encoding)
+        out = compile_snapshot(csv)
+        compiled = load_snapshot(out, csv)
+        assert compiled is not None
+        df, meta = compiled
+        expected = _read_csv(csv, encoding)
+        pd.testing.assert_frame_equal(df, expected)
+        assert meta["format"] == SNAPSHOT_FORMAT and meta["encoding"] == encoding
+        assert meta["version"] == dataset_version(expected) == dataset_version(df)
+
+
+def test_stale_or_old_format_snapshot_falls_back_to_csv(tmp_path):
+    csv = _write_csv(tmp_path / "mentors.csv", make_mentors(50, seed=4))
+    out = compile_snapshot(csv)
+    store = MentorStore(csv, snapshot_dir=out)
+    snap = store.get()
+    assert snap.source == "snapshot" and snap.version == dataset_version(_read_csv(csv))
+
+    _write_csv(csv, make_mentors(60, seed=5))
+    fresh = MentorStore(csv, snapshot_dir=out).get()
+    assert fresh.source == "csv" and len(fresh.df) == 60
+    assert load_snapshot(out, csv) is None
+
+    meta_path = compile_snapshot(csv) / "meta.json"
+    meta_path.write_text(meta_path.read_text(encoding="utf-8").replace(
+        f'"format": {SNAPSHOT_FORMAT}', '"format": 1'), encoding="utf-8")
+    assert read_meta(out) is None and load_snapshot(out, csv) is None
@@ -0,0 +1,55 @@
+# tests/test_mentor_store.py
+# -*- coding: utf-8 -*-
+"""공용 멘토 저장소: 파일이 그대로면 같은 스냅샷(다시 읽지 않음), 바뀌면 한 번만 다시 읽음, 오류는 문구로."""
+
+import os
+import threading
+
+from conftest import make_mentors
+from matching import dataset_version
+from mentor_store import MentorStore
+
+REQUIRED = ["name", "style", "occupation_major"]
+
+
+def _write(path, df, encoding="utf-8", bump_ns=0):
+    df.rename(columns={"style": "communication_style", "name": " name "}).to_csv(path, index=False,
+                                                                              encoding=encoding)
+    if bump_ns:  # 같은 크기로 다시 써도 mtime이 달라지게
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+    return str(path)
+
+
+def test_unchanged_file_is_read_once(tmp_path):
+    path = _write(tmp_path / "mentors.csv", make_mentors(40, seed=1), encoding="cp949")
+    store = MentorStore(path, REQUIRED)
+    snap = store.get()
+    assert snap.error is None and snap.encoding == "cp949" and snap.source == "csv"
+    assert {"name", "style"} <= set(snap.df.columns) and "communication_style" not in snap.df.columns
+    assert snap.version == dataset_version(snap.df)
+    assert all(store.get() is snap for _ in range(5)) and store.loads == 1 and not store.is_stale()
+
+
+def test_changed_file_reloads_once_across_threads(tmp_path):
+    path = _write(tmp_path / "mentors.csv", make_mentors(40, seed=1))
+    store = MentorStore(path, REQUIRED)
+    first = store.get()
+    _write(path, make_mentors(40, seed=2), bump_ns=10**9)
+    assert store.is_stale()
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(store.get())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert store.loads == 2 and len({id(s) for s in got}) == 1
+    assert got[0] is not first and got[0].version != first.version
+
+
+def test_errors_are_reported_on_the_snapshot(tmp_path):
+    missing = MentorStore(str(tmp_path / "none.csv")).get()
+    assert missing.error and missing.df.empty
+    path = _write(tmp_path / "mentors.csv", make_mentors(5, seed=1).drop(columns=["occupation_major"]))
+    snap = MentorStore(path, REQUIRED).get()
+    assert snap.missing_cols == ["occupation_major"] and snap.df.empty and "occupation_major" in snap.error
@@ -0,0 +1,65 @@
+# tests/test_ranking.py
+# -*- coding: utf-8 -*-
+"""rank_mentors = compute_score 행 단위 전수 정렬, rank_anytime(무제한 예산)/ComponentCache = rank_mentors."""
+
+import pytest
+
+from matching import MentorMatrix, compute_score
+from ranking import ComponentCache, rank_anytime, rank_mentors
+
+
+@pytest.fixture(scope="module")
+def engine(mentors_df):
+    return MentorMatrix(mentors_df, text_analyzer="char")
+
+
+def test_rank_mentors_matches_compute_score(mentors_df, mentees):
+    # compute_score의 텍스트 점수는 멘티-멘토 쌍마다 TF-IDF를 새로 맞추므로 소개글 없이 비교
+    frame = mentors_df.head(120)
+    engine = MentorMatrix(frame)
+    for mentee in mentees[:10]:
+        mentee = {**mentee, "note": ""}
+        scores = [compute_score(mentee, row) for _, row in frame.iterrows()]
+        comps = engine.score_all(mentee)
+        assert [engine.breakdown(comps, pos) for pos in range(engine.n)] == scores
+        expected = sorted(range(engine.n), key=lambda pos: (-scores[pos]["total"], pos))[:5]
+        assert [r["pos"] for r in rank_mentors(engine, mentee, k=5)] == expected
+
+
+def test_anytime_without_budget_is_exact(engine, mentees):
+    for mentee in mentees:
+        ranked, info = rank_anytime(engine, mentee, k=5, chunk_size=64)
+        assert all(r.pop("exact") for r in ranked)
+        assert ranked == rank_mentors(engine, mentee, k=5)
+        assert info["scored"] == engine.n
+
+
+def test_anytime_exact_flags_hold_under_zero_budget(engine, mentees):
+    for mentee in mentees:
+        ranked, _ = rank_anytime(engine, mentee, k=5, budget=0.0, chunk_size=64)
+        totals = engine.score_all(mentee)["total"]
+        top = {r["pos"] for r in rank_mentors(engine, mentee, k=5)}
+        for r in ranked:
+            assert r["total"] == totals[r["pos"]]
+            if r["exact"]:
+                assert r["pos"] in top
+
+
+def test_component_cache_recomputes_only_changed_inputs(engine, mentees):
+    cache = ComponentCache(engine)
+    mentee = mentees[0]
+    assert cache.rank(mentee, k=5) == rank_mentors(engine, mentee, k=5)
+    assert len(cache.recomputed) == 6
+    # 순서/공백만 다른 입력은 재계산 없음
+    same = {**mentee, "note": "  " + mentee["note"].upper() + " ", "interests": set(sorted(mentee["interests"]))}
+    assert cache.rank(same, k=5) == rank_mentors(engine, mentee, k=5)
+    assert cache.recomputed == []
+    for changed, component in [({"style": "댕댕이형" if mentee["style"] != "댕댕이형" else "연두부형"}, "스타일"),
+                               ({"days": mentee["days"] ^ {"토"}}, "소통 선호"),
+                               ({"note": "완전히 다른 요청 데이터 분석"}, "텍스트"),
+                               ({"wanted_mentor_ages": mentee["wanted_mentor_ages"] ^ {"만 30세~39세"}}, "멘토 적합도")]:
+        mentee = {**mentee, **changed}
+        assert cache.rank(mentee, k=5) == rank_mentors(engine, mentee, k=5)
+        assert cache.recomputed == [component]
+    for other in mentees[1:]:
+        assert cache.rank(other, k=5) == rank_mentors(engine, other, k=5)
@@ -0,0 +1,61 @@
+# tests/test_reciprocal.py
+# -*- coding: utf-8 -*-
+"""상호 매칭: forward = compute_score(멘티 i, 멘토 j) 쌍별 값, backward = 멘토 쪽 나이대 선호, mutual = 조화 평균."""
+
+import numpy as np
+import pytest
+
+from matching import COMPONENTS, MentorMatrix, age_preference_score, compute_score
+from reciprocal import BACKWARD_FIT_MAX, BACKWARD_FIT_SCALE, MENTOR_PREF_COLUMN, ReciprocalScorer
+
+
+@pytest.fixture(scope="module")
+def pool(mentees):
+    # 어휘 밖 값(희망 직군, 스타일, 소통 방법)이 있는 멘티도 포함
+    odd = {**mentees[0], "wanted_majors": {"우주비행사", "IT 개발"}, "style": "잔소리형", "comm_modes": {"비둘기"}}
+    return mentees + [odd]
+
+
+def test_forward_matches_compute_score_per_pair(mentors_df, pool):
+    frame = mentors_df.head(60)
+    no_note = [{**m, "note": ""} for m in pool]
+    scorer = ReciprocalScorer(MentorMatrix(frame), no_note)
+    for j, (_, row) in enumerate(frame.iterrows()):
+        fwd = scorer.forward(j)
+        for i, mentee in enumerate(no_note):
+            expected = compute_score(mentee, row)
+            assert int(fwd["total"][i]) == expected["total"]
+            assert {c: int(fwd[c][i]) for c in COMPONENTS} == expected["breakdown"]
+
+
+@pytest.mark.parametrize("availability", ["separate", "grid"])
+def test_forward_matches_engine_columns(mentors_df, pool, availability):
+    engine = MentorMatrix(mentors_df, availability=availability)
+    scorer = ReciprocalScorer(engine, pool)
+    comps = [engine.score_all(m) for m in pool]
+    for j in range(0, engine.n, 7):
+        fwd = scorer.forward(j)
+        for key in COMPONENTS + ["total"]:
+            assert fwd[key].tolist() == [int(c[key][j]) for c in comps], key
+
+
+def test_backward_uses_mentor_preferences_or_rescales(mentors_df, pool):
+    frame = mentors_df.head(40).copy()
+    frame[MENTOR_PREF_COLUMN] = ["만 20세~29세, 만 40세~49세" if j % 2 else "" for j in range(len(frame))]
+    scorer = ReciprocalScorer.from_frames(MentorMatrix(frame), frame, pool)
+    for j in range(len(frame)):
+        h, fwd, bwd = scorer.mutual(j)
+        rest = sum(fwd[c] for c in COMPONENTS if c != "멘토 적합도")
+        if j % 2:
+            fit = [age_preference_score({"만 20세~29세", "만 40세~49세"}, m["age_band"]) * BACKWARD_FIT_SCALE
+                   for m in pool]
+            assert bwd["멘토 적합도"].tolist() == fit
+            assert bwd["total"].tolist() == np.clip(rest + fit, 0, 100).tolist()
+        else:
+            assert not bwd["멘토 적합도"].any()
+            assert bwd["total"].tolist() == np.clip(np.rint(rest * 100 / (100 - BACKWARD_FIT_MAX)), 0, 100).tolist()
+        a, b = fwd["total"].astype(float), bwd["total"].astype(float)
+        expected = np.where(a + b > 0, 2 * a * b / np.maximum(a + b, 1), 0.0)
+        assert np.allclose(h, expected)
+        ranked = scorer.rank_mentees(j, k=5)
+        assert [r["pos"] for r in ranked] == sorted(range(len(pool)), key=lambda i: (-h[i], i))[:5]
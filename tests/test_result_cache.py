@@ -0,0 +1,55 @@
+# tests/test_result_cache.py
+# -*- coding: utf-8 -*-
+"""추천 결과 캐시: 같은 설문(정규형)은 같은 지문, 점수에 쓰이는 입력이 바뀌면 다른 지문, LRU/버전 정리."""
+
+import time
+
+from matching import MentorMatrix
+from ranking import rank_mentors
+from result_cache import ResultCache, mentee_fingerprint
+
+
+def test_fingerprint_ignores_order_spacing_and_unscored_fields(mentees):
+    mentee = mentees[0]
+    same = {**mentee, "name": "다른 이름", "gender": "여", "style": f"  {mentee['style']} ",
+            "interests": set(reversed(sorted(mentee["interests"]))),
+            "note": "  " + "   ".join(mentee["note"].upper().split()) + "\n"}
+    assert mentee_fingerprint(same, "v1", "grid") == mentee_fingerprint(mentee, "v1", "grid")
+
+
+def test_fingerprint_changes_with_scored_inputs_version_and_config(mentees):
+    mentee = mentees[0]
+    base = mentee_fingerprint(mentee, "v1", "grid")
+    assert mentee_fingerprint(mentee, "v2", "grid") != base
+    assert mentee_fingerprint(mentee, "v1", "separate") != base
+    assert mentee_fingerprint({**mentee, "note": mentee["note"] + " 추가"}, "v1", "grid") != base
+    assert mentee_fingerprint({**mentee, "days": mentee["days"] ^ {"월"}}, "v1", "grid") != base
+
+
+def test_cached_results_equal_fresh_ranking(mentors_df, mentees):
+    engine = MentorMatrix(mentors_df.head(150))
+    cache = ResultCache(max_entries=8)
+    for mentee in mentees[:5] * 2:
+        key = mentee_fingerprint(mentee, "v1")
+        assert cache.get_or_compute(key, lambda: rank_mentors(engine, mentee, k=5), "v1") \
+            == rank_mentors(engine, mentee, k=5)
+    assert cache.stats()["hits"] == 5 and cache.stats()["misses"] == 5
+
+
+def test_lru_eviction_and_version_discard():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1, "v1")
+    cache.put("b", 2, "v2")
+    assert cache.get("a") == 1  # a가 최근 사용 → 다음 put에서 b가 축출
+    cache.put("c", 3, "v1")
+    assert cache.get("b") is None and cache.evictions == 1
+    assert cache.discard("v1") == 2
+    assert cache.get("a") is None and cache.get("c") is None
+
+
+def test_ttl_expires_entries():
+    cache = ResultCache(ttl=0.01)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.02)
+    assert cache.get("a") is None
@@ -0,0 +1,44 @@
+# tests/test_sharded_scoring.py
+# -*- coding: utf-8 -*-
+"""ShardedScorer(공유 메모리 + 프로세스 풀) = rank_mentors 전수 결과, ScorerSlot은 이전 풀을 닫음."""
+
+import pytest
+
+from matching import MentorMatrix
+from ranking import rank_mentors
+from sharded_scoring import ScorerSlot, ShardedScorer
+
+
+@pytest.fixture(scope="module")
+def engine(mentors_df):
+    return MentorMatrix(mentors_df, text_analyzer="char")
+
+
+def test_sharded_rank_matches_exhaustive(engine, mentees):
+    scorer = ShardedScorer(engine, workers=3, min_rows=10)
+    try:
+        assert scorer.active
+        for mentee in mentees:
+            ranked, n = scorer.rank(mentee, k=5)
+            assert ranked == rank_mentors(engine, mentee, k=5)
+            assert n == engine.n
+    finally:
+        scorer.close()
+    assert not scorer.active and scorer.shared_bytes == 0
+
+
+def test_small_pool_stays_in_process(engine, mentees):
+    scorer = ShardedScorer(engine, workers=3, min_rows=engine.n + 1)
+    assert not scorer.active
+    assert scorer.rank(mentees[0], k=5)[0] == rank_mentors(engine, mentees[0], k=5)
+
+
+def test_slot_closes_previous_scorer(engine):
+    slot = ScorerSlot()
+    first = slot.get("a", lambda: ShardedScorer(engine, workers=2, min_rows=10))
+    assert slot.get("a", lambda: pytest.fail("같은 키는 다시 만들지 않음")) is first
+    second = slot.get("b", lambda: ShardedScorer(engine, workers=2, min_rows=10))
+    try:
+        assert second is not first and not first.active and second.active
+    finally:
+        second.close()
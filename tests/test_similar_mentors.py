@@ -0,0 +1,113 @@
+# tests/test_similar_mentors.py
+# -*- coding: utf-8 -*-
+"""비슷한 멘토 그래프: 블록 계산 = 전체 유사도 정렬, 증분 갱신 = 새 데이터 전체 재계산, GraphJob 상한/중단."""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import similar_mentors
+from conftest import make_mentors
+from matching import MentorMatrix, dataset_version, list_to_set, ratio_overlap
+from similar_mentors import (
+    SIMILARITY_WEIGHTS, GraphJob, _Stopped, load_graph, match_rows, neighbor_graph, refresh_graph, row_hashes,
+    save_graph, similar, similarity_block,
+)
+
+K = 5
+
+
+def _engine(frame):
+    return MentorMatrix(frame, text_analyzer="hash")
+
+
+def _expected_neighbors(engine, pos):
+    sim = np.rint(similarity_block(engine, np.array([pos]))[0].astype(np.float64) * (1 << 20))
+    order = sorted((p for p in range(engine.n) if p != pos), key=lambda p: (-sim[p], p))
+    return order[:K]
+
+
+def test_similarity_matches_facet_jaccard():
+    frame = make_mentors(30, seed=2).assign(intro="")
+    engine = _engine(frame)
+    sim = similarity_block(engine, np.arange(engine.n))
+    total = sum(SIMILARITY_WEIGHTS.values())
+    for a in range(0, engine.n, 4):
+        for b in range(engine.n):
+            expected = sum(ratio_overlap(list_to_set(frame.iloc[a][col]), list_to_set(frame.iloc[b][col])) * w
+                           for col, w in SIMILARITY_WEIGHTS.items() if col != "intro") / total
+            assert sim[a, b] == pytest.approx(expected, abs=1e-6)
+
+
+def test_graph_rows_are_top_k_with_position_ties(mentors_df, monkeypatch):
+    monkeypatch.setattr(similar_mentors, "BLOCK_CELLS", 37 * len(mentors_df))  # 블록 여러 개
+    engine = _engine(mentors_df)
+    graph = neighbor_graph(engine, K)
+    for pos in range(engine.n):
+        assert similar(graph, pos)[0].tolist() == _expected_neighbors(engine, pos)
+
+
+def test_refresh_matches_full_rebuild(mentors_df):
+    old = mentors_df.head(300).reset_index(drop=True)
+    graph = neighbor_graph(_engine(old), K)
+    new = old.drop(index=[3, 50, 51]).copy()
+    new.loc[[10, 120], "interests"] = ["독서, 여행", ""]
+    new = pd.concat([new, make_mentors(12, seed=99)], ignore_index=True)
+    old_to_new, changed = match_rows(row_hashes(old), row_hashes(new))
+    engine = _engine(new)
+    refreshed, redone = refresh_graph(graph, engine, changed, old_to_new, K)
+    full = neighbor_graph(engine, K)
+    assert redone < engine.n
+    assert refreshed.indices.tolist() == full.indices.tolist()
+    assert np.array_equal(refreshed.indptr, full.indptr) and np.allclose(refreshed.data, full.data)
+
+
+def test_save_load_checks_version(tmp_path, mentors_df):
+    frame = mentors_df.head(50)
+    graph = neighbor_graph(_engine(frame), K)
+    path = tmp_path / "m.neighbors.npz"
+    save_graph(path, graph, frame, "hash")
+    loaded = load_graph(path, dataset_version(frame))
+    assert loaded["graph"].indices.tolist() == graph.indices.tolist()
+    assert load_graph(path, "other-version") is None
+
+
+def test_graph_job_limits_and_stop(tmp_path, mentors_df):
+    frame = mentors_df.head(80)
+    job = GraphJob(None, frame, k=K, max_rows=50)
+    job.join(10)
+    assert job.status == "too_large" and job.graph is None
+
+    job = GraphJob(None, frame, path=tmp_path / "m.neighbors.npz", k=K)
+    job.join(30)
+    assert job.status == "done"
+    assert job.graph.indices.tolist() == neighbor_graph(_engine(frame), K).indices.tolist()
+    saved = GraphJob(None, frame, path=tmp_path / "m.neighbors.npz", k=K, max_rows=0)  # 저장본은 상한과 무관
+    saved.join(10)
+    assert saved.status == "done"
+
+    stop = threading.Event()
+    stop.set()
+    with pytest.raises(_Stopped):
+        neighbor_graph(_engine(frame), K, stop=stop)
+
+
+def test_graph_job_close_stops_between_blocks(mentors_df, monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+    block = similarity_block
+
+    def gated(engine, rows):
+        entered.set()
+        release.wait(10)
+        return block(engine, rows)
+
+    monkeypatch.setattr(similar_mentors, "similarity_block", gated)
+    monkeypatch.setattr(similar_mentors, "BLOCK_CELLS", 10 * len(mentors_df))
+    job = GraphJob(None, mentors_df, k=K)
+    assert entered.wait(10)
+    job.close()
+    release.set()
+    job.join(10)
+    assert job.status == "stopped" and job.graph is None
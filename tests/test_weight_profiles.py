@@ -0,0 +1,70 @@
+# tests/test_weight_profiles.py
+# -*- coding: utf-8 -*-
+"""가중치 프로필: "default" 프로필 = rank_mentors, 다른 프로필 = 가중치만 바꾼 compute_score 행 단위 정렬."""
+
+import json
+
+import pytest
+
+from matching import (
+    MentorMatrix, age_preference_score, list_to_set, major_score, ratio_overlap, style_score,
+)
+from ranking import rank_mentors
+from weight_profiles import WeightProfile, load_profiles, rank_profiles
+
+
+def _weighted_score(mentee, row, profile) -> int:
+    """compute_score와 같은 식에 프로필 가중치를 넣은 기준 계산(note 없음 → 텍스트 0)."""
+    w = profile.weights
+
+    def cell(col):
+        return list_to_set(row.get(col, ""))
+
+    comps = [
+        round(ratio_overlap(mentee["purpose"], cell("purpose")) * w["purpose"]
+              + ratio_overlap(mentee["topics"], cell("topic_prefs")) * w["topics"]),
+        round(ratio_overlap(mentee["comm_modes"], cell("comm_modes")) * w["comm_modes"]
+              + ratio_overlap(mentee["time_slots"], cell("comm_time")) * w["time_slots"]
+              + ratio_overlap(mentee["days"], cell("comm_days")) * w["days"]),
+        round(ratio_overlap(mentee["interests"], cell("interests")) * w["interests"]),
+        round(major_score(mentee["wanted_majors"], str(row["occupation_major"]).strip()) * w["major"]
+              + age_preference_score(mentee["wanted_mentor_ages"], str(row["age_band"]).strip()) * w["age"]),
+        round(style_score(mentee["style"], str(row["style"]).strip()) * w["style"]),
+    ]
+    return int(max(profile.clip[0], min(profile.clip[1], sum(comps))))
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    return list(load_profiles().values()) + [WeightProfile("narrow", {"major": 3, "style": 2}, clip=(10, 60))]
+
+
+@pytest.mark.parametrize("availability", ["separate", "grid"])
+def test_default_profile_matches_rank_mentors(mentors_df, mentees, profiles, availability):
+    engine = MentorMatrix(mentors_df, availability=availability)
+    for mentee in mentees:
+        ranked = rank_profiles(engine, mentee, profiles, k=5, chunk_size=64)
+        assert ranked["default"] == rank_mentors(engine, mentee, k=5)
+
+
+def test_profiles_match_weighted_row_scores(mentors_df, mentees, profiles):
+    frame = mentors_df.head(150)
+    engine = MentorMatrix(frame)
+    for mentee in mentees[:10]:
+        mentee = {**mentee, "note": ""}
+        ranked = rank_profiles(engine, mentee, profiles, k=5, chunk_size=32)
+        for prof in profiles:
+            totals = [_weighted_score(mentee, row, prof) for _, row in frame.iterrows()]
+            expected = sorted(range(len(totals)), key=lambda pos: (-totals[pos], pos))[:5]
+            assert [r["pos"] for r in ranked[prof.name]] == expected, prof.name
+            assert [r["total"] for r in ranked[prof.name]] == [totals[p] for p in expected]
+
+
+def test_load_profiles_fills_default_and_rejects_unknown_features(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"profiles": {"a": {"weights": {"text": 0}}}}), encoding="utf-8")
+    loaded = load_profiles(path)
+    assert set(loaded) == {"a", "default"} and loaded["a"].weights["interests"] == 20
+    path.write_text(json.dumps({"profiles": {"b": {"weights": {"salary": 1}}}}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_profiles(path)
@@ -0,0 +1,90 @@
+# text_index.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 텍스트 인덱스 — 멘토 소개글(intro) 전체 코퍼스에 TF-IDF를 1회 적합
+
+핵심
+- 데이터 세트 버전당 한 번만 fit (멘티-멘토 쌍마다 fit하던 tfidf_similarity 대체)
+- 질의 시 멘티 note를 1회 transform → 희소 행렬·벡터 곱 1번으로 전 멘토 코사인 유사도
+- analyzer="char": 문자 n-gram(char_wb 2~3) — 띄어쓰기/조사 변형이 많은 한국어에 유리
+- analyzer="hash": 문자 n-gram을 고정 차원으로 해싱(IDF 없음, L2 정규화) — 적합할 어휘가 없어
+  멘토를 추가해도 기존 행/질의 벡터가 그대로 유효(증분 인덱스 live_index용)
+"""
+
+from typing import List, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+TEXT_ANALYZERS = {
+    "word": {"analyzer": "word", "ngram_range": (1, 2)},
+    "char": {"analyzer": "char_wb", "ngram_range": (2, 3)},
+}
+HASHED_ANALYZERS = {
+    "hash": {"analyzer": "char_wb", "ngram_range": (2, 3)},
+}
+MAX_FEATURES = 20000
+HASH_FEATURES = 2 ** 18
+
+
+def make_vectorizer(analyzer: str, max_features: int = MAX_FEATURES):
+    """analyzer 이름 → 적합 전 vectorizer (hash 계열은 적합이 필요 없는 HashingVectorizer)."""
+    if analyzer in HASHED_ANALYZERS:
+        return HashingVectorizer(n_features=HASH_FEATURES, alternate_sign=False, norm="l2",
+                                 **HASHED_ANALYZERS[analyzer])
+    if analyzer in TEXT_ANALYZERS:
+        return TfidfVectorizer(max_features=max_features, **TEXT_ANALYZERS[analyzer])
+    known = ", ".join([*TEXT_ANALYZERS, *HASHED_ANALYZERS])
+    raise ValueError(f"지원하지 않는 analyzer: {analyzer} (가능: {known})")
+
+
+class MentorTextIndex:
+    """멘토 intro 코퍼스에 적합된 TF-IDF 행렬(행 단위 L2 정규화).
+
+    vectorizer를 주면 적합하지 않고 transform만 한다(증분 인덱스의 추가분 — 기존 어휘/IDF 유지).
+    """
+
+    def __init__(self, intros: List[str], analyzer: str = "word", max_features: int = MAX_FEATURES,
+                 vectorizer=None):
+        self.analyzer = analyzer
+        self.n = len(intros)
+        docs = [(t or "").strip() for t in intros]
+        if vectorizer is not None:
+            self.vectorizer = vectorizer
+            self.matrix = vectorizer.transform(docs).tocsr()
+            return
+        self.vectorizer: Optional[TfidfVectorizer] = make_vectorizer(analyzer, max_features)
+        try:
+            self.matrix = self.vectorizer.fit_transform(docs).tocsr()
+        except (ValueError, StopIteration):
+            # 소개글이 모두 비었거나(TF-IDF 어휘 없음) 멘토가 0명(HashingVectorizer) → 텍스트 점수는 항상 0
+            self.vectorizer, self.matrix = None, None
+
+    @classmethod
+    def from_parts(cls, vectorizer: Optional[TfidfVectorizer], matrix, n: int,
+                   analyzer: str = "word") -> "MentorTextIndex":
+        """이미 적합된 vectorizer + 행렬로 복원(공유 메모리 워커, 스냅샷 로드용)."""
+        self = cls.__new__(cls)
+        self.analyzer, self.n = analyzer, n
+        self.vectorizer, self.matrix = vectorizer, matrix
+        return self
+
+    def similarity(self, note: str, rows=slice(None)) -> np.ndarray:
+        """멘티 note와 멘토(rows: slice 또는 위치 배열) intro의 코사인 유사도 배열."""
+        q = (note or "").strip()
+        if not q or self.vectorizer is None:
+            return np.zeros(len(np.arange(self.n)[rows]), dtype=np.float64)
+        vec = self.vectorizer.transform([q])
+        return np.clip((self.matrix[rows] @ vec.T).toarray().ravel(), 0.0, 1.0)
+
+    def similarity_block(self, notes: List[str], rows=slice(None)) -> np.ndarray:
+        """(멘토 rows × 멘티 m) 코사인 유사도 — 희소 행렬·행렬 곱 1번."""
+        n_rows = len(np.arange(self.n)[rows])
+        out = np.zeros((n_rows, len(notes)), dtype=np.float64)
+        qs = [(t or "").strip() for t in notes]
+        cols = [j for j, q in enumerate(qs) if q]
+        if not cols or self.vectorizer is None:
+            return out
+        vec = self.vectorizer.transform([qs[j] for j in cols])
+        out[:, cols] = np.clip((self.matrix[rows] @ vec.T).toarray(), 0.0, 1.0)
+        return out
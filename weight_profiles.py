@@ -0,0 +1,161 @@
+# weight_profiles.py
+# -*- coding: utf-8 -*-
+"""
+결(結) 가중치 프로필 — 설정 파일의 이름 붙은 가중치로 여러 프로필을 한 번에 랭킹/비교
+
+핵심
+- 프로필 = FEATURES별 가중치(빠진 항목은 DEFAULT_WEIGHTS) + 총점 clip 범위,
+  weight_profiles.json에서 읽음 → 튜닝 실험에 코드 수정 불필요
+- 멘티 1명당 원시 특징 행렬(멘토 × FEATURES)은 1회만 계산하고,
+  가중치 행렬(FEATURES × 프로필)과 곱해 모든 프로필 점수를 동시에 얻음(MentorMatrix.score_weighted)
+- rank_profiles(): 프로필별 top-k (청크 스트리밍, 동점 규칙은 rank_mentors와 동일)
+- CLI: 실제 설문 CSV로 프로필 간 top-k 겹침/1순위 일치율을 보고하고 나란히 비교한 CSV 저장
+
+사용 예
+    python weight_profiles.py mentees.csv 멘토더미.csv --profiles default interests_first -o ab.csv
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from matching import (
+    APP_AVAILABILITY, AVAILABILITY_MODES, COMPONENTS, DEFAULT_CLIP, DEFAULT_WEIGHTS, FEATURES, MentorMatrix,
+)
+from ranking import CHUNK_SIZE, DEFAULT_TOP_K, _merge
+
+PROFILES_PATH = Path(__file__).with_name("weight_profiles.json")
+
+
+class WeightProfile:
+    """이름 붙은 가중치 벡터 + 총점 clip 범위."""
+
+    def __init__(self, name: str, weights: Optional[Dict[str, float]] = None,
+                 clip=DEFAULT_CLIP, description: str = ""):
+        unknown = set(weights or {}) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"프로필 '{name}': 알 수 없는 특징 {sorted(unknown)} (가능: {', '.join(FEATURES)})")
+        self.name = name
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.clip = (float(clip[0]), float(clip[1]))
+        self.description = description
+
+    def vector(self) -> np.ndarray:
+        return np.array([self.weights[f] for f in FEATURES], dtype=np.float64)
+
+
+DEFAULT_PROFILE = WeightProfile("default", description="현재 운영 점수")
+
+
+def load_profiles(path=PROFILES_PATH) -> Dict[str, WeightProfile]:
+    """설정 파일(JSON)의 프로필들. 파일이 없거나 "default"가 빠지면 기본 프로필을 채운다."""
+    profiles = {}
+    path = Path(path)
+    if path.exists():
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        for name, spec in raw.get("profiles", {}).items():
+            profiles[name] = WeightProfile(name, spec.get("weights"), spec.get("clip", DEFAULT_CLIP),
+                                           spec.get("description", ""))
+    profiles.setdefault("default", DEFAULT_PROFILE)
+    return profiles
+
+
+def weight_matrix(profiles: List[WeightProfile]) -> tuple:
+    """(가중치 행렬 FEATURES × P, clip 하한 P, clip 상한 P)."""
+    W = np.stack([p.vector() for p in profiles], axis=1)
+    lo = np.array([p.clip[0] for p in profiles])
+    hi = np.array([p.clip[1] for p in profiles])
+    return W, lo, hi
+
+
+def rank_profiles(engine: MentorMatrix, mentee: Dict, profiles: List[WeightProfile],
+                  k: int = DEFAULT_TOP_K, chunk_size: int = CHUNK_SIZE) -> Dict[str, List[Dict]]:
+    """프로필별 상위 k명 {"pos", "idx", "total", "breakdown"} — 특징 행렬은 청크당 1회."""
+    W, lo, hi = weight_matrix(profiles)
+    P = len(profiles)
+    best = [(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)) for _ in range(P)]
+    for start in range(0, engine.n, chunk_size):
+        stop = min(start + chunk_size, engine.n)
+        totals = engine.score_weighted(mentee, W, rows=slice(start, stop), clip=(lo, hi))["total"]
+        best = [_merge(best[p][0], best[p][1], totals[:, p], start, k) for p in range(P)]
+
+    out = {}
+    for p, prof in enumerate(profiles):
+        pos = best[p][1]
+        if not len(pos):
+            out[prof.name] = []
+            continue
+        comps = engine.score_weighted(mentee, W[:, [p]], rows=pos, clip=(lo[p], hi[p]))
+        out[prof.name] = [{"pos": int(i), "idx": engine.index[i], "total": int(comps["total"][j, 0]),
+                           "breakdown": {c: int(comps[c][j, 0]) for c in COMPONENTS}}
+                          for j, i in enumerate(pos)]
+    return out
+
+
+def compare_rankings(rankings: Dict[str, List[Dict]], base: str) -> Dict[str, Dict[str, float]]:
+    """base 프로필 대비 프로필별 top-k 겹침 비율과 1순위 일치 여부."""
+    ref = [x["pos"] for x in rankings[base]]
+    out = {}
+    for name, ranked in rankings.items():
+        got = [x["pos"] for x in ranked]
+        overlap = len(set(ref) & set(got)) / len(ref) if ref else 1.0
+        out[name] = {"overlap": overlap, "top1": float(ref[:1] == got[:1])}
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from batch_match import mentee_from_row, read_csv_any
+
+    ap = argparse.ArgumentParser(description="결 가중치 프로필 A/B 비교")
+    ap.add_argument("mentees", help="멘티 설문 CSV(배치 매칭과 같은 형식)")
+    ap.add_argument("mentors", help="멘토 CSV")
+    ap.add_argument("--config", default=str(PROFILES_PATH), help="프로필 설정 JSON")
+    ap.add_argument("--profiles", nargs="+", default=None, help="비교할 프로필(첫 번째가 기준, 기본: 전체)")
+    ap.add_argument("-k", "--top-k", type=int, default=DEFAULT_TOP_K)
+    ap.add_argument("-o", "--output", default=None, help="프로필별 추천을 나란히 저장할 CSV")
+    ap.add_argument("--text-analyzer", choices=["word", "char"], default="char")
+    ap.add_argument("--availability", choices=AVAILABILITY_MODES, default=APP_AVAILABILITY,
+                    help=f"소통 시간 겹침 방식(기본: 결 앱과 같은 {APP_AVAILABILITY})")
+    args = ap.parse_args(argv)
+
+    available = load_profiles(args.config)
+    names = args.profiles or list(available)
+    missing = [n for n in names if n not in available]
+    if missing:
+        ap.error(f"설정에 없는 프로필: {', '.join(missing)} (가능: {', '.join(available)})")
+    profiles = [available[n] for n in names]
+
+    mentors_df = read_csv_any(args.mentors)
+    engine = MentorMatrix(mentors_df, text_analyzer=args.text_analyzer, availability=args.availability)
+    mentees = [mentee_from_row(r) for r in read_csv_any(args.mentees, dtype=str).to_dict("records")]
+
+    stats = {n: {"overlap": [], "top1": [], "total": []} for n in names}
+    rows = []
+    for mi, mentee in enumerate(mentees):
+        rankings = rank_profiles(engine, mentee, profiles, k=args.top_k)
+        for name, c in compare_rankings(rankings, names[0]).items():
+            stats[name]["overlap"].append(c["overlap"])
+            stats[name]["top1"].append(c["top1"])
+            stats[name]["total"].extend(x["total"] for x in rankings[name])
+        for name, ranked in rankings.items():
+            for rank, item in enumerate(ranked, start=1):
+                rows.append({"mentee_row": mi, "mentee_name": mentee["name"], "profile": name, "rank": rank,
+                             "mentor_row": item["pos"], "mentor_name": engine.names[item["pos"]],
+                             "total": item["total"], **item["breakdown"]})
+
+    print(f"멘토 {engine.n}명 · 멘티 {len(mentees)}명 · k={args.top_k} · 기준 프로필: {names[0]}")
+    for name in names:
+        s = stats[name]
+        print(f"{name:>20}  top-{args.top_k} 겹침 {np.mean(s['overlap'] or [1.0]):.1%}  "
+              f"1순위 일치 {np.mean(s['top1'] or [1.0]):.1%}  평균 총점 {np.mean(s['total'] or [0]):.1f}")
+    if args.output:
+        pd.DataFrame(rows).to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"비교 결과 {len(rows)}행 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()